@@ -0,0 +1,166 @@
+"""
+Cache asset đã xử lý sẵn trên đĩa cho Zombie Head Smash Game.
+
+Ảnh được decode, scale và chuyển sang định dạng pixel của màn hình một lần, ghi ra
+.asset_cache/ dạng byte thô kèm metadata; các lần chạy sau nạp thẳng từ file
+memory-mapped bằng pygame.image.frombuffer. Cache tự làm mới khi file gốc (mtime/hash),
+kích thước đích hoặc định dạng màn hình thay đổi.
+
+Ví dụ:
+    python asset_cache.py            # dựng cache và báo thời gian khởi động lạnh / ấm
+    python asset_cache.py --clear    # xóa cache
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+import pygame
+import constants as const
+
+INDEX_FILE = "index.json"
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def display_pixel_format():
+    """Chuỗi định dạng byte (cho tobytes/frombuffer) khớp với định dạng pixel của màn hình"""
+    display = pygame.display.get_surface()
+    if display is not None and display.get_bitsize() == 32 and display.get_masks()[2] == 0xff:
+        return "BGRA"  # Little-endian ARGB8888, the usual desktop format
+    return "RGBA"
+
+class AssetCache:
+    """Cache ảnh đã scale ở định dạng màn hình, nạp lại bằng mmap + frombuffer"""
+
+    def __init__(self, directory=const.ASSET_CACHE_DIR):
+        self.directory = directory
+        self.index = None
+        self._mapped = []  # Open mmaps backing frombuffer surfaces must outlive them
+        self.hits = 0
+        self.misses = 0
+
+    def _index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _load_index(self):
+        if self.index is None:
+            try:
+                with open(self._index_path()) as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+        return self.index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self._index_path() + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(temporary, self._index_path())
+
+    @staticmethod
+    def _key(source, size, alpha, pixel_format):
+        stem = os.path.splitext(os.path.basename(source))[0]
+        return f"{stem}_{size[0]}x{size[1]}_{'a' if alpha else 'o'}_{pixel_format}"
+
+    def _is_fresh(self, entry, source):
+        """Kiểm tra file gốc: mtime/kích thước trước, hash khi mtime đổi mà nội dung có thể giữ nguyên"""
+        stat = os.stat(source)
+        if entry['mtime_ns'] == stat.st_mtime_ns and entry['source_size'] == stat.st_size:
+            return True
+        if entry['source_size'] == stat.st_size and entry['sha1'] == file_hash(source):
+            entry['mtime_ns'] = stat.st_mtime_ns  # Touched (e.g. git checkout) but unchanged
+            self._save_index()
+            return True
+        return False
+
+    def load(self, source, size, alpha):
+        """Surface từ cache, hoặc None nếu chưa có / đã cũ"""
+        pixel_format = display_pixel_format()
+        key = self._key(source, size, alpha, pixel_format)
+        entry = self._load_index().get(key)
+        path = os.path.join(self.directory, key + ".raw")
+        try:
+            if entry is None or not self._is_fresh(entry, source):
+                self.misses += 1
+                return None
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if len(mapped) != size[0] * size[1] * 4:
+            mapped.close()
+            self.misses += 1
+            return None
+
+        # Zero-copy view over the mapped file; opaque images are converted to drop the alpha channel
+        surface = pygame.image.frombuffer(mapped, tuple(size), pixel_format)
+        if alpha:
+            self._mapped.append(mapped)
+        else:
+            surface = surface.convert()
+            mapped.close()
+        self.hits += 1
+        return surface
+
+    def store(self, source, surface, alpha):
+        """Ghi surface đã scale vào cache"""
+        pixel_format = display_pixel_format()
+        size = surface.get_size()
+        key = self._key(source, size, alpha, pixel_format)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, key + ".raw"), "wb") as f:
+            f.write(pygame.image.tobytes(surface, pixel_format))
+        stat = os.stat(source)
+        self._load_index()[key] = {
+            'source': os.path.relpath(source, const.CURRENT_DIR),
+            'mtime_ns': stat.st_mtime_ns,
+            'source_size': stat.st_size,
+            'sha1': file_hash(source),
+            'size': list(size),
+            'alpha': alpha,
+            'format': pixel_format
+        }
+        self._save_index()
+
+    def clear(self):
+        """Xóa toàn bộ file cache"""
+        self.index = {}
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, name))
+
+# Cache asset dùng chung
+asset_cache = AssetCache()
+
+def main():
+    from utils import load_images
+    import time
+
+    # Hidden window so the cache is written in the real display's pixel format
+    pygame.init()
+    pygame.display.set_mode((const.WIDTH, const.HEIGHT), pygame.HIDDEN)
+    asset_cache.clear()
+    if "--clear" in sys.argv:
+        print(f"Cleared {asset_cache.directory}")
+        return
+
+    start = time.perf_counter()
+    load_images()
+    cold_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    load_images()
+    warm_ms = (time.perf_counter() - start) * 1000
+    print(f"Asset cache built in {asset_cache.directory}")
+    print(f"load_images cold (decode + scale + write): {cold_ms:.1f} ms")
+    print(f"load_images warm (mmap + frombuffer):      {warm_ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
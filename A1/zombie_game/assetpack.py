@@ -0,0 +1,174 @@
+"""
+Gói asset đơn (assets.pack) cho Zombie Head Smash Game.
+
+Một file gồm header, dữ liệu pixel thô (đã scale, định dạng màn hình) và PCM của
+hiệu ứng âm thanh (định dạng mixer), cùng bảng index JSON ở cuối. Game mở gói một lần
+bằng mmap và tạo Surface trực tiếp trên vùng nhớ đó (frombuffer, không copy). Index giữ
+mtime/kích thước/hash của file gốc: file đã sửa sau khi đóng gói được nạp từ cache hoặc
+file lẻ (kèm cảnh báo) cho tới khi đóng gói lại.
+
+Ví dụ:
+    python assetpack.py build       # đóng gói images/ và sounds/ thành assets.pack
+    python assetpack.py info        # liệt kê nội dung gói
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import pygame
+import constants as const
+from asset_cache import display_pixel_format, file_hash
+
+PACK_MAGIC = b"ZHSPACK1"
+PACK_VERSION = 2
+# magic, version, index offset, index length
+HEADER = struct.Struct("<8sIQQ")
+ALIGNMENT = 64
+
+def image_key(filename, size, alpha):
+    return f"images/{filename}@{size[0]}x{size[1]}{'a' if alpha else ''}"
+
+def sound_key(filename):
+    return f"sounds/{filename}"
+
+class AssetPack:
+    """Gói asset mở bằng mmap; image()/sound() trả về None khi gói không có hoặc không khớp"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+            if magic != PACK_MAGIC or version != PACK_VERSION:
+                raise ValueError(f"{path} is not a version {PACK_VERSION} asset pack")
+            self.index = json.loads(self._map[index_offset:index_offset + index_length])
+        except Exception:
+            self._file.close()
+            raise
+        self.view = memoryview(self._map)
+
+    def _data(self, entry):
+        # Slicing a memoryview does not copy the mapped bytes
+        return self.view[entry['offset']:entry['offset'] + entry['length']]
+
+    def _fresh_entry(self, key, source):
+        """Mục của key nếu file gốc chưa đổi từ lúc đóng gói (mtime/kích thước, hoặc hash khi chỉ
+        mtime đổi); None kèm cảnh báo nếu đã cũ"""
+        entry = self.index['entries'].get(key)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return entry  # Shipped without the loose file: the pack is the only copy
+        if entry['source_size'] == stat.st_size and (entry['mtime_ns'] == stat.st_mtime_ns
+                                                     or entry['sha1'] == file_hash(source)):
+            return entry
+        print(f"Asset pack entry {key} is older than {os.path.relpath(source, const.CURRENT_DIR)}, "
+              f"loading the file instead (rebuild with: python assetpack.py build)")
+        return None
+
+    def image(self, filename, size, alpha):
+        """Surface từ gói, dùng chung vùng nhớ mmap (ảnh không alpha được convert một lần)"""
+        entry = self._fresh_entry(image_key(filename, size, alpha), os.path.join(const.IMAGES_DIR, filename))
+        if entry is None or entry['format'] != display_pixel_format():
+            return None
+        surface = pygame.image.frombuffer(self._data(entry), tuple(entry['size']), entry['format'])
+        return surface if alpha else surface.convert()
+
+    def sound(self, filename):
+        """Sound từ PCM trong gói (chỉ khi mixer đang chạy đúng định dạng lúc đóng gói)"""
+        entry = self._fresh_entry(sound_key(filename), os.path.join(const.SOUNDS_DIR, filename))
+        if entry is None or tuple(self.index.get('mixer') or ()) != pygame.mixer.get_init():
+            return None
+        return pygame.mixer.Sound(buffer=self._data(entry))
+
+    def close(self):
+        self.view.release()
+        self._map.close()
+        self._file.close()
+
+# Gói đang mở (None nếu không có / không dùng được), mở lần đầu khi cần
+_pack = None
+_pack_checked = False
+
+def get_pack(path=None):
+    """Gói asset dùng chung, hoặc None khi không có file gói"""
+    global _pack, _pack_checked
+    if not _pack_checked:
+        _pack_checked = True
+        path = path or const.ASSET_PACK_PATH
+        if path and os.path.exists(path):
+            try:
+                _pack = AssetPack(path)
+            except (OSError, ValueError) as e:
+                print(f"Error opening asset pack {path}: {e}")
+    return _pack
+
+def _source_meta(source):
+    """Metadata file gốc lưu trong index để phát hiện mục đã cũ"""
+    stat = os.stat(source)
+    return {
+        'source': os.path.relpath(source, const.CURRENT_DIR),
+        'mtime_ns': stat.st_mtime_ns,
+        'source_size': stat.st_size,
+        'sha1': file_hash(source)
+    }
+
+def build_pack(path=None):
+    """Đóng gói mọi ảnh trong IMAGE_SPECS và âm thanh trong SOUND_SPECS; cần màn hình và mixer"""
+    from utils import IMAGE_SPECS, SOUND_SPECS, decode_image
+
+    path = path or const.ASSET_PACK_PATH
+    pixel_format = display_pixel_format()
+    blobs = []
+    for filename, size, alpha in IMAGE_SPECS.values():
+        source = os.path.join(const.IMAGES_DIR, filename)
+        surface = decode_image(source, size, alpha)
+        blobs.append((image_key(filename, size, alpha), pygame.image.tobytes(surface, pixel_format),
+                      dict(_source_meta(source), size=list(size), format=pixel_format)))
+    for filename, _ in SOUND_SPECS.values():
+        source = os.path.join(const.SOUNDS_DIR, filename)
+        sound = pygame.mixer.Sound(source)
+        blobs.append((sound_key(filename), sound.get_raw(), _source_meta(source)))
+
+    entries = {}
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        for key, data, meta in blobs:
+            f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            entries[key] = dict(meta, offset=f.tell(), length=len(data))
+            f.write(data)
+        index = json.dumps({'mixer': pygame.mixer.get_init(), 'entries': entries}).encode()
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, index_offset, len(index)))
+    os.replace(temporary, path)
+    return entries
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "build":
+        pygame.init()
+        pygame.mixer.init()
+        # Hidden window so pixels are packed in the real display's format
+        pygame.display.set_mode((const.WIDTH, const.HEIGHT), pygame.HIDDEN)
+        entries = build_pack()
+        total = sum(entry['length'] for entry in entries.values())
+        print(f"Packed {len(entries)} assets ({total / 1024:.0f} KiB) into {const.ASSET_PACK_PATH}")
+    elif command == "info":
+        pack = AssetPack(const.ASSET_PACK_PATH)
+        print(f"mixer format: {pack.index['mixer']}")
+        for key, entry in pack.index['entries'].items():
+            print(f"{key:<40}{entry['length']:>10} bytes @ {entry['offset']}")
+        pack.close()
+    else:
+        print(__doc__)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+"""
+Benchmark frame-time theo kịch bản cho Zombie Head Smash Game.
+
+Chạy Game và SceneManager (scenes.py) với SDL dummy video driver, đo thời gian update và
+render mỗi frame, báo cáo p50/p95/p99/max, ghi kết quả JSON và so sánh với baseline.
+
+Ví dụ:
+    python benchmark.py frames --output results.json
+    python benchmark.py frames --save-baseline            # lưu baseline trên máy đích
+    python benchmark.py frames --baseline benchmark_baseline.json
+    python benchmark.py frames --replay session.zhsrec    # thêm ván đã ghi làm kịch bản (replay.py)
+    python benchmark.py spatial                           # hit-test: quét tuyến tính vs lưới
+    python benchmark.py startup --drop-caches             # nạp asset: file lẻ vs cache vs assets.pack
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import pygame
+import constants as const
+import effects
+from game import Game
+from scenes import SceneManager
+from spatial import IndexedGroup
+from replay import Recording, replay
+from zombie import Zombie
+from timing import ManualClock, percentile
+from utils import init_pygame, create_screen, load_fonts, load_images, load_sounds, freeze_loaded_objects
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "benchmark_baseline.json")
+WARMUP_FRAMES = 30
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'p50': percentile(ordered, 0.50),
+        'p95': percentile(ordered, 0.95),
+        'p99': percentile(ordered, 0.99),
+        'max': ordered[-1] if ordered else 0.0,
+        'mean': sum(ordered) / len(ordered) if ordered else 0.0
+    }
+
+# --- Scenarios ---
+class Scenario:
+    """Kịch bản benchmark: chuẩn bị game và thao tác trước mỗi frame"""
+    name = "base"
+    description = ""
+
+    def setup(self, game):
+        pass
+
+    def act(self, game, frame):
+        pass
+
+class IdleMenu(Scenario):
+    name = "idle_menu"
+    description = "Main menu, no input"
+
+class ClassicThree(Scenario):
+    name = "classic_3"
+    description = "CLASSIC with 3 zombies on screen, no clicks"
+
+    def setup(self, game):
+        game.start_game("CLASSIC")
+        game.spawn_interval_min = game.spawn_interval_max = 0
+        game.plan_spawns()
+
+class HardHits(Scenario):
+    name = "hard_hits"
+    description = "HARD, every zombie is hit as soon as it is fully up"
+
+    def setup(self, game):
+        game.start_game("HARD")
+
+    def act(self, game, frame):
+        now = game.clock.now()
+        for zombie in list(game.zombies):
+            if not zombie.hit and now - zombie.spawn_time >= const.ZOMBIE_POP_ANIMATION_DURATION:
+                game.handle_click(zombie.rect.center)
+                break
+
+class ComboStorm(Scenario):
+    name = "combo_storm"
+    description = "Combo 10+ with stars, explosions and rainbow text every few frames"
+
+    def setup(self, game):
+        game.start_game("HARD")
+        game.max_zombies_on_screen = len(const.ZOMBIE_SPAWN_POINTS)
+        game.spawn_interval_min, game.spawn_interval_max = 0, 50
+        game.plan_spawns()
+        game.combo = 10
+        game.last_hit_time = game.clock.now()
+
+    def act(self, game, frame):
+        if frame % 4:
+            return
+        for zombie in list(game.zombies):
+            if not zombie.hit:
+                game.handle_click(zombie.rect.center)
+                break
+
+class MissSpam(Scenario):
+    name = "miss_spam"
+    description = "Long MISS! spam, one empty click every frame"
+
+    def setup(self, game):
+        game.start_game("MEDIUM")
+        game.max_zombies_on_screen = 0
+        self.rng = random.Random(0)
+
+    def act(self, game, frame):
+        game.handle_click((self.rng.randint(0, const.WIDTH), self.rng.randint(0, const.HEIGHT)))
+
+class HordeFull(Scenario):
+    name = "horde"
+    description = "HORDE at its live-zombie cap, a hit every 4 frames"
+
+    def setup(self, game):
+        game.start_game("HORDE")
+        # Start from a full horde instead of waiting for it to build up
+        game.horde.spawn(game.horde.max_alive * 1000 / game.horde.spawn_rate)
+
+    def act(self, game, frame):
+        if frame % 4 == 0:
+            target = game.horde.target(0)
+            if target is not None:
+                game.handle_click(target)
+
+class GameOverScreen(Scenario):
+    name = "game_over"
+    description = "Game over screen, overlay fully in, Play Again hovered"
+
+    def setup(self, game):
+        game.start_game("MEDIUM")
+        game.game_duration = 0
+        hover = game.game_over_buttons[0].rect.center
+        game.handle_game_over_events(pygame.event.Event(pygame.MOUSEMOTION, pos=hover, rel=(0, 0), buttons=(0, 0, 0)))
+
+SCENARIOS = [IdleMenu, ClassicThree, HardHits, ComboStorm, MissSpam, HordeFull, GameOverScreen]
+
+def render_frame(screen, scenes):
+    """Vẽ một frame như vòng lặp chính (không dirty-rect)"""
+    scenes.draw(screen)
+    pygame.display.flip()
+    effects.particle_frames.end_frame()
+
+def run_scenario(scenario_cls, assets, screen, frames, seed=0):
+    """Chạy một kịch bản, trả về thống kê frame-time (ms)"""
+    fonts, images, sounds = assets
+    random.seed(seed)
+    clock = ManualClock()
+    game = Game(fonts, images, sounds, clock=clock, rng=random.Random(seed), music=False)
+    scenes = SceneManager(game)
+    scenario = scenario_cls()
+    scenario.setup(game)
+    step_ms = const.SIM_STEP_MS
+
+    update_times, render_times = [], []
+    for frame in range(WARMUP_FRAMES + frames):
+        if frame == WARMUP_FRAMES:
+            collections_before = [generation['collections'] for generation in gc.get_stats()]
+            pools_before = effects.effect_pool_stats()
+        start = time.perf_counter()
+        scenario.act(game, frame)
+        clock.advance(step_ms)
+        game.update(step_ms)
+        updated = time.perf_counter()
+        render_frame(screen, scenes)
+        rendered = time.perf_counter()
+        if frame >= WARMUP_FRAMES:
+            update_times.append((updated - start) * 1000)
+            render_times.append((rendered - updated) * 1000)
+
+    return _frame_result(update_times, render_times, collections_before, pools_before)
+
+def _frame_result(update_times, render_times, collections_before, pools_before):
+    result = summarize([update + render for update, render in zip(update_times, render_times)])
+    result['update_mean'] = sum(update_times) / len(update_times)
+    result['render_mean'] = sum(render_times) / len(render_times)
+    result['update_p95'] = percentile(sorted(update_times), 0.95)
+    result['render_p95'] = percentile(sorted(render_times), 0.95)
+    result['frames'] = len(update_times)
+    # Garbage collections and pooled-effect allocations during the measured frames
+    result['gc_collections'] = [generation['collections'] - before for generation, before
+                                in zip(gc.get_stats(), collections_before)]
+    pools_after = effects.effect_pool_stats()
+    result['effect_allocations'] = sum(pools_after[name]['size'] - pools_before[name]['size'] for name in pools_after)
+    return result
+
+def run_replay_scenario(path, assets, screen):
+    """Phát lại một ván đã ghi, vẽ mỗi bước mô phỏng; update gồm cả input của bước đó.
+
+    Kết quả có thêm 'matches': điểm số khi phát lại có đúng như lúc ghi không.
+    """
+    fonts, images, sounds = assets
+    recording = Recording.load(path)
+    random.seed(recording.seed)
+    game = Game(fonts, images, sounds, clock=ManualClock(), rng=random.Random(recording.seed), music=False)
+    scenes = SceneManager(game)
+    update_times, render_times = [], []
+    marks = {}
+
+    def on_step(game):
+        start = time.perf_counter()
+        render_frame(screen, scenes)
+        rendered = time.perf_counter()
+        if 'last' in marks:
+            update_times.append((start - marks['last']) * 1000)
+            render_times.append((rendered - start) * 1000)
+        elif game.clock.now() >= WARMUP_FRAMES * const.SIM_STEP_MS:
+            marks['collections'] = [generation['collections'] for generation in gc.get_stats()]
+            marks['pools'] = effects.effect_pool_stats()
+        else:
+            return
+        marks['last'] = time.perf_counter()
+
+    _, results = replay(recording, game, on_step)
+    result = _frame_result(update_times, render_times, marks['collections'], marks['pools'])
+    result['matches'] = results == recording.results
+    return result
+
+def compare(results, baseline, tolerance, noise_floor_ms):
+    """So sánh với baseline; trả về danh sách (scenario, metric, baseline, hiện tại) bị hồi quy"""
+    regressions = []
+    for name, current in results['scenarios'].items():
+        reference = baseline.get('scenarios', {}).get(name)
+        if not reference:
+            continue
+        for metric in ('p50', 'p95', 'p99'):
+            before, after = reference[metric], current[metric]
+            if after > before * (1 + tolerance) and after - before > noise_floor_ms:
+                regressions.append((name, metric, before, after))
+    return regressions
+
+def print_table(results, baseline=None):
+    print(f"{'scenario':<14}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}{'update':>9}{'render':>9}{'gc':>11}{'fx alloc':>9}")
+    for name, stats in results['scenarios'].items():
+        line = (f"{name:<14}{stats['p50']:8.2f}{stats['p95']:8.2f}{stats['p99']:8.2f}{stats['max']:8.2f}"
+                f"{stats['update_mean']:9.2f}{stats['render_mean']:9.2f}"
+                f"{'/'.join(str(count) for count in stats['gc_collections']):>11}{stats['effect_allocations']:9d}")
+        reference = (baseline or {}).get('scenarios', {}).get(name)
+        if reference:
+            change = (stats['p95'] - reference['p95']) / reference['p95'] * 100 if reference['p95'] else 0.0
+            line += f"   p95 {change:+.1f}% vs baseline"
+        print(line)
+    print("(ms per frame; update/render are means; gc = collections per generation)")
+
+def run_frames(args):
+    init_pygame()
+    screen = create_screen()
+    assets = (load_fonts(), load_images(), load_sounds())
+    effects.init_particle_frames()
+    effects.init_rainbow_glyphs(assets[0]['medium'])
+    effects.init_effect_pools()
+    freeze_loaded_objects()
+
+    selected = [cls for cls in SCENARIOS if not args.scenario or cls.name in args.scenario]
+    results = {
+        'meta': {
+            'frames': args.frames,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'video_driver': pygame.display.get_driver()
+        },
+        'scenarios': {}
+    }
+    for cls in selected:
+        results['scenarios'][cls.name] = run_scenario(cls, assets, screen, args.frames)
+    for path in args.replay or []:
+        name = "replay_" + os.path.splitext(os.path.basename(path))[0]
+        results['scenarios'][name] = run_replay_scenario(path, assets, screen)
+    pygame.quit()
+    mismatches = [name for name, stats in results['scenarios'].items() if stats.get('matches') is False]
+    for name in mismatches:
+        print(f"REPLAY MISMATCH {name}: scores differ from the recording")
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance, args.noise_floor)
+        for name, metric, before, after in regressions:
+            print(f"REGRESSION {name} {metric}: {before:.2f} ms -> {after:.2f} ms")
+        return 1 if regressions or mismatches else 0
+    return 1 if mismatches else 0
+
+# --- Spatial index micro-benchmark ---
+def _linear_click(zombies, point):
+    for zombie in list(zombies):
+        if zombie.rect.collidepoint(point) and not zombie.hit:
+            return zombie
+    return None
+
+def _grid_click(zombies, point):
+    for zombie in zombies.sprites_at(point):
+        if not zombie.hit:
+            return zombie
+    return None
+
+def _linear_occupied(zombies, point):
+    return any(zombie.rect.inflate(-20, -20).collidepoint(point) for zombie in zombies)
+
+def _grid_occupied(zombies, point):
+    return any(zombie.rect.inflate(-20, -20).collidepoint(point) for zombie in zombies.sprites_at(point))
+
+def _time_per_call(function, zombies, points):
+    start = time.perf_counter()
+    for point in points:
+        function(zombies, point)
+    return (time.perf_counter() - start) / len(points) * 1e6
+
+def run_spatial(args):
+    """Chi phí một lần click / kiểm tra chiếm chỗ theo số zombie, mật độ zombie giữ nguyên"""
+    pygame.init()
+    rng = random.Random(args.seed)
+    image = pygame.Surface(const.ZOMBIE_IMAGE_SIZE, pygame.SRCALPHA)
+    clock = ManualClock()
+    # Same zombie density as the 9-slot playfield, so the world grows with the count
+    area_per_zombie = const.WIDTH * const.HEIGHT / len(const.ZOMBIE_SPAWN_POINTS)
+
+    print(f"{'zombies':>8}{'click linear':>14}{'click grid':>12}{'occupied linear':>17}{'occupied grid':>15}")
+    results = {}
+    for count in args.counts:
+        side = int((area_per_zombie * count) ** 0.5)
+        zombies = IndexedGroup()
+        for _ in range(count):
+            zombie = Zombie(image, clock=clock, rng=rng)
+            zombie.set_position(rng.randint(0, side), rng.randint(0, side))
+            zombies.add(zombie)
+        points = [(rng.randint(0, side), rng.randint(0, side)) for _ in range(args.queries)]
+
+        # Same answers from both paths before timing them
+        assert all(_linear_click(zombies, p) is _grid_click(zombies, p) for p in points[:200])
+        row = {
+            'click_linear_us': _time_per_call(_linear_click, zombies, points),
+            'click_grid_us': _time_per_call(_grid_click, zombies, points),
+            'occupied_linear_us': _time_per_call(_linear_occupied, zombies, points),
+            'occupied_grid_us': _time_per_call(_grid_occupied, zombies, points)
+        }
+        results[count] = row
+        print(f"{count:>8}{row['click_linear_us']:14.2f}{row['click_grid_us']:12.2f}"
+              f"{row['occupied_linear_us']:17.2f}{row['occupied_grid_us']:15.2f}")
+    print("(microseconds per query)")
+    pygame.quit()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+STARTUP_MODES = ("loose", "cache", "pack")
+
+def _startup_child(mode):
+    """Chạy trong process con: đo thời gian nạp toàn bộ asset theo một nguồn"""
+    const.ASSET_CACHE_ENABLED = mode == "cache"
+    if mode != "pack":
+        const.ASSET_PACK_PATH = None
+    start = time.perf_counter()
+    init_pygame()
+    create_screen()
+    ready = time.perf_counter()
+    load_images()
+    images_done = time.perf_counter()
+    load_sounds()
+    done = time.perf_counter()
+    print(json.dumps({
+        'images_ms': (images_done - ready) * 1000,
+        'sounds_ms': (done - images_done) * 1000,
+        'assets_ms': (done - ready) * 1000,
+        'total_ms': (done - start) * 1000
+    }))
+    return 0
+
+def _drop_page_cache():
+    # Needs root; makes every run read the asset files from storage again
+    subprocess.run(["sync"], check=False)
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3\n")
+
+def run_startup(args):
+    """Khởi động lạnh: mỗi lần chạy là một process mới nạp asset từ file lẻ, cache hoặc gói"""
+    if args.child:
+        return _startup_child(args.child)
+    if not os.path.exists(const.ASSET_PACK_PATH):
+        print(f"{const.ASSET_PACK_PATH} not found, run 'python assetpack.py build' first")
+        return 1
+
+    # Warm the disk cache once so the "cache" mode measures reads, not the first build
+    subprocess.run([sys.executable, __file__, "startup", "--child", "cache"], check=True, capture_output=True)
+    results = {}
+    for mode in STARTUP_MODES:
+        runs = []
+        for _ in range(args.runs):
+            if args.drop_caches:
+                _drop_page_cache()
+            child = subprocess.run([sys.executable, __file__, "startup", "--child", mode],
+                                   check=True, capture_output=True, text=True)
+            runs.append(json.loads(child.stdout.strip().splitlines()[-1]))
+        results[mode] = {key: percentile([run[key] for run in runs], 0.5) for key in runs[0]}
+
+    print(f"{'source':<8}{'images ms':>11}{'sounds ms':>11}{'assets ms':>11}{'process ms':>12}")
+    for mode, row in results.items():
+        print(f"{mode:<8}{row['images_ms']:11.1f}{row['sounds_ms']:11.1f}{row['assets_ms']:11.1f}{row['total_ms']:12.1f}")
+    print(f"(median of {args.runs} fresh processes{', page cache dropped' if args.drop_caches else ''})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Zombie Head Smash benchmarks")
+    suites = parser.add_subparsers(dest="suite", required=True)
+
+    frames = suites.add_parser("frames", help="Scripted frame-time scenarios")
+    frames.add_argument("--frames", type=int, default=600, help="Measured frames per scenario")
+    frames.add_argument("--scenario", action="append", choices=[cls.name for cls in SCENARIOS],
+                        help="Run only this scenario (repeatable)")
+    frames.add_argument("--replay", action="append", metavar="RECORDING",
+                        help="Also replay this input recording as a scenario (repeatable)")
+    frames.add_argument("--output", help="Write results JSON to this file")
+    frames.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    frames.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    frames.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative slowdown")
+    frames.add_argument("--noise-floor", type=float, default=0.5, help="Ignore slowdowns below this many ms")
+    frames.set_defaults(func=run_frames)
+
+    spatial = suites.add_parser("spatial", help="Click/occupancy cost: linear scan vs spatial grid")
+    spatial.add_argument("--counts", type=int, nargs="+", default=[5, 50, 500, 5000])
+    spatial.add_argument("--queries", type=int, default=2000, help="Queries per zombie count")
+    spatial.add_argument("--seed", type=int, default=0)
+    spatial.add_argument("--output", help="Write results JSON to this file")
+    spatial.set_defaults(func=run_spatial)
+
+    startup = suites.add_parser("startup", help="Asset load time: loose files vs asset cache vs assets.pack")
+    startup.add_argument("--runs", type=int, default=5, help="Fresh processes per asset source")
+    startup.add_argument("--drop-caches", action="store_true", help="Drop the OS page cache before each run (root)")
+    startup.add_argument("--output", help="Write results JSON to this file")
+    startup.add_argument("--child", choices=STARTUP_MODES, help=argparse.SUPPRESS)
+    startup.set_defaults(func=run_startup)
+    return parser
+
+if __name__ == "__main__":
+    arguments = build_parser().parse_args()
+    sys.exit(arguments.func(arguments))
@@ -36,6 +36,11 @@ RAINBOW_COLORS = [RED, ORANGE, YELLOW, GREEN, CYAN, BLUE, PURPLE, HOT_PINK]
 CURRENT_DIR = os.path.dirname(__file__)
 IMAGES_DIR = os.path.join(CURRENT_DIR, "images")
 SOUNDS_DIR = os.path.join(CURRENT_DIR, "sounds")
+ASSET_CACHE_DIR = os.path.join(CURRENT_DIR, ".asset_cache")  # Pre-scaled display-format pixels
+ASSET_CACHE_ENABLED = True
+ASSET_PACK_PATH = os.path.join(CURRENT_DIR, "assets.pack")  # Packed archive built by assetpack.py
+LOADER_WORKERS = 4  # Threads decoding images/sounds behind the loading screen
+LOADING_BAR_SIZE = (400, 24)
 
 # --- Vị trí xuất hiện zombie ---
 ZOMBIE_SPAWN_POINTS = [
@@ -44,6 +49,11 @@ ZOMBIE_SPAWN_POINTS = [
     (100, 450), (350, 450), (600, 450)
 ]
 
+# --- Render settings ---
+BACK_BUFFER_SIZE = (WIDTH, HEIGHT)  # Gameplay layer size, scaled to the display if different
+BACK_BUFFER_DEPTH = 0  # Bits per pixel, 0 = match the display format
+DIRTY_RECT_MODE = False  # Only repaint and push changed screen areas (falls back to flip on shake)
+
 # --- Font sizes ---
 FONT_SIZE_LARGE = 48
 FONT_SIZE_MEDIUM = 36
@@ -51,8 +61,16 @@ FONT_SIZE_SMALL = 24
 
 # --- Game settings ---
 DEFAULT_FPS = 60
+RENDER_FPS = DEFAULT_FPS  # Render frame cap (30, 60, 144...), independent of the simulation
+SIM_TICK_RATE = 60  # Fixed simulation steps per second
+SIM_STEP_MS = 1000 / SIM_TICK_RATE
+MAX_CATCHUP_STEPS = 5  # Max simulation steps per rendered frame before dropping time
+EFFECT_FRAME_MS = 16  # Reference frame the per-frame effect rates were tuned for
 COMBO_TIME_WINDOW = 2000  # 2 seconds for combo
 MAX_TRAIL_LENGTH = 15
+GAME_OVER_REVEAL_MS = 1000  # Game-over overlay fades in over this long (buttons appear after)
+SCENE_FADE_MS = 250  # Fade to black and back when leaving the game-over screen
+MUSIC_FADE_MS = 1000  # Background music fade-out when a game ends
 
 # --- Difficulty settings ---
 DIFFICULTY_SETTINGS = {
@@ -83,6 +101,15 @@ DIFFICULTY_SETTINGS = {
         "max_zombies_on_screen": 6,
         "spawn_interval_min": 700,
         "spawn_interval_max": 1500
+    },
+    "HORDE": {
+        "game_duration": 60 * 1000,  # 60 seconds
+        "zombie_speed_multiplier": 0.5,  # 3-6 s lifetimes so thousands are alive at once
+        "max_zombies_on_screen": 3000,
+        "spawn_interval_min": 0,
+        "spawn_interval_max": 0,
+        "horde": True,  # Array-backed horde at procedural positions instead of spawn points
+        "horde_spawn_rate": 800  # Zombies per second
     }
 }
 
@@ -91,9 +118,40 @@ ZOMBIE_IMAGE_SIZE = (70, 70)
 ZOMBIE_POP_ANIMATION_DURATION = 300  # ms
 ZOMBIE_SPLAT_DURATION = 400  # ms
 ZOMBIE_WARNING_TIME = 500  # ms before disappearing
+ZOMBIE_WIGGLE_MAX = 3  # Max horizontal wiggle (px) while about to disappear
+SPATIAL_CELL_SIZE = 128  # Zombie spatial-index cell size (px), larger than a zombie footprint
+ZOMBIE_POP_FRAMES = 18  # Precomputed pop-up animation frames per zombie image
+ZOMBIE_GLOW_LEVELS = 8  # Precomputed warning-glow intensity levels per zombie image
+
+# --- Horde settings ---
+HORDE_ZOMBIE_SCALE = 0.5  # Horde heads are drawn smaller so thousands fit on screen
+HORDE_SPAWN_MARGIN = 10  # Min distance (px) between a horde zombie and the screen edge
+HORDE_CAPACITY = 1024  # Initial array capacity, grows by doubling
+HORDE_COLORKEY = (255, 0, 255)  # Transparent color of the RLE horde frames
 
 # --- Splat settings ---
 SPLAT_IMAGE_SIZE = (80, 80)
+SPLAT_ATLAS_FRAMES = 24  # Pre-rendered splat frames: more frames = smoother, more memory
+
+# --- HUD settings ---
+HUD_SCALE_STEP = 0.02  # Pulse/blink scales are quantized to this step and cached
+HUD_COMBO_GLOW_LAYERS = 5
+
+# --- Profiler settings ---
+PROFILER_ENABLED = False  # Start with timing scopes on (F3 toggles the overlay at runtime)
+PROFILER_EXPORT_PATH = None  # e.g. "profile.csv" or "profile.jsonl" to dump per-frame timings
+PROFILER_HISTORY = 120  # Frames kept for the rolling graphs
+PROFILER_TEXT_REFRESH_MS = 250  # Overlay numbers are re-rendered at most this often
+PROFILER_SCOPES = ("events", "update", "world", "splats", "hud", "trail", "present")
+PROFILER_GRAPH_SIZE = (300, 90)
+PROFILER_FRAME_BUDGET_MS = 1000 / DEFAULT_FPS  # Reference line drawn on the graph
+
+# --- Input settings ---
+INPUT_POLL_INTERVAL_MS = 1  # While waiting for the next frame, drain the event queue this often
+INPUT_LATENCY_HISTORY = 256  # Click-to-present samples kept for the latency report
+
+# --- Replay settings ---
+REPLAY_RECORD_PATH = None  # e.g. "session.zhsrec" to record every input of a run (see replay.py)
 
 # --- Button settings ---
 BUTTON_SIZE = (200, 70)
@@ -104,17 +162,35 @@ PARTICLE_GRAVITY = 0.2
 BLOOD_PARTICLE_COUNT_BASE = 20
 BLOOD_PARTICLE_COUNT_COMBO_BONUS = 3
 BLOOD_PARTICLE_COUNT_MAX = 50
+BLOOD_PARTICLE_COLORS = [BLOOD_RED, RED, (180, 0, 0), (120, 0, 0)]
+PARTICLE_SYSTEM_CAPACITY = 4096  # Initial array capacity, grows by doubling
+PARTICLE_ALPHA_STEPS = 16  # Number of pre-faded frames per particle color
 
 # --- Effect settings ---
 EXPLOSION_MAX_RADIUS = 60
 EXPLOSION_GROWTH_RATE = 3
 EXPLOSION_FADE_RATE = 15
 
+TEXT_ALPHA_STEPS = 16  # Number of shared fade levels for floating texts
+TEXT_FRAME_CACHE_SIZE = 512  # Max cached text renders / faded frames
+RAINBOW_TEXT_MAX_SCALE = 0.5  # Rainbow text grows up to 1.5x
+RAINBOW_TEXT_SCALE_STEPS = 6  # Precomputed scale steps between 1.0x and max
+RAINBOW_TEXT_CHARS = "EPIC +x0123456789!"  # Glyphs built up front for the epic combo text
+
 WAVE_MAX_RADIUS = 100
 WAVE_SPEED = 4
 WAVE_COUNT = 3
 WAVE_FADE_RATE = 8
 
+# Effect objects created up front per pool; pools still grow on demand past these
+EFFECT_POOL_SIZES = {
+    "FloatingText": 64,  # ~1 s lifetime, enough for a click per frame of MISS! spam
+    "RainbowText": 32,
+    "ExplosionEffect": 32,
+    "StarEffect": 320,  # Up to 10 per epic hit, 1-2 s lifetime
+    "WaveEffect": 16
+}
+
 STAR_SPAWN_INTERVAL = 3000  # Every 3 seconds
 STAR_SIZE_MIN = 2
 STAR_SIZE_MAX = 6
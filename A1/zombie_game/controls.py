@@ -0,0 +1,86 @@
+"""
+Pipeline input độ trễ thấp cho Zombie Head Smash Game.
+
+Hàng đợi event chỉ nhận các loại game dùng; trong lúc chờ frame sau, event được lấy ra
+từng lát ngắn và đóng dấu thời điểm (pygame không có timestamp cho event), chuỗi
+MOUSEMOTION liên tiếp được gộp về vị trí mới nhất. Mỗi click còn được đo độ trễ tới lúc
+frame phản hồi nó được present.
+"""
+
+import time
+from collections import deque
+import pygame
+import constants as const
+from timing import percentile
+
+# Event types the game reacts to; everything else is dropped by SDL before it is queued
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN)
+
+def _now_ms():
+    return time.perf_counter() * 1000
+
+class InputPipeline:
+    """Gom event kèm thời điểm nhận, gộp chuyển động chuột và đo độ trễ click → present"""
+
+    def __init__(self, poll_interval=const.INPUT_POLL_INTERVAL_MS, history=const.INPUT_LATENCY_HISTORY):
+        self.poll_interval = poll_interval
+        self._queue = []  # (event, time ms) drained but not handed out yet
+        self._clicks = []  # Arrival times of clicks handed out this frame
+        self._last_frame = None
+        self.frame_time = _now_ms()
+        self.latencies = deque(maxlen=history)
+        self.coalesced = 0
+
+    @staticmethod
+    def configure_queue():
+        """Chặn mọi loại event game không dùng"""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+
+    def _collect(self):
+        now = _now_ms()
+        queue = self._queue
+        for event in pygame.event.get():
+            if event.type == pygame.MOUSEMOTION and queue and queue[-1][0].type == pygame.MOUSEMOTION:
+                # Only the latest position of a run of motion matters (button hover)
+                queue[-1] = (event, now)
+                self.coalesced += 1
+            else:
+                queue.append((event, now))
+
+    def wait_frame(self, clock, fps):
+        """Thay cho clock.tick(fps): trong lúc chờ vẫn lấy event để thời điểm nhận chính xác"""
+        if fps and self._last_frame is not None:
+            deadline = self._last_frame + 1000 / fps - self.poll_interval
+            while _now_ms() < deadline:
+                self._collect()
+                pygame.time.wait(self.poll_interval)
+        elapsed = clock.tick(fps)
+        self.frame_time = self._last_frame = _now_ms()
+        return elapsed
+
+    def poll(self):
+        """Các event (event, thời điểm ms) tới trước frame này, theo thứ tự"""
+        self._collect()
+        items, self._queue = self._queue, []
+        self._clicks.extend(stamp for event, stamp in items
+                            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1)
+        return items
+
+    def presented(self):
+        """Gọi ngay sau khi present; trả về độ trễ (ms) của các click vừa được hiển thị"""
+        if not self._clicks:
+            return []
+        now = _now_ms()
+        latencies = [now - stamp for stamp in self._clicks]
+        self._clicks.clear()
+        self.latencies.extend(latencies)
+        return latencies
+
+    def report(self):
+        """Dòng tóm tắt độ trễ click → present"""
+        if not self.latencies:
+            return "Click-to-present latency: no clicks"
+        samples = self.latencies
+        return (f"Click-to-present latency: p50 {percentile(samples, 0.5):.1f} ms, "
+                f"p95 {percentile(samples, 0.95):.1f} ms, max {max(samples):.1f} ms ({len(samples)} clicks)")
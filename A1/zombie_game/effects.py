@@ -5,71 +5,483 @@ Các class hiệu ứng visual cho Zombie Head Smash Game
 import pygame
 import random
 import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import numpy as np
 import constants as const
 
+_np_rng = np.random.default_rng()
+
 # --- Particle Effects Classes ---
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, x, y, color, velocity_x, velocity_y, lifetime=1000):
-        super().__init__()
-        self.image = pygame.Surface(const.PARTICLE_SIZE, pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (2, 2), 2)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.velocity_x = velocity_x
-        self.velocity_y = velocity_y
+class ParticleFrameCache:
+    """Cache dùng chung các frame hạt đã fade sẵn, khóa theo (màu, mức alpha).
+
+    Đếm số lần dùng lại frame (hits) và số Surface phải cấp phát trong frame
+    hiện tại; end_frame() chốt số liệu để có thể kiểm tra tốc độ cấp phát về 0.
+    """
+
+    def __init__(self, alpha_steps=const.PARTICLE_ALPHA_STEPS, size=const.PARTICLE_SIZE):
+        self.alpha_steps = alpha_steps
+        self.size = size
+        self.frames = {}
+        self.hits = 0
+        self.allocations = 0
+        self.last_hits = 0
+        self.last_allocations = 0
+        self.total_allocations = 0
+
+    def alpha_step(self, alpha):
+        """Lượng tử hóa alpha (0-255) thành chỉ số mức alpha"""
+        step = int(alpha * (self.alpha_steps - 1) / 255 + 0.5)
+        return max(0, min(self.alpha_steps - 1, step))
+
+    def _render(self, color, step):
+        alpha = round(255 * step / (self.alpha_steps - 1))
+        radius = self.size[0] // 2
+        frame = pygame.Surface(self.size, pygame.SRCALPHA)
+        pygame.draw.circle(frame, (*color[:3], alpha), (radius, radius), radius)
+        if pygame.display.get_surface() is not None:
+            frame = frame.convert_alpha()  # Display pixel format blits much faster
+        self.allocations += 1
+        self.total_allocations += 1
+        return frame
+
+    def build(self, colors):
+        """Vẽ sẵn mọi mức alpha cho các màu cho trước (gọi lúc load tài nguyên)"""
+        for color in colors:
+            color = tuple(color[:3])
+            for step in range(self.alpha_steps):
+                if (color, step) not in self.frames:
+                    self.frames[(color, step)] = self._render(color, step)
+
+    def get(self, color, step):
+        """Lấy frame theo (màu, mức alpha), chỉ cấp phát khi chưa có"""
+        key = (tuple(color[:3]), step)
+        frame = self.frames.get(key)
+        if frame is None:
+            frame = self.frames[key] = self._render(key[0], step)
+        else:
+            self.hits += 1
+        return frame
+
+    def frames_for(self, palette):
+        """Danh sách phẳng các frame theo thứ tự palette * alpha_steps + step"""
+        self.build(palette)
+        return [self.frames[(tuple(color[:3]), step)]
+                for color in palette for step in range(self.alpha_steps)]
+
+    def record_hits(self, count):
+        """Ghi nhận các frame được dùng lại bởi bộ vẽ theo lô"""
+        self.hits += count
+
+    def end_frame(self):
+        """Chốt bộ đếm của frame vừa vẽ và reset cho frame kế tiếp"""
+        self.last_hits, self.last_allocations = self.hits, self.allocations
+        self.hits = 0
+        self.allocations = 0
+
+    def stats(self):
+        """Số liệu của frame gần nhất"""
+        return {
+            'hits': self.last_hits,
+            'allocations': self.last_allocations,
+            'total_allocations': self.total_allocations,
+            'cached_frames': len(self.frames)
+        }
+
+# Cache frame hạt dùng chung cho toàn game
+particle_frames = ParticleFrameCache()
+
+def init_particle_frames(colors=const.BLOOD_PARTICLE_COLORS):
+    """Dựng sẵn frame hạt cho các màu dùng trong game"""
+    particle_frames.build(colors)
+
+# --- Pooled effects ---
+class PooledEffect(ABC):
+    """Lớp cơ sở cho hiệu ứng dùng lại được qua EffectPool.
+
+    Dùng __slots__ thay cho __dict__ của Sprite; tài nguyên giữ lại giữa các lần dùng
+    (Surface, Rect) tạo trong _allocate(), trạng thái mỗi lần dùng đặt trong reset().
+    update(dt) trả về False khi hiệu ứng kết thúc.
+    """
+    __slots__ = ('pool', 'image', 'rect')
+
+    def __init__(self, *args, **kwargs):
+        self.pool = None
+        self._allocate()
+        self.reset(*args, **kwargs)
+
+    @classmethod
+    def blank(cls):
+        """Object chưa reset, dùng để nạp sẵn pool"""
+        effect = cls.__new__(cls)
+        effect.pool = None
+        effect._allocate()
+        return effect
+
+    def _allocate(self):
+        self.image = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    @abstractmethod
+    def reset(self, *args, **kwargs):
+        """Đặt trạng thái cho một lần dùng, không tạo Surface mới"""
+
+    def update(self, dt=const.EFFECT_FRAME_MS):
+        return True
+
+class EffectPool:
+    """Pool object hiệu ứng: acquire() dùng lại object rảnh (hoặc tạo mới khi hết), release() trả lại"""
+
+    def __init__(self, effect_class, size=0):
+        self.effect_class = effect_class
+        self.free = []
+        self.size = 0  # Objects created by this pool
+        self.acquired = 0
+        self.reused = 0
+        self.in_use = 0
+        self.peak = 0
+        self.reserve(size)
+
+    def reserve(self, size):
+        """Tạo sẵn object cho tới khi pool có ít nhất size object"""
+        while self.size < size:
+            self.free.append(self.effect_class.blank())
+            self.size += 1
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            effect = self.free.pop()
+            self.reused += 1
+        else:
+            effect = self.effect_class.blank()
+            self.size += 1
+        effect.pool = self
+        effect.reset(*args, **kwargs)
+        self.acquired += 1
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        return effect
+
+    def release(self, effect):
+        self.in_use -= 1
+        self.free.append(effect)
+
+    def stats(self):
+        return {
+            'size': self.size,
+            'in_use': self.in_use,
+            'peak': self.peak,
+            'acquired': self.acquired,
+            'hit_rate': self.reused / self.acquired if self.acquired else 1.0
+        }
+
+class EffectGroup:
+    """Danh sách hiệu ứng đang chạy (thay cho pygame.sprite.Group); hiệu ứng kết thúc được trả về pool"""
+
+    def __init__(self):
+        self.effects = []
+
+    def add(self, *effects):
+        self.effects.extend(effects)
+
+    def update(self, dt=const.EFFECT_FRAME_MS):
+        # Compact live effects in place instead of building a new list
+        effects = self.effects
+        live = 0
+        for effect in effects:
+            if effect.update(dt):
+                effects[live] = effect
+                live += 1
+            elif effect.pool is not None:
+                effect.pool.release(effect)
+        del effects[live:]
+
+    def empty(self):
+        for effect in self.effects:
+            if effect.pool is not None:
+                effect.pool.release(effect)
+        self.effects.clear()
+
+    def __iter__(self):
+        return iter(self.effects)
+
+    def __len__(self):
+        return len(self.effects)
+
+class ParticleSystem:
+    """Hệ thống hạt lưu trong mảng NumPy, cập nhật và vẽ theo lô.
+
+    Hạt mới sinh bằng emit(); hỗ trợ update(), empty(), draw() và len().
+    """
+
+    def __init__(self, palette=const.BLOOD_PARTICLE_COLORS, capacity=const.PARTICLE_SYSTEM_CAPACITY):
+        self.palette = list(palette)
         self.gravity = const.PARTICLE_GRAVITY
-        self.lifetime = lifetime
-        self.age = 0
-        self.original_color = color
+        self.alpha_steps = particle_frames.alpha_steps
+        self.half_size = np.array(const.PARTICLE_SIZE, dtype=np.float32) / 2
+        self.step_scale = 1.0
+        self.count = 0
+        self._allocate(capacity)
+        self._frames = particle_frames.frames_for(self.palette)
+        # Scratch buffer for emit(), so spawning particles allocates no temporary batch arrays
+        self._random = np.empty(const.BLOOD_PARTICLE_COUNT_MAX, dtype=np.float64)
 
-    def update(self):
-        self.age += 16  # Assume 60 FPS
-        if self.age >= self.lifetime:
-            self.kill()
+    def _allocate(self, capacity):
+        """Cấp phát (hoặc mở rộng) các mảng trạng thái, giữ lại các hạt đang sống"""
+        n = self.count
+        position = np.zeros((capacity, 2), dtype=np.float32)
+        velocity = np.zeros((capacity, 2), dtype=np.float32)
+        age = np.zeros(capacity, dtype=np.float32)
+        lifetime = np.ones(capacity, dtype=np.float32)
+        color = np.zeros(capacity, dtype=np.intp)
+        if n:
+            position[:n] = self.position[:n]
+            velocity[:n] = self.velocity[:n]
+            age[:n] = self.age[:n]
+            lifetime[:n] = self.lifetime[:n]
+            color[:n] = self.color[:n]
+        self.position, self.velocity = position, velocity
+        self.age, self.lifetime, self.color = age, lifetime, color
+        self.capacity = capacity
+
+    def _reserve(self, k):
+        """Đảm bảo đủ chỗ cho thêm k hạt, trả về slice dành cho chúng"""
+        needed = self.count + k
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self._allocate(capacity)
+        return slice(self.count, needed)
+
+    def _uniform(self, low, high, k):
+        """k số ngẫu nhiên đều trong [low, high), ghi vào buffer tạm dùng lại"""
+        if k > len(self._random):
+            self._random = np.empty(k, dtype=np.float64)
+        values = self._random[:k]
+        _np_rng.random(out=values)
+        values *= high - low
+        values += low
+        return values
+
+    def emit(self, x, y, count, velocity_x, velocity_y, lifetime):
+        """Sinh count hạt tại (x, y) thẳng vào mảng trạng thái.
+
+        velocity_x, velocity_y, lifetime là khoảng (min, max), lifetime tính cả max;
+        màu chọn ngẫu nhiên trong palette.
+        """
+        if count <= 0:
             return
+        s = self._reserve(count)
+        self.position[s] = (x, y)
+        self.velocity[s, 0] = self._uniform(velocity_x[0], velocity_x[1], count)
+        self.velocity[s, 1] = self._uniform(velocity_y[0], velocity_y[1], count)
+        self.age[s] = 0
+        self.lifetime[s] = np.floor(self._uniform(lifetime[0], lifetime[1] + 1, count), out=self._random[:count])
+        self.color[s] = np.floor(self._uniform(0, len(self.palette), count), out=self._random[:count])
+        self.count = s.stop
 
-        # Update position
-        self.rect.x += self.velocity_x
-        self.rect.y += self.velocity_y
-        self.velocity_y += self.gravity
-
-        # Fade out effect
-        alpha = max(0, 255 * (1 - self.age / self.lifetime))
-        faded_color = (*self.original_color, int(alpha))
-        self.image = pygame.Surface(const.PARTICLE_SIZE, pygame.SRCALPHA)
-        temp_color = self.original_color + (int(alpha),) if len(self.original_color) == 3 else self.original_color
-        pygame.draw.circle(self.image, temp_color, (2, 2), 2)
-
-class FloatingText(pygame.sprite.Sprite):
-    def __init__(self, x, y, text, color, font, lifetime=1500):
-        super().__init__()
+    def update(self, dt=const.EFFECT_FRAME_MS):
+        """Cập nhật vật lý cho toàn bộ hạt trong một bước vector hóa"""
+        self.step_scale = dt / const.EFFECT_FRAME_MS
+        n = self.count
+        if n == 0:
+            return
+        self.age[:n] += dt
+
+        # Drop expired particles by compacting the live ones to the front
+        alive = self.age[:n] < self.lifetime[:n]
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            n = len(keep)
+            self.position[:n] = self.position[keep]
+            self.velocity[:n] = self.velocity[keep]
+            self.age[:n] = self.age[keep]
+            self.lifetime[:n] = self.lifetime[keep]
+            self.color[:n] = self.color[keep]
+            self.count = n
+
+        self.position[:n] += self.velocity[:n] * self.step_scale
+        self.velocity[:n, 1] += self.gravity * self.step_scale
+
+    def draw(self, surface, interpolation=0.0):
+        """Vẽ toàn bộ hạt bằng một lần gọi Surface.blits, trả về vùng bao (hoặc None).
+
+        interpolation (0.0 - 1.0) là phần bước mô phỏng đã trôi qua kể từ lần update cuối.
+        """
+        n = self.count
+        if n == 0:
+            return None
+        # Fade out: pick the pre-faded frame closest to the current alpha
+        remaining = 1 - self.age[:n] / self.lifetime[:n]
+        steps = np.rint(remaining * (self.alpha_steps - 1)).astype(np.intp)
+        frame_index = self.color[:n] * self.alpha_steps + steps
+        position = self.position[:n]
+        if interpolation:
+            position = position + self.velocity[:n] * (self.step_scale * interpolation)
+        topleft = (position - self.half_size).astype(np.intp)
+
+        # Cull particles that already fell outside the surface
+        width, height = surface.get_size()
+        visible = ((topleft[:, 0] > -const.PARTICLE_SIZE[0]) & (topleft[:, 0] < width) &
+                   (topleft[:, 1] > -const.PARTICLE_SIZE[1]) & (topleft[:, 1] < height))
+        if not visible.all():
+            frame_index = frame_index[visible]
+            topleft = topleft[visible]
+        if len(topleft) == 0:
+            return None
+
+        particle_frames.record_hits(len(frame_index))
+        frames = self._frames
+        surface.blits([(frames[i], pos) for i, pos in zip(frame_index.tolist(), topleft.tolist())],
+                      doreturn=False)
+
+        low = topleft.min(axis=0)
+        high = topleft.max(axis=0)
+        return pygame.Rect(int(low[0]), int(low[1]),
+                           int(high[0] - low[0]) + const.PARTICLE_SIZE[0],
+                           int(high[1] - low[1]) + const.PARTICLE_SIZE[1])
+
+    def empty(self):
+        """Xóa toàn bộ hạt"""
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+class TextFrameCache:
+    """Cache dùng chung cho chữ đã render và các bản fade theo mức alpha.
+
+    Khóa theo (font, text, màu) và (font, text, màu, mức alpha); giới hạn số
+    phần tử theo kiểu LRU để các chuỗi điểm số khác nhau không làm phình bộ nhớ.
+    """
+
+    def __init__(self, alpha_steps=const.TEXT_ALPHA_STEPS, max_entries=const.TEXT_FRAME_CACHE_SIZE):
+        self.alpha_steps = alpha_steps
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.renders = 0
+
+    def alpha_step(self, alpha):
+        """Lượng tử hóa alpha (0-255) thành chỉ số mức alpha"""
+        step = int(alpha * (self.alpha_steps - 1) / 255 + 0.5)
+        return max(0, min(self.alpha_steps - 1, step))
+
+    def _lookup(self, key):
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+        return surface
+
+    def _store(self, key, surface):
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def render(self, font, text, color):
+        """Chữ đã rasterize, chỉ gọi font.render khi chưa có trong cache"""
+        key = (font, text, color)
+        surface = self._lookup(key)
+        if surface is None:
+            self.renders += 1
+            surface = self._store(key, font.render(text, True, color))
+        return surface
+
+    def faded(self, font, text, color, step):
+        """Bản sao của chữ với alpha đã lượng tử hóa, dùng chung giữa các sprite"""
+        key = (font, text, color, step)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = self.render(font, text, color).copy()
+            surface.set_alpha(round(255 * step / (self.alpha_steps - 1)))
+            self._store(key, surface)
+        return surface
+
+# Cache chữ dùng chung cho FloatingText
+text_frames = TextFrameCache()
+
+class GlyphAtlas:
+    """Glyph từng ký tự đã tô màu và scale sẵn, khóa theo (font, ký tự, màu, mức scale).
+
+    Số phần tử bị chặn bởi bộ ký tự x màu x mức scale (không phụ thuộc chuỗi), nên chuỗi
+    điểm số mới chỉ cần ghép lại từ glyph có sẵn, không phải rasterize hay scale lại.
+    """
+
+    def __init__(self, max_scale=const.RAINBOW_TEXT_MAX_SCALE, scale_steps=const.RAINBOW_TEXT_SCALE_STEPS):
+        self.max_scale = max_scale
+        self.scale_steps = scale_steps
+        self.glyphs = {}
+        self.renders = 0
+
+    def scale(self, step):
+        return 1.0 + self.max_scale * step / (self.scale_steps - 1)
+
+    def glyph(self, font, char, color, step):
+        key = (font, char, color, step)
+        surface = self.glyphs.get(key)
+        if surface is None:
+            self.renders += 1
+            surface = font.render(char, True, color)
+            if step:
+                scale = self.scale(step)
+                size = (int(surface.get_width() * scale), int(surface.get_height() * scale))
+                surface = pygame.transform.scale(surface, size)
+            self.glyphs[key] = surface
+        return surface
+
+    def text_size(self, font, text, step):
+        """Kích thước chuỗi ghép từ glyph ở mức scale này"""
+        color = const.RAINBOW_COLORS[0]
+        width = height = 0
+        for char in text:
+            glyph = self.glyph(font, char, color, step)
+            width += glyph.get_width()
+            height = max(height, glyph.get_height())
+        return width, height
+
+    def build(self, font, chars, colors=const.RAINBOW_COLORS):
+        for char in chars:
+            for color in colors:
+                for step in range(self.scale_steps):
+                    self.glyph(font, char, color, step)
+
+# Glyph dùng chung cho RainbowText
+rainbow_glyphs = GlyphAtlas()
+
+def init_rainbow_glyphs(font, chars=const.RAINBOW_TEXT_CHARS):
+    """Dựng sẵn glyph cho chữ combo (gọi lúc load tài nguyên)"""
+    rainbow_glyphs.build(font, chars)
+
+class FloatingText(PooledEffect):
+    __slots__ = ('font', 'original_color', 'text', 'lifetime', 'age', 'start_y')
+
+    def reset(self, x, y, text, color, font, lifetime=1500):
         self.font = font
         self.original_color = color
         self.text = text
         self.lifetime = lifetime
         self.age = 0
         self.start_y = y
-        self.image = self.font.render(text, True, color)
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = text_frames.faded(font, text, color, text_frames.alpha_steps - 1)
+        self.rect.size = self.image.get_size()
+        self.rect.center = (x, y)
 
-    def update(self):
-        self.age += 16
+    def update(self, dt=const.EFFECT_FRAME_MS):
+        self.age += dt
         if self.age >= self.lifetime:
-            self.kill()
-            return
+            return False
 
         # Float upward and fade
         progress = self.age / self.lifetime
         self.rect.y = self.start_y - (progress * 50)  # Float up 50 pixels
         
-        # Fade out
+        # Fade out: swap to the shared frame of the nearest alpha step
         alpha = max(0, 255 * (1 - progress))
-        faded_color = (*self.original_color, int(alpha))
-        self.image = self.font.render(self.text, True, self.original_color)
-        # Apply alpha to surface
-        temp_surface = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-        temp_surface.blit(self.image, (0, 0))
-        temp_surface.set_alpha(alpha)
-        self.image = temp_surface
+        self.image = text_frames.faded(self.font, self.text, self.original_color,
+                                       text_frames.alpha_step(alpha))
+        return True
 
 class ScreenShake:
     def __init__(self):
@@ -82,96 +494,140 @@ class ScreenShake:
         self.shake_duration = max(self.shake_duration, duration)
         self.shake_timer = 0
 
-    def update(self):
+    def update(self, dt=const.EFFECT_FRAME_MS):
         if self.shake_timer < self.shake_duration:
-            self.shake_timer += 16  # 60 FPS
+            self.shake_timer += dt
             return True
         else:
             self.shake_amount = 0
             return False
 
+    def is_active(self):
+        """Màn hình có đang rung không"""
+        return self.shake_amount > 0
+
     def get_offset(self):
         if self.shake_amount > 0:
             return (random.randint(-self.shake_amount, self.shake_amount),
                    random.randint(-self.shake_amount, self.shake_amount))
         return (0, 0)
 
-class ExplosionEffect(pygame.sprite.Sprite):
-    def __init__(self, x, y, color=const.YELLOW):
-        super().__init__()
+class ExplosionEffect(PooledEffect):
+    __slots__ = ('center_x', 'center_y', 'color', 'radius', 'max_radius', 'growth_rate', 'alpha', 'fade_rate')
+
+    def _allocate(self):
+        # The drawing surface is kept across reuses
+        self.max_radius = const.EXPLOSION_MAX_RADIUS
+        self.image = pygame.Surface((self.max_radius * 2, self.max_radius * 2), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+
+    def reset(self, x, y, color=const.YELLOW):
         self.center_x = x
         self.center_y = y
         self.color = color
         self.radius = 5
-        self.max_radius = const.EXPLOSION_MAX_RADIUS
         self.growth_rate = const.EXPLOSION_GROWTH_RATE
         self.alpha = 255
         self.fade_rate = const.EXPLOSION_FADE_RATE
-        self.image = pygame.Surface((self.max_radius * 2, self.max_radius * 2), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image.fill((0, 0, 0, 0))
+        self.rect.center = (x, y)
 
-    def update(self):
+    def update(self, dt=const.EFFECT_FRAME_MS):
         self.image.fill((0, 0, 0, 0))
         
         # Draw expanding circles
         for i in range(3):
             current_radius = max(0, self.radius - i * 15)
             if current_radius > 0:
-                circle_alpha = max(0, self.alpha - i * 50)
+                circle_alpha = max(0, int(self.alpha) - i * 50)
                 color_with_alpha = (*self.color, circle_alpha)
                 center = (self.max_radius, self.max_radius)
                 pygame.draw.circle(self.image, color_with_alpha, center, int(current_radius), 3)
         
-        self.radius += self.growth_rate
-        self.alpha -= self.fade_rate
+        step = dt / const.EFFECT_FRAME_MS
+        self.radius += self.growth_rate * step
+        self.alpha -= self.fade_rate * step
         
-        if self.alpha <= 0 or self.radius >= self.max_radius:
-            self.kill()
+        return not (self.alpha <= 0 or self.radius >= self.max_radius)
+
+class RainbowText(PooledEffect):
+    """Chữ combo đổi màu cầu vồng và phóng to rồi thu lại.
 
-class RainbowText(pygame.sprite.Sprite):
-    def __init__(self, x, y, text, font, lifetime=2000):
-        super().__init__()
+    Mỗi frame ghép từ các glyph dùng chung trong rainbow_glyphs vào canvas riêng của
+    sprite (giữ lại giữa các lần dùng, chỉ cấp phát lại khi chuỗi dài hơn mọi lần trước),
+    alpha đặt trên canvas đó nên lấy lại object từ pool không tạo Surface mới.
+    """
+    __slots__ = ('text', 'font', 'lifetime', 'age', 'start_y', 'color_index', 'canvas', 'frame_key')
+
+    def _allocate(self):
+        super()._allocate()
+        self.canvas = None
+
+    def reset(self, x, y, text, font, lifetime=2000):
         self.text = text
         self.font = font
         self.lifetime = lifetime
         self.age = 0
         self.start_y = y
         self.color_index = 0
-        self.image = self.font.render(text, True, const.RAINBOW_COLORS[0])
-        self.rect = self.image.get_rect(center=(x, y))
+        # Sized for the largest scale step so every frame of this text fits
+        width, height = rainbow_glyphs.text_size(font, text, rainbow_glyphs.scale_steps - 1)
+        if self.canvas is None or self.canvas.get_width() < width or self.canvas.get_height() < height:
+            self.canvas = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.image = self.canvas
+        self.frame_key = None
+        self._compose(0, 0)
+        self.canvas.set_alpha(255)
+        self.rect.size = self.canvas.get_size()
+        self.rect.center = (x, y)
 
-    def update(self):
-        self.age += 16
-        if self.age >= self.lifetime:
-            self.kill()
+    def _compose(self, color_index, scale_step):
+        """Ghép chữ ở màu và mức scale này vào giữa canvas (bỏ qua khi frame không đổi)"""
+        key = (color_index, scale_step)
+        if key == self.frame_key:
             return
+        self.frame_key = key
+        color = const.RAINBOW_COLORS[color_index]
+        canvas = self.canvas
+        width, height = rainbow_glyphs.text_size(self.font, self.text, scale_step)
+        x = (canvas.get_width() - width) // 2
+        y = (canvas.get_height() - height) // 2
+        canvas.fill((0, 0, 0, 0))
+        for char in self.text:
+            glyph = rainbow_glyphs.glyph(self.font, char, color, scale_step)
+            canvas.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+    def update(self, dt=const.EFFECT_FRAME_MS):
+        self.age += dt
+        if self.age >= self.lifetime:
+            return False
 
         # Animate rainbow colors
-        self.color_index = (self.color_index + 0.2) % len(const.RAINBOW_COLORS)
-        current_color = const.RAINBOW_COLORS[int(self.color_index)]
+        self.color_index = (self.color_index + 0.2 * dt / const.EFFECT_FRAME_MS) % len(const.RAINBOW_COLORS)
         
         # Float upward and scale
         progress = self.age / self.lifetime
         self.rect.y = self.start_y - (progress * 80)
-        scale = 1.0 + math.sin(progress * math.pi) * 0.5
-        
-        # Create scaled text
-        text_surface = self.font.render(self.text, True, current_color)
-        if scale != 1.0:
-            new_width = int(text_surface.get_width() * scale)
-            new_height = int(text_surface.get_height() * scale)
-            if new_width > 0 and new_height > 0:
-                text_surface = pygame.transform.scale(text_surface, (new_width, new_height))
+        scale = math.sin(progress * math.pi) * const.RAINBOW_TEXT_MAX_SCALE
+        scale_step = int(scale / const.RAINBOW_TEXT_MAX_SCALE * (rainbow_glyphs.scale_steps - 1) + 0.5)
         
-        # Apply fade
-        alpha = int(255 * (1 - progress))
-        text_surface.set_alpha(alpha)
-        self.image = text_surface
-        self.rect = self.image.get_rect(center=self.rect.center)
-
-class StarEffect(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
+        # Redraw only when the color or scale step changes, then apply fade
+        self._compose(int(self.color_index), scale_step)
+        self.canvas.set_alpha(int(255 * (1 - progress)))
+        return True
+
+class StarEffect(PooledEffect):
+    __slots__ = ('x', 'y', 'size', 'max_size', 'growth_rate', 'rotation', 'rotation_speed', 'color',
+                 'alpha', 'fade_rate', 'lifetime', 'age', 'velocity_x', 'velocity_y')
+
+    def _allocate(self):
+        # Sized for the largest possible star so the surface can be reused by any star
+        size = int(const.STAR_SIZE_MAX * 3 * 2)
+        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+
+    def reset(self, x, y):
         self.x = x
         self.y = y
         self.size = random.uniform(const.STAR_SIZE_MIN, const.STAR_SIZE_MAX)
@@ -187,28 +643,29 @@ class StarEffect(pygame.sprite.Sprite):
         self.velocity_x = random.uniform(-2, 2)
         self.velocity_y = random.uniform(-4, -1)
         
-        self.image = pygame.Surface((int(self.max_size * 2), int(self.max_size * 2)), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image.fill((0, 0, 0, 0))
+        self.rect.center = (x, y)
 
-    def update(self):
-        self.age += 16
+    def update(self, dt=const.EFFECT_FRAME_MS):
+        self.age += dt
         if self.age >= self.lifetime:
-            self.kill()
-            return
+            return False
 
         # Update position
-        self.x += self.velocity_x
-        self.y += self.velocity_y
+        step = dt / const.EFFECT_FRAME_MS
+        self.x += self.velocity_x * step
+        self.y += self.velocity_y * step
         self.rect.center = (int(self.x), int(self.y))
 
         # Update star properties
-        self.size = min(self.max_size, self.size + self.growth_rate)
-        self.rotation += self.rotation_speed
-        self.alpha = max(0, self.alpha - self.fade_rate)
+        self.size = min(self.max_size, self.size + self.growth_rate * step)
+        self.rotation += self.rotation_speed * step
+        self.alpha = max(0, self.alpha - self.fade_rate * step)
 
         # Draw rotating star
         self.image.fill((0, 0, 0, 0))
         self.draw_star()
+        return True
 
     def draw_star(self):
         points = []
@@ -230,22 +687,29 @@ class StarEffect(pygame.sprite.Sprite):
             color_with_alpha = (*self.color, int(self.alpha))
             pygame.draw.polygon(self.image, color_with_alpha, points)
 
-class WaveEffect(pygame.sprite.Sprite):
-    def __init__(self, x, y, color=const.ELECTRIC_BLUE):
-        super().__init__()
+class WaveEffect(PooledEffect):
+    __slots__ = ('center_x', 'center_y', 'color', 'radius', 'max_radius', 'wave_speed', 'wave_count',
+                 'alpha', 'fade_rate')
+
+    def _allocate(self):
+        # The drawing surface is kept across reuses
+        self.max_radius = const.WAVE_MAX_RADIUS
+        self.image = pygame.Surface((self.max_radius * 2, self.max_radius * 2), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+
+    def reset(self, x, y, color=const.ELECTRIC_BLUE):
         self.center_x = x
         self.center_y = y
         self.color = color
         self.radius = 0
-        self.max_radius = const.WAVE_MAX_RADIUS
         self.wave_speed = const.WAVE_SPEED
         self.wave_count = const.WAVE_COUNT
         self.alpha = 255
         self.fade_rate = const.WAVE_FADE_RATE
-        self.image = pygame.Surface((self.max_radius * 2, self.max_radius * 2), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image.fill((0, 0, 0, 0))
+        self.rect.center = (x, y)
 
-    def update(self):
+    def update(self, dt=const.EFFECT_FRAME_MS):
         self.image.fill((0, 0, 0, 0))
         center = (self.max_radius, self.max_radius)
         
@@ -253,29 +717,87 @@ class WaveEffect(pygame.sprite.Sprite):
         for i in range(self.wave_count):
             wave_radius = (self.radius - i * 30) % self.max_radius
             if wave_radius > 0:
-                wave_alpha = max(0, self.alpha - i * 60)
+                wave_alpha = max(0, int(self.alpha) - i * 60)
                 color_with_alpha = (*self.color, wave_alpha)
                 if wave_radius < self.max_radius - 5:
                     pygame.draw.circle(self.image, color_with_alpha, center, int(wave_radius), 2)
         
-        self.radius += self.wave_speed
-        self.alpha -= self.fade_rate
+        step = dt / const.EFFECT_FRAME_MS
+        self.radius += self.wave_speed * step
+        self.alpha -= self.fade_rate * step
         
-        if self.alpha <= 0:
-            self.kill()
+        return self.alpha > 0
+
+# Pool dùng chung cho từng loại hiệu ứng
+floating_text_pool = EffectPool(FloatingText)
+rainbow_text_pool = EffectPool(RainbowText)
+explosion_pool = EffectPool(ExplosionEffect)
+star_pool = EffectPool(StarEffect)
+wave_pool = EffectPool(WaveEffect)
+effect_pools = {
+    'FloatingText': floating_text_pool,
+    'RainbowText': rainbow_text_pool,
+    'ExplosionEffect': explosion_pool,
+    'StarEffect': star_pool,
+    'WaveEffect': wave_pool
+}
+
+def init_effect_pools(sizes=const.EFFECT_POOL_SIZES):
+    """Tạo sẵn object hiệu ứng (gọi lúc load tài nguyên) để lúc chơi không phải cấp phát"""
+    for name, size in sizes.items():
+        effect_pools[name].reserve(size)
+
+def effect_pool_stats():
+    """Số liệu các pool: kích thước, đang dùng, đỉnh, hit rate"""
+    return {name: pool.stats() for name, pool in effect_pools.items()}
+
+class SplatAtlas:
+    """Các frame splat đã scale, xoay và fade sẵn, tra theo tiến độ splat.
+
+    Mỗi frame gồm các lớp (surface, offset so với tâm) để vẽ bằng một blit mỗi lớp.
+    """
+
+    LAYER_COUNT = 3
+
+    def __init__(self, image, frame_count=const.SPLAT_ATLAS_FRAMES):
+        self.frame_count = max(2, frame_count)
+        self.frames = [self._build_frame(image, index / (self.frame_count - 1))
+                       for index in range(self.frame_count)]
+        self.memory_bytes = sum(surface.get_width() * surface.get_height() * surface.get_bytesize()
+                                for frame in self.frames for surface, _ in frame)
+
+    def _build_frame(self, image, splat_progress):
+        splat_scale = 1.0 + splat_progress * 0.8
+        splat_rotation = splat_progress * 360
+        width, height = image.get_size()
+        layers = []
+
+        # Add multiple splat layers for depth
+        for i in range(self.LAYER_COUNT):
+            layer_scale = splat_scale + i * 0.1
+            layer_alpha = max(0, 255 - i * 80 - int(splat_progress * 100))
+            layer_splat = pygame.transform.scale(image, (int(width * layer_scale), int(height * layer_scale)))
+            layer_splat.set_alpha(layer_alpha)
+            layers.append(layer_splat)
+
+        scaled_splat = pygame.transform.scale(image, (int(width * splat_scale), int(height * splat_scale)))
+        layers.append(pygame.transform.rotate(scaled_splat, splat_rotation))
+
+        return [(layer, (-(layer.get_width() // 2), -(layer.get_height() // 2))) for layer in layers]
+
+    def frame_at(self, splat_progress):
+        """Frame gần nhất với tiến độ splat (0.0 - 1.0)"""
+        index = int(min(1.0, max(0.0, splat_progress)) * (self.frame_count - 1) + 0.5)
+        return self.frames[index]
+
+    def draw(self, surface, center, splat_progress):
+        """Vẽ splat tại tâm cho trước, trả về danh sách vùng đã vẽ"""
+        cx, cy = center
+        return [surface.blit(layer, (cx + dx, cy + dy)) for layer, (dx, dy) in self.frame_at(splat_progress)]
 
-def create_blood_particles(x, y, combo=1):
-    """Tạo hiệu ứng máu khi tiêu diệt zombie"""
-    particles = pygame.sprite.Group()
+def create_blood_particles(particles, x, y, combo=1):
+    """Sinh hạt máu khi tiêu diệt zombie thẳng vào ParticleSystem, trả về số hạt"""
     particle_count = const.BLOOD_PARTICLE_COUNT_BASE + combo * const.BLOOD_PARTICLE_COUNT_COMBO_BONUS
     particle_count = min(particle_count, const.BLOOD_PARTICLE_COUNT_MAX)
-    
-    for _ in range(particle_count):
-        velocity_x = random.uniform(-12, 12)
-        velocity_y = random.uniform(-15, -2)
-        color = random.choice([const.BLOOD_RED, const.RED, (180, 0, 0), (120, 0, 0)])
-        lifetime = random.randint(1000, 1800)
-        particle = Particle(x, y, color, velocity_x, velocity_y, lifetime)
-        particles.add(particle)
-    
-    return particles
+    particles.emit(x, y, particle_count, (-12, 12), (-15, -2), (1000, 1800))
+    return particle_count
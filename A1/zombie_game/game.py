@@ -8,19 +8,43 @@ import constants as const
 from zombie import Zombie
 import effects
 from ui import Button, UIRenderer, MouseTrail
+from timing import SystemClock
+from profiler import FrameProfiler
+from spatial import IndexedGroup
+from horde import Horde
+from spawn import SpawnPlanner
+from scheduler import Scheduler, ExpiryIndex
+from utils import play_background_music, set_music_volume, stop_music, music_playing
 
 class Game:
-    def __init__(self, fonts, images, sounds):
+    def __init__(self, fonts, images, sounds, clock=None, rng=None, headless=False, profiler=None, music=True):
         self.fonts = fonts
         self.images = images
         self.sounds = sounds
+
+        # Injectable time source and gameplay RNG (visual-only randomness keeps using `random`,
+        # so a seeded session plays out the same with or without effects)
+        self.clock = clock or SystemClock()
+        self.rng = rng or random.Random()
+        # Headless: no audio, no visual effects
+        self.headless = headless
+        # Background music (off for benchmarks, which never load it)
+        self.music = music and not headless
+        # Timed actions and fades (game-over reveal, music fade, scene transitions), advanced in update()
+        self.scheduler = Scheduler(self.clock)
+        self.game_over_reveal = 0.0  # 0 → 1 while the game-over overlay fades in
+        self.fade = 0.0  # Full-screen fade to black during scene transitions (0 = none)
+        # Per-stage frame profiler (main passes one configured from constants; default is a no-op)
+        self.profiler = profiler or FrameProfiler(enabled=False, export_path=None)
         
         self.state = const.GAME_STATE_MENU
         self.all_sprites = pygame.sprite.Group()
-        self.zombies = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
-        self.floating_texts = pygame.sprite.Group()
-        self.special_effects = pygame.sprite.Group()
+        self.zombies = IndexedGroup()  # Spatially indexed for click and occupancy tests
+        self.horde = None  # Array-backed zombies in HORDE mode
+        self.particles = effects.ParticleSystem()
+        # Pooled effects: finished effects go back to their pool instead of being garbage
+        self.floating_texts = effects.EffectGroup()
+        self.special_effects = effects.EffectGroup()
         
         # Game statistics
         self.hits = 0
@@ -36,13 +60,17 @@ class Game:
         
         # Enhanced visual effects
         self.screen_shake = effects.ScreenShake()
+        self.splat_atlas = None if headless else effects.SplatAtlas(images['splat'])
         self.score_multiplier = 1
         self.last_hit_time = 0
         self.combo_time_window = const.COMBO_TIME_WINDOW
+        # Deadlines of zombie removal and the combo window: each step only touches what is due
+        self.expiries = ExpiryIndex()
+        self.combo_expiry = None
         
         # UI components
-        self.ui_renderer = UIRenderer(fonts)
-        self.mouse_trail = MouseTrail()
+        self.ui_renderer = UIRenderer(fonts, self.clock)
+        self.mouse_trail = MouseTrail(clock=self.clock)
         
         # Background animation
         self.background_stars = []
@@ -50,13 +78,18 @@ class Game:
         
         self.menu_buttons = []
         self.difficulty_buttons = []
+        self.game_over_buttons = []
         self._setup_menu_buttons()
         self._setup_difficulty_buttons()
+        self._setup_game_over_buttons()
         
-        # Spawn timing variables
-        self.last_spawn_time = pygame.time.get_ticks()
+        # Spawn timing variables: a seeded schedule, consumed one event at a time
         self.spawn_interval_min = 1000  # ms
         self.spawn_interval_max = 2000  # ms
+        self.spawn_plan = None
+        self.next_spawn = None
+        self.spawn_origin = 0  # Clock time of schedule time 0, pushed back whenever a spawn is held up
+        self.next_spawn_time = float('inf')
 
     def _setup_menu_buttons(self):
         """Thiết lập các button menu"""
@@ -75,43 +108,107 @@ class Game:
     def _setup_difficulty_buttons(self):
         """Thiết lập các button chọn độ khó"""
         classic_button = Button(
-            const.WIDTH // 2 - 100, const.HEIGHT // 2 - 160, 200, 70, "Classic", self.fonts['medium'],
+            const.WIDTH // 2 - 100, const.HEIGHT // 2 - 130, 200, 60, "Classic", self.fonts['medium'],
             action=lambda: self.start_game("CLASSIC"),
             normal_image=self.images['button_normal'], hover_image=self.images['button_hover']
         )
         easy_button = Button(
-            const.WIDTH // 2 - 100, const.HEIGHT // 2 - 80, 200, 70, "Easy", self.fonts['medium'],
+            const.WIDTH // 2 - 100, const.HEIGHT // 2 - 60, 200, 60, "Easy", self.fonts['medium'],
             action=lambda: self.start_game("EASY"),
             normal_image=self.images['button_normal'], hover_image=self.images['button_hover']
         )
         medium_button = Button(
-            const.WIDTH // 2 - 100, const.HEIGHT // 2, 200, 70, "Medium", self.fonts['medium'],
+            const.WIDTH // 2 - 100, const.HEIGHT // 2 + 10, 200, 60, "Medium", self.fonts['medium'],
             action=lambda: self.start_game("MEDIUM"),
             normal_image=self.images['button_normal'], hover_image=self.images['button_hover']
         )
         hard_button = Button(
-            const.WIDTH // 2 - 100, const.HEIGHT // 2 + 80, 200, 70, "Hard", self.fonts['medium'],
+            const.WIDTH // 2 - 100, const.HEIGHT // 2 + 80, 200, 60, "Hard", self.fonts['medium'],
             action=lambda: self.start_game("HARD"),
             normal_image=self.images['button_normal'], hover_image=self.images['button_hover']
         )
+        horde_button = Button(
+            const.WIDTH // 2 - 100, const.HEIGHT // 2 + 150, 200, 60, "Horde", self.fonts['medium'],
+            action=lambda: self.start_game("HORDE"),
+            normal_image=self.images['button_normal'], hover_image=self.images['button_hover']
+        )
         back_button = Button(
-            const.WIDTH // 2 - 100, const.HEIGHT // 2 + 160, 200, 70, "Back", self.fonts['medium'],
+            const.WIDTH // 2 - 100, const.HEIGHT // 2 + 220, 200, 60, "Back", self.fonts['medium'],
             action=lambda: self.set_state(const.GAME_STATE_MENU),
             normal_image=self.images['button_normal'], hover_image=self.images['button_hover']
         )
-        self.difficulty_buttons = [classic_button, easy_button, medium_button, hard_button, back_button]
+        self.difficulty_buttons = [classic_button, easy_button, medium_button, hard_button, horde_button, back_button]
+
+    def _setup_game_over_buttons(self):
+        """Thiết lập các button màn hình game over (Play Again, Main Menu)"""
+        play_again_button = Button(
+            const.WIDTH // 2 - 100, const.HEIGHT // 2 + 70, 200, 70,
+            "Play Again", self.fonts['medium'],
+            action=lambda: self.transition_to(const.GAME_STATE_DIFFICULTY),
+            normal_image=self.images['button_normal'], hover_image=self.images['button_hover']
+        )
+        menu_button = Button(
+            const.WIDTH // 2 - 100, const.HEIGHT // 2 + 150, 200, 70,
+            "Main Menu", self.fonts['medium'],
+            action=lambda: self.transition_to(const.GAME_STATE_MENU),
+            normal_image=self.images['button_normal'], hover_image=self.images['button_hover']
+        )
+        self.game_over_buttons = [play_again_button, menu_button]
+
+    def _play_music(self):
+        """Phát nhạc nền ở lần update kế tiếp, hủy fade đang chạy (bỏ qua khi tắt nhạc hoặc headless)"""
+        if not self.music:
+            return
+        self.scheduler.cancel('music')
+        self.scheduler.after(0, self._start_music, tag='music')
+
+    def _start_music(self):
+        set_music_volume(const.BACKGROUND_MUSIC_VOLUME)
+        # Keep a track that is already playing instead of restarting it
+        if not music_playing():
+            play_background_music()
+
+    def _fade_music(self, fade_time):
+        """Fade out nhạc nền theo từng bước update (bỏ qua khi tắt nhạc hoặc headless)"""
+        if not self.music:
+            return
+        self.scheduler.cancel('music')
+        self.scheduler.tween(fade_time, self._set_music_fade, stop_music, tag='music')
+
+    def _set_music_fade(self, progress):
+        set_music_volume(const.BACKGROUND_MUSIC_VOLUME * (1 - progress))
+
+    def _set_game_over_reveal(self, progress):
+        self.game_over_reveal = progress
+
+    def _set_fade(self, progress):
+        self.fade = progress
+
+    def _clear_fade(self, progress):
+        self.fade = 1.0 - progress
 
     def set_state(self, new_state):
-        """Đổi trạng thái game"""
+        """Đổi trạng thái game ngay (hủy chuyển cảnh đang chạy)"""
+        self.scheduler.cancel('transition')
+        self.fade = 0.0
+        self._enter_state(new_state)
+
+    def transition_to(self, new_state, fade_ms=const.SCENE_FADE_MS):
+        """Chuyển trạng thái có fade: tối dần, đổi trạng thái, rồi sáng dần"""
+        if self.scheduler.pending('transition'):
+            return
+        self.scheduler.tween(fade_ms, self._set_fade, lambda: self._switch_faded(new_state, fade_ms), tag='transition')
+
+    def _switch_faded(self, new_state, fade_ms):
+        self._enter_state(new_state)
+        self.scheduler.tween(fade_ms, self._clear_fade, tag='transition')
+
+    def _enter_state(self, new_state):
         self.state = new_state
         if new_state == const.GAME_STATE_PLAYING:
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.fadeout(500)
-            pygame.mixer.music.play(-1)
+            self._play_music()
         elif new_state == const.GAME_STATE_MENU:
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.fadeout(500)
-            pygame.mixer.music.play(-1)
+            self._play_music()
             self.reset_game()
 
     def start_game(self, difficulty):
@@ -126,14 +223,20 @@ class Game:
         self.spawn_interval_max = settings['spawn_interval_max']
 
         self.reset_game()
-        self.timer_start_time = pygame.time.get_ticks()
+        if settings.get('horde'):
+            self.horde = Horde(self.images, self.clock, self.rng, self.max_zombies_on_screen,
+                               settings['horde_spawn_rate'], self.zombie_speed_multiplier, headless=self.headless)
+        else:
+            self.plan_spawns()
+        self.timer_start_time = self.clock.now()
         self.state = const.GAME_STATE_PLAYING
-        pygame.mixer.music.play(-1)
+        self._play_music()
 
     def reset_game(self):
         """Reset trạng thái game"""
         self.all_sprites.empty()
         self.zombies.empty()
+        self.horde = None
         self.particles.empty()
         self.floating_texts.empty()
         self.special_effects.empty()
@@ -142,121 +245,178 @@ class Game:
         self.combo = 0
         self.max_combo = 0
         self.game_over = False
+        self.game_over_reveal = 0.0
+        self.scheduler.cancel('game_over')
         self.timer_start_time = 0
-        self.last_spawn_time = pygame.time.get_ticks()
+        self.spawn_plan = None
+        self.next_spawn_time = float('inf')
         self.screen_shake = effects.ScreenShake()
         self.score_multiplier = 1
         self.last_hit_time = 0
-        self.mouse_trail = MouseTrail()
+        self.expiries.clear()
+        self.combo_expiry = None
+        self.mouse_trail = MouseTrail(clock=self.clock)
         self.background_stars = []
 
+    def plan_spawns(self):
+        """Lập lịch spawn mới từ spawn_interval_min/max hiện tại, seed lấy từ RNG của game"""
+        self.spawn_plan = SpawnPlanner(self.spawn_interval_min, self.spawn_interval_max, self.rng.getrandbits(32))
+        self.spawn_origin = self.clock.now()
+        self._advance_spawn()
+
+    def _advance_spawn(self):
+        self.next_spawn = next(self.spawn_plan)
+        self.next_spawn_time = self.spawn_origin + self.next_spawn.time
+
     def spawn_zombie(self):
-        """Tạo zombie mới"""
-        current_time = pygame.time.get_ticks()
-        if len(self.zombies) < self.max_zombies_on_screen and \
-           current_time - self.last_spawn_time > random.randint(self.spawn_interval_min, self.spawn_interval_max):
-            
-            available_points = [p for p in const.ZOMBIE_SPAWN_POINTS if not self.is_point_occupied(p)]
-            if available_points:
-                pos_x, pos_y = random.choice(available_points)
-                new_zombie = Zombie(self.images['zombie_head'].copy(), self.zombie_speed_multiplier)
-                new_zombie.set_position(pos_x, pos_y)
-                self.all_sprites.add(new_zombie)
-                self.zombies.add(new_zombie)
-                self.last_spawn_time = current_time
+        """Tạo zombie mới khi tới sự kiện kế tiếp trong lịch spawn"""
+        current_time = self.clock.now()
+        if current_time <= self.next_spawn_time:
+            return
+        # Full screen or every spawn point taken: hold the event until there is room
+        if len(self.zombies) >= self.max_zombies_on_screen:
+            return
+        position = self.spawn_plan.free_position(self.next_spawn, self.is_point_occupied)
+        if position is None:
+            return
+
+        new_zombie = Zombie(self.images['zombie_head'], self.zombie_speed_multiplier,
+                            clock=self.clock, rng=self.rng)
+        new_zombie.set_position(*position)
+        self.all_sprites.add(new_zombie)
+        self.zombies.add(new_zombie)
+        self._schedule_expiry(new_zombie)
+        # Later events keep their spacing from this spawn, not from when it was planned
+        self.spawn_origin += current_time - self.next_spawn_time
+        self._advance_spawn()
+
+    def _schedule_expiry(self, zombie):
+        """Đăng ký (lại) thời điểm zombie biến mất trong expiry index"""
+        self.expiries.discard(zombie.expiry)
+        deadline = zombie.deadline()
+        zombie.expiry = None if deadline == float('inf') else \
+            self.expiries.add(deadline, lambda: self._expire_zombie(zombie))
+
+    def _expire_zombie(self, zombie):
+        if not zombie.should_disappear():
+            # Due by the index but not past the deadline by the zombie's own check (float rounding
+            # or exactly at it): check again next step
+            zombie.expiry = self.expiries.add(zombie.deadline(), lambda: self._expire_zombie(zombie))
+            return
+        # Expired zombies are not misses, only empty clicks are
+        zombie.expiry = None
+        zombie.kill()
+
+    def _expire_combo(self):
+        if self.clock.now() - self.last_hit_time < self.combo_time_window:
+            self.combo_expiry = self.expiries.add(self.last_hit_time + self.combo_time_window, self._expire_combo)
+            return
+        # Window closed without a hit: the next hit starts a new combo anyway, so stop showing this one
+        self.combo_expiry = None
+        self.combo = 0
 
     def is_point_occupied(self, point):
         """Kiểm tra xem vị trí có bị chiếm không"""
-        for zombie in self.zombies:
+        for zombie in self.zombies.sprites_at(point):
             buffer_rect = zombie.rect.inflate(-20, -20)
             if buffer_rect.collidepoint(point):
                 return True
         return False
 
-    def handle_click(self, pos):
-        """Xử lý click chuột"""
+    def handle_click(self, pos, click_time=None):
+        """Xử lý click chuột; click_time là thời điểm click (mặc định: bây giờ) dùng cho combo"""
         if self.game_over:
             return
         
         clicked_on_zombie = False
-        zombies_to_check = list(self.zombies)
-        for zombie in zombies_to_check:
-            if zombie.rect.collidepoint(pos) and not zombie.hit:
-                if self.sounds['splat']:
-                    self.sounds['splat'].play()
-                
-                # Update combo system
-                current_time = pygame.time.get_ticks()
-                if current_time - self.last_hit_time < self.combo_time_window:
-                    self.combo += 1
-                else:
-                    self.combo = 1
-                
-                self.max_combo = max(self.max_combo, self.combo)
-                self.last_hit_time = current_time
-                
-                # Calculate score with combo multiplier
-                score_gain = self.combo
-                self.hits += score_gain
-                
-                zombie.hit_zombie()
-                
-                # Create visual effects based on combo
-                self._create_combo_effects(zombie, score_gain)
-                
-                # Create blood particles
-                blood_particles = effects.create_blood_particles(zombie.rect.center[0], zombie.rect.center[1], self.combo)
-                self.particles.add(blood_particles)
-                
+        if self.horde is not None:
+            zombie_center = self.horde.hit_at(pos)
+            if zombie_center is not None:
+                self._register_hit(zombie_center, click_time)
                 clicked_on_zombie = True
-                break
+        else:
+            for zombie in self.zombies.sprites_at(pos):
+                if not zombie.hit:
+                    zombie.hit_zombie()
+                    self._schedule_expiry(zombie)
+                    self._register_hit(zombie.rect.center, click_time)
+                    clicked_on_zombie = True
+                    break
         
         if not clicked_on_zombie:
             self.misses += 1
             self.combo = 0
-            miss_text = effects.FloatingText(pos[0], pos[1], "MISS!", const.RED, self.fonts['small'], 1000)
+            if self.headless:
+                return
+            miss_text = effects.floating_text_pool.acquire(pos[0], pos[1], "MISS!", const.RED, self.fonts['small'], 1000)
             self.floating_texts.add(miss_text)
 
-    def _create_combo_effects(self, zombie, score_gain):
-        """Tạo hiệu ứng dựa trên combo"""
-        zombie_center = zombie.rect.center
+    def _register_hit(self, zombie_center, hit_time=None):
+        """Cập nhật combo, điểm và hiệu ứng khi đập trúng zombie tại zombie_center"""
+        if self.sounds['splat']:
+            self.sounds['splat'].play()
+        
+        # Update combo system (timed at the click itself, which may be between simulation steps)
+        current_time = self.clock.now() if hit_time is None else hit_time
+        if current_time - self.last_hit_time < self.combo_time_window:
+            self.combo += 1
+        else:
+            self.combo = 1
+        
+        self.max_combo = max(self.max_combo, self.combo)
+        self.last_hit_time = current_time
+        self.expiries.discard(self.combo_expiry)
+        self.combo_expiry = self.expiries.add(current_time + self.combo_time_window, self._expire_combo)
         
+        # Calculate score with combo multiplier
+        score_gain = self.combo
+        self.hits += score_gain
+        
+        if not self.headless:
+            # Create visual effects based on combo
+            self._create_combo_effects(zombie_center, score_gain)
+            
+            # Create blood particles
+            effects.create_blood_particles(self.particles, zombie_center[0], zombie_center[1], self.combo)
+
+    def _create_combo_effects(self, zombie_center, score_gain):
+        """Tạo hiệu ứng dựa trên combo"""
         if self.combo >= 10:
             # Epic combo effects
             self.screen_shake.add_shake(15, 400)
-            explosion = effects.ExplosionEffect(zombie_center[0], zombie_center[1], const.GOLD)
+            explosion = effects.explosion_pool.acquire(zombie_center[0], zombie_center[1], const.GOLD)
             self.special_effects.add(explosion)
             
             # Rainbow text for epic combo
             score_text = f"EPIC +{score_gain} x{self.combo}!"
-            rainbow_text = effects.RainbowText(zombie_center[0], zombie_center[1] - 30, 
-                                     score_text, self.fonts['medium'])
+            rainbow_text = effects.rainbow_text_pool.acquire(zombie_center[0], zombie_center[1] - 30, 
+                                                             score_text, self.fonts['medium'])
             self.floating_texts.add(rainbow_text)
             
             # Star shower effect
             for _ in range(10):
                 star_x = zombie_center[0] + random.randint(-50, 50)
                 star_y = zombie_center[1] + random.randint(-50, 50)
-                star = effects.StarEffect(star_x, star_y)
+                star = effects.star_pool.acquire(star_x, star_y)
                 self.special_effects.add(star)
                 
         elif self.combo >= 5:
             # Great combo effects
             self.screen_shake.add_shake(10, 300)
-            wave = effects.WaveEffect(zombie_center[0], zombie_center[1], const.ELECTRIC_BLUE)
+            wave = effects.wave_pool.acquire(zombie_center[0], zombie_center[1], const.ELECTRIC_BLUE)
             self.special_effects.add(wave)
             
             score_text = f"GREAT +{score_gain} x{self.combo}!"
             color = const.SCORE_COLORS[min(self.combo - 1, len(const.SCORE_COLORS) - 1)]
-            floating_text = effects.FloatingText(zombie_center[0], zombie_center[1] - 20, 
-                                       score_text, color, self.fonts['small'])
+            floating_text = effects.floating_text_pool.acquire(zombie_center[0], zombie_center[1] - 20, 
+                                                               score_text, color, self.fonts['small'])
             self.floating_texts.add(floating_text)
             
             # Multiple stars
             for _ in range(5):
                 star_x = zombie_center[0] + random.randint(-30, 30)
                 star_y = zombie_center[1] + random.randint(-30, 30)
-                star = effects.StarEffect(star_x, star_y)
+                star = effects.star_pool.acquire(star_x, star_y)
                 self.special_effects.add(star)
                 
         else:
@@ -267,54 +427,51 @@ class Game:
                 score_text += f" x{self.combo}"
             
             color = const.SCORE_COLORS[min(self.combo - 1, len(const.SCORE_COLORS) - 1)]
-            floating_text = effects.FloatingText(zombie_center[0], zombie_center[1] - 20, 
-                                       score_text, color, self.fonts['small'])
+            floating_text = effects.floating_text_pool.acquire(zombie_center[0], zombie_center[1] - 20, 
+                                                               score_text, color, self.fonts['small'])
             self.floating_texts.add(floating_text)
 
     def spawn_background_stars(self):
         """Tạo sao trang trí nền"""
-        current_time = pygame.time.get_ticks()
+        if self.headless:
+            return
+        current_time = self.clock.now()
         if current_time - self.star_spawn_timer > const.STAR_SPAWN_INTERVAL:
             for _ in range(2):
                 x = random.randint(0, const.WIDTH)
                 y = random.randint(0, const.HEIGHT)
-                star = effects.StarEffect(x, y)
+                star = effects.star_pool.acquire(x, y)
                 star.lifetime = 5000
                 star.fade_rate = 1
                 self.special_effects.add(star)
             self.star_spawn_timer = current_time
 
-    def update(self):
-        """Cập nhật trạng thái game"""
+    def update(self, dt=const.SIM_STEP_MS):
+        """Cập nhật trạng thái game thêm một bước mô phỏng dt (ms)"""
+        self.scheduler.update()
         if self.state == const.GAME_STATE_PLAYING and not self.game_over:
             self.all_sprites.update()
-            self.particles.update()
-            self.floating_texts.update()
-            self.special_effects.update()
-            self.screen_shake.update()
+            # Zombies whose lifetime or splat ran out, and a lapsed combo window
+            for expire in self.expiries.pop_due(self.clock.now()):
+                expire()
+            self.particles.update(dt)
+            self.floating_texts.update(dt)
+            self.special_effects.update(dt)
+            self.screen_shake.update(dt)
             self.spawn_zombie()
+            if self.horde is not None:
+                # Horde escapes are not counted as misses: with thousands alive most expire unhit
+                self.horde.update()
+                self.horde.spawn(dt)
             self.spawn_background_stars()
 
             # Check game end time
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.now()
             if current_time - self.timer_start_time > self.game_duration:
+                # The world freezes and the overlay fades in; the main loop keeps running meanwhile
                 self.game_over = True
-                pygame.mixer.music.fadeout(1000)
-                pygame.time.wait(1000)
-
-            # Remove zombies that have exceeded their lifetime or been hit
-            zombies_to_remove = []
-            for zombie in self.zombies:
-                if zombie.should_disappear():
-                    if not zombie.hit:  # Zombie disappeared without being hit
-                        self.misses += 1
-                        self.combo = 0
-                    zombies_to_remove.append(zombie)
-            
-            # Remove marked zombies
-            for zombie in zombies_to_remove:
-                self.zombies.remove(zombie)
-                self.all_sprites.remove(zombie)
+                self._fade_music(const.MUSIC_FADE_MS)
+                self.scheduler.tween(const.GAME_OVER_REVEAL_MS, self._set_game_over_reveal, tag='game_over')
 
     def get_game_stats(self):
         """Lấy thống kê game hiện tại"""
@@ -346,42 +503,28 @@ class Game:
                 break
         return None
 
-    def handle_game_over_events(self, event, play_again_button, menu_button):
-        """Xử lý sự kiện game over"""
+    def handle_game_over_events(self, event):
+        """Xử lý sự kiện game over (button chỉ nhận click khi overlay đã hiện hết)"""
+        if event.type == pygame.MOUSEMOTION:
+            for button in self.game_over_buttons:
+                button.is_hovered = button.rect.collidepoint(event.pos)
+        if self.game_over_reveal < 1.0 or self.scheduler.pending('transition'):
+            return
+        # Clicks go by position, not hover: hover is not recorded, so replays would miss them
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if play_again_button.rect.collidepoint(event.pos):
-                if self.sounds['click']:
-                    self.sounds['click'].play()
-                self.set_state(const.GAME_STATE_DIFFICULTY)
-            elif menu_button.rect.collidepoint(event.pos):
-                if self.sounds['click']:
-                    self.sounds['click'].play()
-                self.set_state(const.GAME_STATE_MENU)
+            for button in self.game_over_buttons:
+                if button.rect.collidepoint(event.pos):
+                    if self.sounds['click']:
+                        self.sounds['click'].play()
+                    button.action()
+                    break
 
     def draw_splat_effects(self, game_surface):
-        """Vẽ hiệu ứng máu cho zombie bị đánh"""
+        """Vẽ hiệu ứng máu cho zombie bị đánh, trả về danh sách vùng đã vẽ"""
+        current_time = self.clock.now()
+        rects = []
         for sprite in self.all_sprites:
             if isinstance(sprite, Zombie) and sprite.hit:
-                current_time = pygame.time.get_ticks()
                 splat_progress = min(1.0, (current_time - sprite.splat_time) / sprite.splat_duration)
-                splat_scale = 1.0 + splat_progress * 0.8
-                splat_rotation = splat_progress * 360
-                
-                scaled_splat = pygame.transform.scale(self.images['splat'], 
-                                                    (int(self.images['splat'].get_width() * splat_scale),
-                                                     int(self.images['splat'].get_height() * splat_scale)))
-                rotated_splat = pygame.transform.rotate(scaled_splat, splat_rotation)
-                splat_rect = rotated_splat.get_rect(center=sprite.rect.center)
-                
-                # Add multiple splat layers for depth
-                for i in range(3):
-                    layer_scale = splat_scale + i * 0.1
-                    layer_alpha = max(0, 255 - i * 80 - int(splat_progress * 100))
-                    layer_splat = pygame.transform.scale(self.images['splat'],
-                                                       (int(self.images['splat'].get_width() * layer_scale),
-                                                        int(self.images['splat'].get_height() * layer_scale)))
-                    layer_splat.set_alpha(layer_alpha)
-                    layer_rect = layer_splat.get_rect(center=sprite.rect.center)
-                    game_surface.blit(layer_splat, layer_rect)
-                
-                game_surface.blit(rotated_splat, splat_rect)
+                rects.extend(self.splat_atlas.draw(game_surface, sprite.rect.center, splat_progress))
+        return rects
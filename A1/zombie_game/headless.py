@@ -0,0 +1,81 @@
+"""
+Chế độ mô phỏng headless cho Zombie Head Smash Game: không màn hình, không âm thanh,
+đồng hồ mô phỏng và RNG có seed. Dùng cho cân bằng game, kiểm thử hồi quy và load test.
+
+Ví dụ:
+    python headless.py --difficulty HARD --seed 42 --sessions 10
+"""
+
+import argparse
+import random
+import time
+import constants as const
+from game import Game
+from timing import ManualClock
+from utils import create_placeholder_images
+
+def create_headless_game(seed=None, clock=None):
+    """Tạo Game không cần màn hình/mixer, với đồng hồ mô phỏng và RNG có seed"""
+    fonts = {'large': None, 'medium': None, 'small': None}
+    sounds = {'splat': None, 'click': None}
+    return Game(fonts, create_placeholder_images(), sounds,
+                clock=clock or ManualClock(), rng=random.Random(seed), headless=True)
+
+class AutoPlayer:
+    """Người chơi tự động: click zombie sau thời gian phản xạ, đôi khi click trượt"""
+
+    def __init__(self, seed=None, reaction_time=350, accuracy=0.9, clicks_per_second=4):
+        self.rng = random.Random(seed)
+        self.reaction_time = reaction_time
+        self.accuracy = accuracy
+        self.click_interval = 1000 / clicks_per_second
+        self.next_click_time = 0
+
+    def act(self, game):
+        """Quyết định click trong bước mô phỏng hiện tại"""
+        now = game.clock.now()
+        if now < self.next_click_time:
+            return
+        if game.horde is not None:
+            target = game.horde.target(self.reaction_time)
+        else:
+            targets = [zombie for zombie in game.zombies
+                       if not zombie.hit and now - zombie.spawn_time >= self.reaction_time]
+            target = targets[0].home if targets else None
+        if target is None:
+            return
+        if self.rng.random() < self.accuracy:
+            pos = target
+        else:
+            pos = (self.rng.randint(0, const.WIDTH), self.rng.randint(0, const.HEIGHT))
+        game.handle_click(pos)
+        self.next_click_time = now + self.click_interval
+
+def run_session(difficulty="MEDIUM", seed=0, player=None, step_ms=const.SIM_STEP_MS):
+    """Chạy trọn một ván với tốc độ tối đa, trả về thống kê cuối ván"""
+    game = create_headless_game(seed)
+    player = player or AutoPlayer(seed)
+    game.start_game(difficulty)
+    while not game.game_over:
+        player.act(game)
+        game.clock.advance(step_ms)
+        game.update(step_ms)
+    return game.get_game_stats()
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Zombie Head Smash simulation")
+    parser.add_argument("--difficulty", default="MEDIUM", choices=sorted(const.DIFFICULTY_SETTINGS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sessions", type=int, default=1)
+    args = parser.parse_args()
+
+    for index in range(args.sessions):
+        seed = args.seed + index
+        start = time.perf_counter()
+        stats = run_session(args.difficulty, seed)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"seed={seed} hits={stats['hits']} misses={stats['misses']} "
+              f"max_combo={stats['max_combo']} ({elapsed_ms:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
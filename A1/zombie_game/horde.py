@@ -0,0 +1,235 @@
+"""
+Chế độ Horde cho Zombie Head Smash Game: hàng nghìn zombie lưu dạng mảng NumPy
+"""
+
+import numpy as np
+import pygame
+import constants as const
+from zombie import get_zombie_frames
+from effects import SplatAtlas
+
+def _fast_frame(surface, keep_alpha=False):
+    """Bản RLE của một frame để blit hàng nghìn lần mỗi frame.
+
+    Frame đầu zombie được ngưỡng hóa alpha 50% thành colorkey (blit RLE colorkey nhanh hơn
+    nhiều lần so với alpha từng pixel); frame glow giữ alpha để viền mờ không bị mất.
+    """
+    if keep_alpha:
+        frame = surface.copy()
+        frame.set_alpha(255, pygame.RLEACCEL)
+        return frame
+    rgb = pygame.surfarray.array3d(surface)
+    rgb[pygame.surfarray.array_alpha(surface) < 128] = const.HORDE_COLORKEY
+    frame = pygame.surfarray.make_surface(rgb)
+    if pygame.display.get_surface() is not None:
+        frame = frame.convert()
+    frame.set_colorkey(const.HORDE_COLORKEY, pygame.RLEACCEL)
+    return frame
+
+class Horde:
+    """Đám zombie dạng mảng: spawn, vòng đời, animation và hit-test đều vector hóa,
+    vẽ bằng một lần Surface.blits với ảnh dùng chung (không có object Python cho từng zombie).
+    """
+
+    def __init__(self, images, clock, rng, max_alive, spawn_rate, speed_multiplier=1.0,
+                 scale=const.HORDE_ZOMBIE_SCALE, capacity=const.HORDE_CAPACITY, headless=False):
+        self.clock = clock
+        # Gameplay randomness derived from the game RNG so seeded sessions stay reproducible
+        self.rng = np.random.default_rng(rng.getrandbits(32))
+        self.max_alive = max_alive
+        self.spawn_rate = spawn_rate  # zombies per second
+        self.speed_multiplier = speed_multiplier
+        self._spawn_budget = 0.0
+        self.count = 0
+        # Earliest time any zombie can be removed; update() skips the per-zombie check until then
+        self.next_deadline = np.inf
+        self._allocate(capacity)
+
+        # Shared, pre-scaled frame tables: index 0 = base image, then pop-up frames, then glow levels
+        head = images['zombie_head']
+        size = (max(1, int(head.get_width() * scale)), max(1, int(head.get_height() * scale)))
+        self.image = pygame.transform.smoothscale(head, size)
+        frames = get_zombie_frames(self.image)
+        self.half_size = (size[0] / 2, size[1] / 2)
+        self._pop_count = len(frames.pop_frames)
+        self._glow_count = len(frames.glow_frames)
+        # Pop frames that scale to nothing (None) are skipped when drawing
+        self._surfaces = ([_fast_frame(self.image)]
+                          + [_fast_frame(frame) if frame is not None else None for frame, _ in frames.pop_frames]
+                          + [_fast_frame(frame, keep_alpha=True) for frame in frames.glow_frames])
+        self._visible = np.array([surface is not None for surface in self._surfaces])
+        offsets = [(-(s.get_width() // 2), -(s.get_height() // 2)) if s is not None else (0, 0)
+                   for s in self._surfaces]
+        self._offset_x = np.array([dx for dx, _ in offsets], dtype=np.float32)
+        self._offset_y = np.array([dy for _, dy in offsets], dtype=np.float32)
+        self._offset_y[1:1 + self._pop_count] += [bounce for _, bounce in frames.pop_frames]
+        self._width = np.array([s.get_width() if s is not None else 0 for s in self._surfaces], dtype=np.float32)
+        self._height = np.array([s.get_height() if s is not None else 0 for s in self._surfaces], dtype=np.float32)
+        # Farthest any frame reaches from home (bounce, glow border, wiggle): a cheap first hit-test pass
+        self._reach = (float(np.maximum(-self._offset_x, self._offset_x + self._width).max()) + const.ZOMBIE_WIGGLE_MAX,
+                       float(np.maximum(-self._offset_y, self._offset_y + self._height).max()))
+
+        splat = pygame.transform.smoothscale(images['splat'], (int(const.SPLAT_IMAGE_SIZE[0] * scale),
+                                                               int(const.SPLAT_IMAGE_SIZE[1] * scale)))
+        self.splat_atlas = None if headless else SplatAtlas(splat)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.home = np.zeros((capacity, 2), dtype=np.float32)
+        self.spawn_time = np.zeros(capacity, dtype=np.float64)
+        self.lifetime = np.zeros(capacity, dtype=np.float64)
+        self.hit = np.zeros(capacity, dtype=bool)
+        self.splat_time = np.zeros(capacity, dtype=np.float64)
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = (self.home, self.spawn_time, self.lifetime, self.hit, self.splat_time)
+        self._allocate(capacity)
+        for new, previous in zip((self.home, self.spawn_time, self.lifetime, self.hit, self.splat_time), old):
+            new[:self.count] = previous[:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, dt):
+        """Sinh zombie mới theo spawn_rate tại vị trí ngẫu nhiên trên màn hình"""
+        self._spawn_budget += self.spawn_rate * dt / 1000
+        amount = min(int(self._spawn_budget), self.max_alive - self.count)
+        self._spawn_budget -= int(self._spawn_budget)
+        if amount <= 0:
+            return 0
+        if self.count + amount > self.capacity:
+            self._grow(self.count + amount)
+
+        start, end = self.count, self.count + amount
+        margin = const.HORDE_SPAWN_MARGIN + max(self.half_size)
+        self.home[start:end, 0] = self.rng.uniform(margin, const.WIDTH - margin, amount)
+        self.home[start:end, 1] = self.rng.uniform(margin, const.HEIGHT - margin, amount)
+        self.spawn_time[start:end] = self.clock.now()
+        if self.speed_multiplier == 0:
+            self.lifetime[start:end] = np.inf
+        else:
+            self.lifetime[start:end] = self.rng.integers(int(1500 / self.speed_multiplier),
+                                                         int(3000 / self.speed_multiplier), amount, endpoint=True)
+        self.hit[start:end] = False
+        self.count = end
+        self.next_deadline = min(self.next_deadline, self.clock.now() + self.lifetime[start:end].min())
+        return amount
+
+    def update(self):
+        """Bỏ zombie hết thời gian sống hoặc đã hết splat; trả về số zombie hết hạn mà chưa bị đập"""
+        n = self.count
+        now = self.clock.now()
+        # A millisecond of slack so float rounding never skips a zombie the exact check would remove
+        if not n or now < self.next_deadline - 1:
+            return 0
+        hit = self.hit[:n]
+        splat_done = hit & (now - self.splat_time[:n] > const.ZOMBIE_SPLAT_DURATION)
+        expired = ~hit & (now - self.spawn_time[:n] > self.lifetime[:n])
+        dead = splat_done | expired
+        if dead.any():
+            keep = ~dead
+            alive = int(keep.sum())
+            for array in (self.home, self.spawn_time, self.lifetime, self.hit, self.splat_time):
+                array[:alive] = array[:n][keep]
+            self.count = alive
+        n = self.count
+        # Zombies hit since the last check have a new deadline, so take the minimum again
+        self.next_deadline = np.where(self.hit[:n], self.splat_time[:n] + const.ZOMBIE_SPLAT_DURATION,
+                                      self.spawn_time[:n] + self.lifetime[:n]).min() if n else np.inf
+        return int(expired.sum())
+
+    def hit_at(self, pos):
+        """Đập zombie trên cùng (vẽ sau cùng) có frame đang vẽ chứa điểm pos; trả về tâm zombie hoặc None.
+
+        Giống nhánh sprite: zombie đang pop-up chỉ trúng trong ảnh đã scale ở frame hiện tại.
+        """
+        n = self.count
+        if not n:
+            return None
+        reach_x, reach_y = self._reach
+        home = self.home[:n]
+        nearby = np.flatnonzero(~self.hit[:n]
+                                & (np.abs(home[:, 0] - pos[0]) <= reach_x)
+                                & (np.abs(home[:, 1] - pos[1]) <= reach_y))
+        if not nearby.size:
+            return None
+        frame, left, top = self._layout(self.clock.now(), nearby)
+        inside = (self._visible[frame]
+                  & (left <= pos[0]) & (pos[0] < left + self._width[frame])
+                  & (top <= pos[1]) & (pos[1] < top + self._height[frame]))
+        candidates = nearby[inside]
+        if not candidates.size:
+            return None
+        index = candidates[-1]
+        self.hit[index] = True
+        self.splat_time[index] = self.clock.now()
+        self.next_deadline = min(self.next_deadline, self.splat_time[index] + const.ZOMBIE_SPLAT_DURATION)
+        return int(home[index, 0]), int(home[index, 1])
+
+    def target(self, min_age):
+        """Tâm zombie sống lâu nhất chưa bị đập, đã xuất hiện ít nhất min_age ms (cho AutoPlayer)"""
+        n = self.count
+        ready = np.flatnonzero(~self.hit[:n] & (self.clock.now() - self.spawn_time[:n] >= min_age))
+        if not ready.size:
+            return None
+        return tuple(self.home[ready[0]])
+
+    def clear(self):
+        self.count = 0
+        self.next_deadline = np.inf
+        self._spawn_budget = 0.0
+
+    def _layout(self, now, index):
+        """Frame đang vẽ và góc trên trái của các zombie index (slice hoặc mảng chỉ số)"""
+        age = now - self.spawn_time[index]
+
+        # Frame index per zombie: pop-up while young, glow while about to expire, else the base image
+        frame = np.zeros(len(age), dtype=np.intp)
+        popping = age < const.ZOMBIE_POP_ANIMATION_DURATION
+        frame[popping] = 1 + np.minimum(self._pop_count - 1, (age[popping] * self._pop_count
+                                                              / const.ZOMBIE_POP_ANIMATION_DURATION).astype(np.intp))
+        remaining = self.lifetime[index] - age
+        warning = ~self.hit[index] & ~popping & (remaining <= const.ZOMBIE_WARNING_TIME) & (remaining > 0)
+        progress = 1 - remaining[warning] / const.ZOMBIE_WARNING_TIME
+        frame[warning] = 1 + self._pop_count + (progress * (self._glow_count - 1) + 0.5).astype(np.intp)
+
+        x = self.home[index, 0] + self._offset_x[frame]
+        y = self.home[index, 1] + self._offset_y[frame]
+        x[warning] += np.sin(now * 0.02) * const.ZOMBIE_WIGGLE_MAX * progress
+        return frame, x, y
+
+    def draw(self, surface):
+        """Vẽ cả đám bằng một lần blits (zombie rồi tới splat); trả về vùng bao đã vẽ"""
+        n = self.count
+        if not n:
+            return []
+        now = self.clock.now()
+        hit = self.hit[:n]
+        frame, x, y = self._layout(now, slice(0, n))
+
+        visible = self._visible[frame]
+        if not visible.all():
+            frame, x, y = frame[visible], x[visible], y[visible]
+        surfaces = self._surfaces
+        blit_sequence = list(zip([surfaces[i] for i in frame.tolist()], zip(x.astype(np.int32).tolist(),
+                                                                            y.astype(np.int32).tolist())))
+
+        # Splat layers over the zombies that were hit
+        hit_index = np.flatnonzero(hit)
+        if hit_index.size and self.splat_atlas is not None:
+            progress = np.minimum(1.0, (now - self.splat_time[hit_index]) / const.ZOMBIE_SPLAT_DURATION)
+            for (cx, cy), splat_progress in zip(self.home[hit_index].astype(np.int32).tolist(), progress.tolist()):
+                for layer, (dx, dy) in self.splat_atlas.frame_at(splat_progress):
+                    blit_sequence.append((layer, (cx + dx, cy + dy)))
+
+        surface.blits(blit_sequence, doreturn=False)
+
+        # One bounding rect for dirty tracking (the horde covers most of the screen anyway)
+        extent = max(self.half_size) * 2 + const.ZOMBIE_WIGGLE_MAX + 10
+        home = self.home[:n]
+        left, top = home.min(axis=0) - extent
+        right, bottom = home.max(axis=0) + extent
+        return [pygame.Rect(int(left), int(top), int(right - left), int(bottom - top))]
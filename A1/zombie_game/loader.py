@@ -0,0 +1,165 @@
+"""
+Nạp asset nền cho Zombie Head Smash Game.
+
+Decode ảnh/âm thanh chạy trên thread pool (pygame nhả GIL khi decode), còn bước cần
+màn hình (convert, ghi cache) được hoàn tất trên main thread trong poll() mỗi frame, để
+vòng lặp chính vẫn vẽ được màn hình loading. Asset "critical" là những gì Game cần khi
+khởi tạo; phần còn lại (âm thanh, nhạc nền) được nạp tiếp sau khi game đã nhận input.
+"""
+
+import os
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+import constants as const
+from assetpack import get_pack
+from utils import (IMAGE_SPECS, SOUND_SPECS, read_image, load_prepared_image, finish_image,
+                   fallback_image)
+
+class _Job:
+    __slots__ = ('name', 'critical', 'future', 'finish', 'fail')
+
+    def __init__(self, name, critical, future, finish, fail):
+        self.name = name
+        self.critical = critical
+        self.future = future
+        self.finish = finish  # main-thread step, gets the worker result
+        self.fail = fail  # main-thread fallback, gets the exception
+
+def _read_sound(filename):
+    pack = get_pack()
+    sound = pack.sound(filename) if pack is not None else None
+    return sound if sound is not None else pygame.mixer.Sound(os.path.join(const.SOUNDS_DIR, filename))
+
+class AssetLoader:
+    """Nạp ảnh, âm thanh và nhạc nền trên worker thread; poll() mỗi frame để nhận kết quả.
+
+    images/sounds được điền dần; sounds có sẵn khóa với giá trị None cho tới khi nạp xong
+    (Game đã bỏ qua âm thanh None). Mốc thời gian tính từ start_time (perf_counter).
+    """
+
+    def __init__(self, start_time=None, workers=const.LOADER_WORKERS):
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-loader")
+        self._jobs = []
+        self.images = {}
+        self.sounds = {name: None for name in SOUND_SPECS}
+        self.music_loaded = False
+        self.total = 0
+        self.completed = 0
+        self.critical_total = 0
+        self.critical_completed = 0
+        # Startup milestones in ms since start_time
+        self.first_frame_ms = None
+        self.interactive_ms = None
+        self.complete_ms = None
+
+    def _submit(self, name, critical, function, args, finish, fail):
+        self.total += 1
+        self.critical_total += critical
+        self._jobs.append(_Job(name, critical, self._executor.submit(function, *args), finish, fail))
+
+    def _done(self, critical):
+        self.completed += 1
+        self.critical_completed += critical
+
+    def start(self):
+        """Đưa mọi asset vào hàng đợi: ảnh (critical), rồi âm thanh và nhạc nền"""
+        for name, (filename, size, alpha) in IMAGE_SPECS.items():
+            # Packed / cached pixels are a cheap mmap, no need for a worker
+            prepared = load_prepared_image(filename, size, alpha)
+            if prepared is not None:
+                self.images[name] = prepared
+                self.total += 1
+                self.critical_total += 1
+                self._done(True)
+                continue
+            self._submit(name, True, read_image, (os.path.join(const.IMAGES_DIR, filename), size),
+                         partial(self._image_loaded, name, filename, size, alpha),
+                         partial(self._image_failed, name, filename, size, alpha))
+
+        for name, (filename, volume) in SOUND_SPECS.items():
+            self._submit(name, False, _read_sound, (filename,),
+                         partial(self._sound_loaded, name, volume), partial(self._sound_failed, filename))
+
+        self._submit("music", False, pygame.mixer.music.load,
+                     (os.path.join(const.SOUNDS_DIR, "background_music.mp3"),),
+                     self._music_loaded, self._music_failed)
+
+    def _image_loaded(self, name, filename, size, alpha, image):
+        self.images[name] = finish_image(filename, image, size, alpha)
+
+    def _image_failed(self, name, filename, size, alpha, error):
+        print(f"Error loading image {filename}: {error}")
+        self.images[name] = fallback_image(size, alpha)
+
+    def _sound_loaded(self, name, volume, sound):
+        sound.set_volume(volume)
+        self.sounds[name] = sound
+
+    def _sound_failed(self, filename, error):
+        print(f"Error loading sound {filename}: {error}")
+
+    def _music_loaded(self, _):
+        pygame.mixer.music.set_volume(const.BACKGROUND_MUSIC_VOLUME)
+        self.music_loaded = True
+
+    def _music_failed(self, error):
+        print(f"Error loading background music: {error}")
+
+    def poll(self):
+        """Hoàn tất các asset đã decode xong (trên main thread); trả về số asset vừa xong"""
+        finished, pending = [], []
+        for job in self._jobs:
+            (finished if job.future.done() else pending).append(job)
+        self._jobs = pending
+        for job in finished:
+            try:
+                result = job.future.result()
+            except (pygame.error, OSError) as e:
+                job.fail(e)
+            else:
+                try:
+                    job.finish(result)
+                except (pygame.error, OSError) as e:
+                    job.fail(e)
+            self._done(job.critical)
+        if self.done and self.complete_ms is None:
+            self.complete_ms = self._elapsed_ms()
+            self._executor.shutdown(wait=False)
+        return len(finished)
+
+    @property
+    def critical_ready(self):
+        return self.critical_completed == self.critical_total
+
+    @property
+    def done(self):
+        return self.completed == self.total
+
+    def progress(self):
+        """Tỉ lệ asset critical đã sẵn sàng (0..1)"""
+        return self.critical_completed / self.critical_total if self.critical_total else 1.0
+
+    def _elapsed_ms(self):
+        return (time.perf_counter() - self.start_time) * 1000
+
+    def mark_first_frame(self):
+        if self.first_frame_ms is None:
+            self.first_frame_ms = self._elapsed_ms()
+
+    def mark_interactive(self):
+        if self.interactive_ms is None:
+            self.interactive_ms = self._elapsed_ms()
+
+    def report(self):
+        """Dòng tóm tắt thời gian khởi động"""
+        def fmt(value):
+            return "-" if value is None else f"{value:.0f} ms"
+        return (f"Startup: first frame {fmt(self.first_frame_ms)}, interactive {fmt(self.interactive_ms)}, "
+                f"all assets {fmt(self.complete_ms)}")
+
+    def shutdown(self):
+        """Hủy các job chưa chạy (thoát game khi đang loading)"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,147 +1,186 @@
 """
 Entry point for Zombie Head Smash (modularized).
-Uses: constants.py, utils.py, ui.py, game.py, effects.py, zombie.py
+Uses: constants.py, utils.py, ui.py, game.py, effects.py, zombie.py, render.py, profiler.py, loader.py, scenes.py
 """
 
+import time
+_LAUNCH_TIME = time.perf_counter()  # Reference point for time-to-first-frame / time-to-interactive
+
+import random
+from collections import deque
 import pygame
 import constants as const
-from utils import init_pygame, create_screen, load_fonts, load_images, load_sounds
+from utils import init_pygame, create_screen, load_fonts, freeze_loaded_objects
 from game import Game
-from ui import Button, UIRenderer  # Button for game-over actions
-
-def draw_menu(screen, game: Game):
-    # Background
-    screen.blit(game.images['menu_background'], (0, 0))
-    # Title
-    game.ui_renderer.draw_menu_title(screen, "Zombie Head Smash")
-    # Buttons
-    for btn in game.menu_buttons:
-        btn.draw(screen)
-
-def draw_difficulty(screen, game: Game):
-    screen.blit(game.images['menu_background'], (0, 0))
-    game.ui_renderer.draw_menu_title(screen, "Choose Difficulty")
-    for btn in game.difficulty_buttons:
-        btn.draw(screen)
-
-def draw_playing(screen, game: Game):
-    # Separate surface so we can apply screen shake only to gameplay layer
-    game_surface = pygame.Surface((const.WIDTH, const.HEIGHT), pygame.SRCALPHA)
-
-    # Background
-    game_surface.blit(game.images['background'], (0, 0))
-
-    # Sprites
-    for sprite in game.all_sprites:
-        game_surface.blit(sprite.image, sprite.rect)
-
-    # Enhanced splat layers for hit zombies
-    game.draw_splat_effects(game_surface)
-
-    # Effects layers
-    for group in (game.special_effects, game.particles, game.floating_texts):
-        for sprite in group:
-            game_surface.blit(sprite.image, sprite.rect)
-
-    # Apply screen shake
-    shake_offset = game.screen_shake.get_offset()
-    screen.blit(game_surface, shake_offset)
-
-    # UI (not affected by shake)
-    game.ui_renderer.draw_enhanced_ui(screen, game.get_game_stats())
-
-    # Mouse trail
-    mouse_pos = pygame.mouse.get_pos()
-    game.mouse_trail.update(mouse_pos)
-    game.mouse_trail.draw(screen, combo=game.combo)
-
-def draw_game_over(screen, game: Game):
-    # Dim overlay + stats
-    game.ui_renderer.draw_game_over_screen(screen, game.get_game_stats())
-
-    # Action buttons
-    play_again_button = Button(
-        const.WIDTH // 2 - 100, const.HEIGHT // 2 + 70, 200, 70,
-        "Play Again", game.fonts['medium'],
-        action=lambda: game.set_state(const.GAME_STATE_DIFFICULTY),
-        normal_image=game.images['button_normal'], hover_image=game.images['button_hover']
-    )
-    menu_button = Button(
-        const.WIDTH // 2 - 100, const.HEIGHT // 2 + 150, 200, 70,
-        "Main Menu", game.fonts['medium'],
-        action=lambda: game.set_state(const.GAME_STATE_MENU),
-        normal_image=game.images['button_normal'], hover_image=game.images['button_hover']
-    )
-
-    play_again_button.draw(screen)
-    menu_button.draw(screen)
-
-    return play_again_button, menu_button
+import effects
+from ui import UIRenderer
+from render import DirtyRectTracker
+from scenes import SceneManager
+from timing import ManualClock
+from profiler import FrameProfiler
+from loader import AssetLoader
+from controls import InputPipeline
+from replay import InputRecorder, input_kind, dispatch_input, INPUT_MOTION
+
+def run_loading_screen(screen, clock, loader, fonts):
+    # Loading scene while workers decode the critical assets; False if the window was closed
+    ui_renderer = UIRenderer(fonts)
+    ui_renderer.draw_loading_screen(screen, 0.0)
+    pygame.display.flip()
+    loader.mark_first_frame()
+    loader.start()
+    while True:
+        loader.poll()
+        if loader.critical_ready:
+            return True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        ui_renderer.draw_loading_screen(screen, loader.progress())
+        pygame.display.flip()
+        clock.tick(const.RENDER_FPS)
+
+def finish_streaming(loader):
+    # Non-critical assets are in: warm the effect pools, start the menu music and report startup times
+    effects.init_effect_pools()
+    freeze_loaded_objects()
+    if loader.music_loaded:
+        try:
+            if not pygame.mixer.music.get_busy():
+                pygame.mixer.music.play(-1)
+        except Exception:
+            pass
+    print(loader.report())
+
+def dispatch_pending(game, pending, until, recorder=None, step=0):
+    # Apply queued inputs timed before `until` (simulation ms); False once one of them quits the game
+    while pending and pending[0][0] < until:
+        input_time, kind, pos = pending.popleft()
+        # When within the current step the input happened, in 1/100 ms (combo timing, recordings)
+        offset = min(max(int((input_time - game.clock.now()) * 100), 0), 0xffff)
+        # Motion only matters to the menu buttons (hover), so it is not recorded elsewhere
+        if recorder is not None and (kind != INPUT_MOTION or game.state in (const.GAME_STATE_MENU,
+                                                                            const.GAME_STATE_DIFFICULTY)):
+            recorder.record(step, kind, pos, offset)
+        # Quit, ESC, menu/difficulty buttons and clicks on zombies
+        if not dispatch_input(game, kind, pos, offset):
+            pending.clear()
+            return False
+    return True
 
 def main():
     init_pygame()
     screen = create_screen()
     clock = pygame.time.Clock()
 
-    # Assets
+    # Assets: fonts up front for the loading screen, images/sounds decoded in the background
     fonts = load_fonts()
-    images = load_images()
-    sounds = load_sounds()
-
-    # Game instance
-    game = Game(fonts, images, sounds)
-
-    # Start background music (menu)
-    try:
-        if not pygame.mixer.music.get_busy():
-            pygame.mixer.music.play(-1)
-    except Exception:
-        pass
-
+    loader = AssetLoader(start_time=_LAUNCH_TIME)
+    if not run_loading_screen(screen, clock, loader, fonts):
+        loader.shutdown()
+        pygame.quit()
+        return
+    effects.init_particle_frames()
+    effects.init_rainbow_glyphs(fonts['medium'])
+    freeze_loaded_objects()
+
+    # Game instance, driven by the simulation clock so game time only advances in fixed steps.
+    # Sounds still loading are None in loader.sounds and fill in as they arrive.
+    # The gameplay RNG is seeded so a recorded run replays identically
+    sim_clock = ManualClock()
+    profiler = FrameProfiler()
+    seed = random.randrange(1 << 32)
+    game = Game(fonts, loader.images, loader.sounds, clock=sim_clock, rng=random.Random(seed), profiler=profiler)
+    scenes = SceneManager(game)
+    dirty = DirtyRectTracker()
+    recorder = InputRecorder(const.REPLAY_RECORD_PATH, seed) if const.REPLAY_RECORD_PATH else None
+    step_count = 0  # Simulation steps so far, the timestamp of recorded input
+
+    # Fixed-timestep simulation: render at RENDER_FPS, simulate in SIM_STEP_MS steps
+    step_ms = const.SIM_STEP_MS
+    accumulator = 0.0
+
+    # Input: only the event types the game uses, drained and timestamped while waiting for the next frame
+    pipeline = InputPipeline()
+    pipeline.configure_queue()
+    pending = deque()  # (simulation time, kind, pos) of inputs not applied yet
+
+    streaming = True
+    faded_last_frame = False
     running = True
     while running:
-        events = pygame.event.get()
-        for event in events:
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                # ESC: back to menu (or quit if already at menu)
-                if game.state == const.GAME_STATE_MENU:
+        accumulator += pipeline.wait_frame(clock, const.RENDER_FPS)
+        profiler.begin_frame()
+        with profiler.scope("events"):
+            events = []
+            for event, arrival in pipeline.poll():
+                events.append(event)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                    dirty.request_full_redraw()
+                    continue
+                kind = input_kind(event)
+                if kind is not None:
+                    # The simulation trails real time by the accumulator
+                    input_time = sim_clock.now() + accumulator - (pipeline.frame_time - arrival)
+                    pending.append((input_time, kind, getattr(event, 'pos', (0, 0))))
+
+        # Update: catch up in fixed steps, dropping time beyond the catch-up limit. Each input is
+        # applied just before the step that covers its time, so clicks see the zombies as they were
+        steps = 0
+        with profiler.scope("update"):
+            while accumulator >= step_ms and steps < const.MAX_CATCHUP_STEPS:
+                if not dispatch_pending(game, pending, sim_clock.now() + step_ms, recorder, step_count + steps):
                     running = False
-                else:
-                    game.set_state(const.GAME_STATE_MENU)
-            else:
-                # Delegate state-specific event handling
-                if game.state == const.GAME_STATE_MENU:
-                    if game.handle_menu_events(event) == "QUIT":
-                        running = False
-                elif game.state == const.GAME_STATE_DIFFICULTY:
-                    game.handle_difficulty_events(event)
-                elif game.state == const.GAME_STATE_PLAYING and not game.game_over:
-                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        game.handle_click(event.pos)
-
-        # Update
-        game.update()
-
-        # Render
-        if game.state == const.GAME_STATE_MENU:
-            draw_menu(screen, game)
-        elif game.state == const.GAME_STATE_DIFFICULTY:
-            draw_difficulty(screen, game)
-        elif game.state == const.GAME_STATE_PLAYING:
-            # Gameplay layer
-            draw_playing(screen, game)
-            # If game over, draw overlay + buttons and process their events
-            if game.game_over:
-                play_again_btn, menu_btn = draw_game_over(screen, game)
-                # Handle clicks on these buttons for current frame
-                for event in events:
-                    game.handle_game_over_events(event, play_again_btn, menu_btn)
-
-        pygame.display.flip()
-        clock.tick(const.DEFAULT_FPS)
-
+                sim_clock.advance(step_ms)
+                game.update(step_ms)
+                if recorder is not None:
+                    recorder.observe(game)
+                accumulator -= step_ms
+                steps += 1
+            step_count += steps
+            if not dispatch_pending(game, pending, float('inf'), recorder, step_count):
+                running = False
+        if steps == const.MAX_CATCHUP_STEPS:
+            accumulator = min(accumulator, step_ms)
+        interpolation = accumulator / step_ms
+
+        # Frame events for the current scene (game over buttons)
+        scenes.handle_events(events, recorder, step_count)
+
+        # Render the current scene (a scene fade, and the frame right after one ends, redraw everything)
+        fading = game.fade > 0
+        force_full = scenes.needs_full_redraw(screen) or fading or faded_last_frame
+        faded_last_frame = fading
+        dirty.begin_frame(game.state, force_full)
+        scenes.draw(screen, dirty, interpolation)
+
+        # Scene transition fade over the whole frame
+        if fading:
+            dirty.add_overlay(game.ui_renderer.draw_fade(screen, game.fade))
+
+        # Profiler overlay on top of everything (F3)
+        dirty.add_overlay(profiler.draw(screen))
+
+        with profiler.scope("present"):
+            dirty.present(screen)
+        profiler.record_latencies(pipeline.presented())
+        effects.particle_frames.end_frame()
+        profiler.end_frame(game)
+
+        # First frame that takes input, then keep receiving streamed assets
+        loader.mark_interactive()
+        if streaming:
+            loader.poll()
+            if loader.done:
+                finish_streaming(loader)
+                streaming = False
+
+    if recorder is not None:
+        recorder.close(step_count, game)
+    print(pipeline.report())
+    loader.shutdown()
+    profiler.close()
     pygame.quit()
 
 if __name__ == "__main__":
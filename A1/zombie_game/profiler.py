@@ -0,0 +1,218 @@
+"""
+Profiler theo từng hệ thống con cho Zombie Head Smash Game
+"""
+
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+import pygame
+import constants as const
+import effects
+
+# Shared no-op scope returned while profiling is off, so disabled scopes cost one call
+_NULL_SCOPE = nullcontext()
+
+SCOPE_COLORS = {
+    "events": const.LIGHT_GRAY,
+    "update": const.NEON_GREEN,
+    "world": const.ELECTRIC_BLUE,
+    "splats": const.RED,
+    "hud": const.YELLOW,
+    "trail": const.HOT_PINK,
+    "present": const.ORANGE,
+    "frame": const.WHITE
+}
+
+class _Scope:
+    """Đo thời gian một khối code và cộng vào frame hiện tại"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        timings = self.profiler.current
+        timings[self.name] = timings.get(self.name, 0.0) + (time.perf_counter() - self.start) * 1000
+        return False
+
+class FrameProfiler:
+    """Đo thời gian các giai đoạn mỗi frame, đếm sprite, vẽ overlay và xuất CSV/JSONL"""
+
+    def __init__(self, enabled=const.PROFILER_ENABLED, export_path=const.PROFILER_EXPORT_PATH,
+                 scopes=const.PROFILER_SCOPES, history=const.PROFILER_HISTORY):
+        self.scopes = tuple(scopes)
+        self.enabled = enabled or bool(export_path)
+        self.overlay_visible = enabled
+        self.current = {}
+        self.counters = {}
+        self.frame = 0
+        self._frame_start = 0.0
+        self.history = {name: deque(maxlen=history) for name in self.scopes + ("frame",)}
+        # Click-to-present latency of the clicks shown this frame / recently
+        self.latencies = []
+        self.latency_history = deque(maxlen=history)
+        self._scopes = {}
+
+        # Overlay resources, created on first draw
+        self._font = None
+        self._panel = None
+        self._labels = []
+        self._labels_time = 0.0
+
+        self._export_file = None
+        self._writer = None
+        if export_path:
+            self._open_export(export_path)
+
+    def _open_export(self, path):
+        self._export_file = open(path, "w", newline="")
+        if path.endswith(".jsonl"):
+            self._writer = None
+        else:
+            self._writer = csv.writer(self._export_file)
+            self._writer.writerow(["frame", "frame_ms"] + list(self.scopes) + list(self._counter_names())
+                                  + ["click_latency_ms"])
+
+    @staticmethod
+    def _counter_names():
+        return ("zombies", "particles", "floating_texts", "special_effects")
+
+    def scope(self, name):
+        """Context manager đo một giai đoạn; không làm gì khi profiler tắt"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self._scopes.get(name)
+        if scope is None:
+            scope = self._scopes[name] = _Scope(self, name)
+        return scope
+
+    def toggle_overlay(self):
+        """Bật/tắt overlay (F3); việc đo chỉ chạy khi overlay hiện hoặc đang xuất file"""
+        self.overlay_visible = not self.overlay_visible
+        self.enabled = self.overlay_visible or self._export_file is not None
+        for samples in self.history.values():
+            samples.clear()
+        self.latency_history.clear()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.latencies = []
+        self._frame_start = time.perf_counter()
+
+    def record_latencies(self, latencies):
+        """Độ trễ click → present (ms) của các click vừa được hiển thị trong frame này"""
+        if self.enabled and latencies:
+            self.latencies = latencies
+            self.latency_history.extend(latencies)
+
+    def end_frame(self, game):
+        """Kết thúc frame: ghi lịch sử, đếm sprite và xuất một dòng nếu có file"""
+        if not self.enabled:
+            return
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000
+        self.frame += 1
+        counters = self.counters
+        counters["zombies"] = len(game.zombies) + (len(game.horde) if game.horde is not None else 0)
+        counters["particles"] = len(game.particles)
+        counters["floating_texts"] = len(game.floating_texts)
+        counters["special_effects"] = len(game.special_effects)
+
+        current = self.current
+        for name in self.scopes:
+            self.history[name].append(current.get(name, 0.0))
+        self.history["frame"].append(frame_ms)
+
+        if self._export_file is not None:
+            if self._writer is not None:
+                self._writer.writerow([self.frame, round(frame_ms, 3)]
+                                      + [round(current.get(name, 0.0), 3) for name in self.scopes]
+                                      + [counters[name] for name in self._counter_names()]
+                                      + [round(max(self.latencies), 3) if self.latencies else ""])
+            else:
+                record = {"frame": self.frame, "frame_ms": round(frame_ms, 3)}
+                record.update({name: round(value, 3) for name, value in current.items()})
+                record.update(counters)
+                if self.latencies:
+                    record["click_latency_ms"] = [round(latency, 3) for latency in self.latencies]
+                self._export_file.write(json.dumps(record) + "\n")
+
+    def _refresh_labels(self):
+        lines = [(f"{'stage':<8}{'last':>6}{'avg':>6}{'max':>6}", const.LIGHT_GRAY)]
+        for name in ("frame",) + self.scopes:
+            samples = self.history[name]
+            if not samples:
+                continue
+            average = sum(samples) / len(samples)
+            lines.append((f"{name:<8}{samples[-1]:6.2f}{average:6.2f}{max(samples):6.2f}",
+                          SCOPE_COLORS.get(name, const.WHITE)))
+        counters = self.counters
+        lines.append((f"Z {counters.get('zombies', 0)}  P {counters.get('particles', 0)}  "
+                      f"T {counters.get('floating_texts', 0)}  FX {counters.get('special_effects', 0)}",
+                      const.WHITE))
+        latencies = self.latency_history
+        if latencies:
+            lines.append((f"{'click':<8}{latencies[-1]:6.1f}{sum(latencies) / len(latencies):6.1f}"
+                          f"{max(latencies):6.1f}", const.CYAN))
+        pools = effects.effect_pool_stats().values()
+        acquired = sum(pool['acquired'] for pool in pools)
+        reused = sum(pool['hit_rate'] * pool['acquired'] for pool in pools)
+        lines.append((f"pools {sum(pool['in_use'] for pool in pools)}/{sum(pool['size'] for pool in pools)}  "
+                      f"reuse {reused / acquired * 100 if acquired else 100:.1f}%", const.WHITE))
+        self._labels = [self._font.render(text, True, color) for text, color in lines]
+
+    def draw(self, surface):
+        """Vẽ overlay: số liệu (ms hiện tại/trung bình/max) và đồ thị trượt; trả về vùng đã vẽ"""
+        if not self.overlay_visible or not self.history["frame"]:
+            return None
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+            self._panel = pygame.Surface((const.PROFILER_GRAPH_SIZE[0] + 10, 1), pygame.SRCALPHA)
+
+        now = time.perf_counter() * 1000
+        if now - self._labels_time >= const.PROFILER_TEXT_REFRESH_MS or not self._labels:
+            self._refresh_labels()
+            self._labels_time = now
+
+        graph_width, graph_height = const.PROFILER_GRAPH_SIZE
+        line_height = self._font.get_linesize()
+        panel_height = graph_height + line_height * len(self._labels) + 15
+        if self._panel.get_height() != panel_height:
+            self._panel = pygame.Surface((graph_width + 10, panel_height), pygame.SRCALPHA)
+        self._panel.fill((0, 0, 0, 170))
+        panel_rect = self._panel.get_rect(bottomleft=(10, surface.get_height() - 10))
+        rect = surface.blit(self._panel, panel_rect)
+
+        # Rolling graphs, scaled so the frame budget sits at half height
+        left, bottom = panel_rect.left + 5, panel_rect.top + 5 + graph_height
+        scale = graph_height / (const.PROFILER_FRAME_BUDGET_MS * 2)
+        budget_y = bottom - int(const.PROFILER_FRAME_BUDGET_MS * scale)
+        pygame.draw.line(surface, const.DARK_GRAY, (left, budget_y), (left + graph_width, budget_y))
+        step = graph_width / max(1, self.history["frame"].maxlen - 1)
+        for name in self.scopes + ("frame",):
+            samples = self.history[name]
+            if len(samples) < 2 or not any(samples):
+                continue
+            points = [(left + int(i * step), bottom - min(graph_height, int(value * scale)))
+                      for i, value in enumerate(samples)]
+            pygame.draw.lines(surface, SCOPE_COLORS.get(name, const.WHITE), False, points)
+
+        y = bottom + 5
+        for label in self._labels:
+            surface.blit(label, (left, y))
+            y += line_height
+        return rect
+
+    def close(self):
+        if self._export_file is not None:
+            self._export_file.close()
+            self._export_file = None
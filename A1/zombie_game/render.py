@@ -0,0 +1,137 @@
+"""
+Các tiện ích render (back buffer) cho Zombie Head Smash Game
+"""
+
+import pygame
+import constants as const
+
+class BackBuffer:
+    """Back buffer không alpha dùng lại giữa các frame cho lớp gameplay"""
+
+    def __init__(self, screen, size=const.BACK_BUFFER_SIZE, depth=const.BACK_BUFFER_DEPTH):
+        self.size = tuple(size) if size else screen.get_size()
+        if depth:
+            self.surface = pygame.Surface(self.size, 0, depth)
+        else:
+            # Same pixel format as the display so presenting is a plain copy
+            self.surface = pygame.Surface(self.size, 0, screen)
+        self._scaled = None
+
+    def present(self, screen, offset=(0, 0)):
+        """Đưa back buffer lên màn hình với độ lệch (screen shake)"""
+        source = self.surface
+        screen_size = screen.get_size()
+        if self.size != screen_size:
+            if self._scaled is None or self._scaled.get_size() != screen_size:
+                self._scaled = pygame.Surface(screen_size, 0, screen)
+            pygame.transform.scale(source, screen_size, self._scaled)
+            source = self._scaled
+
+        # Fill the strips the shake offset leaves uncovered
+        dx, dy = offset
+        width, height = screen_size
+        if dx > 0:
+            screen.fill(const.BLACK, (0, 0, dx, height))
+        elif dx < 0:
+            screen.fill(const.BLACK, (width + dx, 0, -dx, height))
+        if dy > 0:
+            screen.fill(const.BLACK, (0, 0, width, dy))
+        elif dy < 0:
+            screen.fill(const.BLACK, (0, height + dy, width, -dy))
+
+        screen.blit(source, offset)
+
+    def present_rects(self, screen, rects):
+        """Chỉ chép các vùng cho trước từ back buffer lên màn hình (không lệch)"""
+        surface = self.surface
+        screen.blits([(surface, rect, rect) for rect in rects], doreturn=False)
+
+    def restore_rects(self, background, rects):
+        """Vẽ lại nền vào các vùng cho trước của back buffer"""
+        self.surface.blits([(background, rect, rect) for rect in rects], doreturn=False)
+
+def merge_rects(rects):
+    """Gộp các rect chồng lấn nhau để giảm số vùng cần cập nhật"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+class DirtyRectTracker:
+    """Theo dõi vùng thay đổi mỗi frame cho chế độ cập nhật màn hình từng phần.
+
+    Vùng "world" nằm trên back buffer (sprite, hiệu ứng), vùng "overlay" được
+    vẽ thẳng lên màn hình (HUD, trail, menu). Vùng của frame trước được khôi phục
+    từ nền và đẩy lên cùng vùng của frame hiện tại bằng pygame.display.update(rects).
+    """
+
+    def __init__(self, enabled=const.DIRTY_RECT_MODE):
+        self.enabled = enabled
+        self.full = True
+        self._force_full = True
+        self._state = None
+        self.world_previous = []
+        self.world_current = []
+        self.overlay_previous = []
+        self.overlay_current = []
+        # Metrics of the last presented frame
+        self.dirty_area = 0
+        self.dirty_ratio = 1.0
+        self.rect_count = 0
+
+    def begin_frame(self, state, force_full=False):
+        """Bắt đầu frame mới; trả về True nếu phải vẽ lại toàn màn hình"""
+        self.full = not self.enabled or force_full or self._force_full or state != self._state
+        # A forced frame (e.g. screen shake) leaves the whole screen stale for the next one too
+        self._force_full = force_full
+        self._state = state
+        self.world_current = []
+        self.overlay_current = []
+        return self.full
+
+    def request_full_redraw(self):
+        """Buộc frame kế tiếp vẽ lại toàn màn hình"""
+        self._force_full = True
+
+    def _add(self, target, rects):
+        if rects is None:
+            return
+        if isinstance(rects, pygame.Rect):
+            if rects:
+                target.append(rects)
+        else:
+            target.extend(rect for rect in rects if rect)
+
+    def add_world(self, rects):
+        """Ghi nhận vùng đã vẽ trên back buffer"""
+        self._add(self.world_current, rects)
+
+    def add_overlay(self, rects):
+        """Ghi nhận vùng đã vẽ thẳng lên màn hình"""
+        self._add(self.overlay_current, rects)
+
+    def present(self, screen):
+        """Đẩy frame lên màn hình: flip khi vẽ toàn bộ, ngược lại chỉ update các vùng bẩn"""
+        screen_rect = screen.get_rect()
+        screen_area = screen_rect.width * screen_rect.height
+        if self.full:
+            pygame.display.flip()
+            self.dirty_area = screen_area
+            self.rect_count = 1
+        else:
+            rects = [rect.clip(screen_rect) for rect in merge_rects(
+                self.world_previous + self.world_current + self.overlay_previous + self.overlay_current)]
+            rects = [rect for rect in rects if rect]
+            if rects:
+                pygame.display.update(rects)
+            self.dirty_area = sum(rect.width * rect.height for rect in rects)
+            self.rect_count = len(rects)
+        self.dirty_ratio = self.dirty_area / screen_area if screen_area else 0.0
+
+        self.world_previous = self.world_current
+        self.overlay_previous = self.overlay_current
@@ -0,0 +1,204 @@
+"""
+Ghi và phát lại input cho Zombie Head Smash Game.
+
+main.main ghi mọi input tới được Game (click, di chuột ở menu, ESC, QUIT, click màn hình
+game over) kèm số bước mô phỏng và seed RNG vào một file nhị phân nhỏ. Phát lại chạy
+headless nhanh hết mức với cùng seed và cùng thứ tự bước, cho ra đúng hits, misses,
+combo và max_combo; kết quả từng ván được lưu ở cuối file để kiểm tra hồi quy.
+
+Ví dụ:
+    python replay.py session.zhsrec                 # phát lại, in thống kê và tốc độ
+    python replay.py --check recordings/*.zhsrec    # exit 1 nếu điểm số khác lúc ghi
+"""
+
+import argparse
+import struct
+import sys
+import time
+import pygame
+import constants as const
+from headless import create_headless_game
+
+RECORDING_MAGIC = b"ZHSREC01"
+RECORDING_VERSION = 2
+# magic, version, RNG seed, simulation step (ms)
+HEADER = struct.Struct("<8sHQd")
+# simulation step index, input kind, x, y, time after the step start (1/100 ms)
+RECORD = struct.Struct("<IBhhH")
+# hits, misses, combo, max_combo
+RESULT = struct.Struct("<4i")
+COUNT = struct.Struct("<I")
+
+# Input kinds
+INPUT_END = 0
+INPUT_MOTION = 1
+INPUT_CLICK = 2
+INPUT_ESCAPE = 3
+INPUT_QUIT = 4
+INPUT_GAME_OVER_CLICK = 5
+
+def input_kind(event):
+    """Loại input đã ghi tương ứng với event, None nếu Game không dùng event đó"""
+    if event.type == pygame.QUIT:
+        return INPUT_QUIT
+    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+        return INPUT_ESCAPE
+    if event.type == pygame.MOUSEMOTION:
+        return INPUT_MOTION
+    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        return INPUT_CLICK
+    return None
+
+def _event(kind, pos):
+    if kind == INPUT_MOTION:
+        return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+def dispatch_input(game, kind, pos=(0, 0), offset=0):
+    """Áp một input lên game theo trạng thái hiện tại; trả về False nếu input đó thoát game.
+
+    offset: thời điểm click sau đầu bước mô phỏng hiện tại, đơn vị 1/100 ms (dùng cho combo).
+    """
+    if kind == INPUT_QUIT:
+        return False
+    if kind == INPUT_ESCAPE:
+        # ESC: back to menu (or quit if already at menu)
+        if game.state == const.GAME_STATE_MENU:
+            return False
+        game.set_state(const.GAME_STATE_MENU)
+    elif game.state == const.GAME_STATE_MENU:
+        return game.handle_menu_events(_event(kind, pos)) != "QUIT"
+    elif game.state == const.GAME_STATE_DIFFICULTY:
+        game.handle_difficulty_events(_event(kind, pos))
+    elif game.state == const.GAME_STATE_PLAYING and not game.game_over and kind == INPUT_CLICK:
+        game.handle_click(pos, game.clock.now() + offset / 100)
+    return True
+
+def _result(game):
+    return (game.hits, game.misses, game.combo, game.max_combo)
+
+class SessionResults:
+    """Thống kê mỗi ván, lấy đúng lúc game over (menu reset thống kê sau đó)"""
+
+    def __init__(self):
+        self.results = []
+        self._was_over = False
+
+    def observe(self, game):
+        over = game.state == const.GAME_STATE_PLAYING and game.game_over
+        if over and not self._was_over:
+            self.results.append(_result(game))
+        self._was_over = over
+
+class InputRecorder:
+    """Ghi input vào bộ nhớ, ghi file một lần khi close()"""
+
+    def __init__(self, path, seed, step_ms=const.SIM_STEP_MS):
+        self.path = path
+        self.seed = seed
+        self.step_ms = step_ms
+        self.records = bytearray()
+        self.sessions = SessionResults()
+
+    def record(self, step, kind, pos=(0, 0), offset=0):
+        self.records += RECORD.pack(step, kind, int(pos[0]), int(pos[1]), offset)
+
+    def observe(self, game):
+        """Gọi mỗi frame sau khi update để lưu kết quả ván vừa kết thúc"""
+        self.sessions.observe(game)
+
+    def close(self, step, game):
+        """Ghi file: header, input, rồi kết quả từng ván và thống kê cuối cùng"""
+        results = self.sessions.results + [_result(game)]
+        with open(self.path, "wb") as f:
+            f.write(HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, self.seed, self.step_ms))
+            f.write(self.records)
+            f.write(RECORD.pack(step, INPUT_END, 0, 0, 0))
+            f.write(COUNT.pack(len(results)))
+            for result in results:
+                f.write(RESULT.pack(*result))
+
+class Recording:
+    """File ghi input đã đọc: seed, bước mô phỏng, danh sách input và kết quả lúc ghi"""
+
+    def __init__(self, seed, step_ms, records, results):
+        self.seed = seed
+        self.step_ms = step_ms
+        self.records = records  # (step, kind, x, y, offset), ending with INPUT_END
+        self.results = results
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, step_ms = HEADER.unpack_from(data, 0)
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError(f"{path} is not a version {RECORDING_VERSION} input recording")
+        records = []
+        offset = HEADER.size
+        while True:
+            record = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            records.append(record)
+            if record[1] == INPUT_END:
+                break
+        count, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        results = [RESULT.unpack_from(data, offset + i * RESULT.size) for i in range(count)]
+        return cls(seed, step_ms, records, results)
+
+    @property
+    def steps(self):
+        return self.records[-1][0]
+
+def replay(recording, game=None, on_step=None):
+    """Phát lại recording nhanh hết mức; trả về (game, kết quả từng ván + thống kê cuối).
+
+    game mặc định là game headless với seed của recording; on_step(game) được gọi sau mỗi
+    bước mô phỏng (ví dụ để render khi dùng làm workload benchmark).
+    """
+    game = game or create_headless_game(recording.seed)
+    sessions = SessionResults()
+    step_ms = recording.step_ms
+    step = 0
+    for record_step, kind, x, y, offset in recording.records:
+        while step < record_step:
+            game.clock.advance(step_ms)
+            game.update(step_ms)
+            step += 1
+            sessions.observe(game)
+            if on_step is not None:
+                on_step(game)
+        if kind == INPUT_END:
+            break
+        if kind == INPUT_GAME_OVER_CLICK:
+            game.handle_game_over_events(_event(INPUT_CLICK, (x, y)))
+        elif not dispatch_input(game, kind, (x, y), offset):
+            break
+    return game, sessions.results + [_result(game)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Zombie Head Smash input")
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any replay scores differently")
+    args = parser.parse_args()
+
+    failures = 0
+    for path in args.recordings:
+        recording = Recording.load(path)
+        start = time.perf_counter()
+        _, results = replay(recording)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        speedup = recording.steps * recording.step_ms / max(elapsed_ms, 1e-6)
+        status = "ok" if results == recording.results else "MISMATCH"
+        failures += status != "ok"
+        hits, misses, _, max_combo = results[-2] if len(results) > 1 else results[-1]
+        print(f"{path}: seed={recording.seed} inputs={len(recording.records) - 1} games={len(results) - 1} "
+              f"hits={hits} misses={misses} max_combo={max_combo} "
+              f"({elapsed_ms:.1f} ms, {speedup:.0f}x real time) {status}")
+        if status != "ok":
+            print(f"  recorded {recording.results}\n  replayed {results}")
+    return 1 if args.check and failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Scene của Zombie Head Smash Game (retained mode).
+
+Mỗi trạng thái game có một scene giữ widget và lớp tĩnh của riêng nó: nền menu cùng plate
+và chữ của các button được ghép sẵn một lần thành một surface, hover chỉ đổi vùng của
+button đó sang bản hover (nền + plate hover + chữ) cũng đã ghép sẵn. SceneManager chỉ vẽ
+và chuyển event cho scene của trạng thái hiện tại, scene không hiện không tốn gì mỗi frame.
+"""
+
+from abc import ABC, abstractmethod
+import pygame
+import constants as const
+from render import BackBuffer
+from replay import input_kind, INPUT_CLICK, INPUT_GAME_OVER_CLICK
+
+class Scene(ABC):
+    """Scene cơ sở: handle_events() nhận event của frame (sau update), draw() vẽ frame"""
+
+    def __init__(self, game):
+        self.game = game
+
+    def needs_full_redraw(self, screen):
+        return False
+
+    def handle_events(self, events, recorder=None, step=0):
+        pass
+
+    @abstractmethod
+    def draw(self, screen, dirty=None, interpolation=0.0):
+        """Vẽ frame; với dirty (DirtyRectTracker) chỉ cần vẽ lại vùng đã đổi"""
+
+class MenuScene(Scene):
+    """Menu chính / chọn độ khó: nền và button ghép sẵn, mỗi frame chỉ vẽ title và button đang hover"""
+
+    def __init__(self, game, title, buttons):
+        super().__init__(game)
+        self.title = title
+        self.buttons = buttons
+        self._layer = None
+        self._hover_tiles = {}  # button -> (background + hover face, screen rect)
+        self._background = None
+
+    def _static_layer(self):
+        """Nền menu + mọi button ở trạng thái thường, dựng lại chỉ khi ảnh nền đổi"""
+        background = self.game.images['menu_background']
+        if self._layer is None or self._background is not background:
+            self._layer = background.copy()
+            self._hover_tiles = {}
+            for button in self.buttons:
+                button.draw(self._layer, hovered=False)
+                # The hover plate replaces the normal one, so its tile starts from the bare background
+                face, face_rect = button.face(True)
+                rect = face_rect.union(button.face(False)[1]).clip(background.get_rect())
+                tile = background.subsurface(rect).copy()
+                tile.blit(face, face_rect.move(-rect.x, -rect.y))
+                self._hover_tiles[button] = (tile, rect)
+            self._background = background
+        return self._layer
+
+    def draw(self, screen, dirty=None, interpolation=0.0):
+        with self.game.profiler.scope("world"):
+            layer = self._static_layer()
+            if dirty is None or dirty.full:
+                screen.blit(layer, (0, 0))
+            else:
+                # Static screen: only restore where the title/hovered button were last frame
+                screen.blits([(layer, rect, rect) for rect in dirty.overlay_previous], doreturn=False)
+
+            rects = [self.game.ui_renderer.draw_menu_title(screen, self.title)]
+            for button in self.buttons:
+                if button.is_hovered:
+                    rects.append(screen.blit(*self._hover_tiles[button]))
+            if dirty is not None:
+                dirty.add_overlay(rects)
+
+class PlayingScene(Scene):
+    """Gameplay: thế giới trong back buffer (có rung màn hình), HUD, trail; màn hình game over khi hết giờ"""
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.back_buffer = None  # Created on first use and reused every frame
+
+    def _back_buffer(self, screen):
+        if self.back_buffer is None:
+            self.back_buffer = BackBuffer(screen)
+        return self.back_buffer
+
+    def needs_full_redraw(self, screen):
+        # Screen shake, the game over overlay and a scaled back buffer cover the whole screen
+        game = self.game
+        return (self._back_buffer(screen).size != screen.get_size()
+                or game.screen_shake.is_active() or game.game_over)
+
+    def handle_events(self, events, recorder=None, step=0):
+        # Game over buttons (recorded separately: they act outside the simulation step)
+        if not self.game.game_over:
+            return
+        for event in events:
+            if recorder is not None and input_kind(event) == INPUT_CLICK:
+                recorder.record(step, INPUT_GAME_OVER_CLICK, event.pos)
+            self.game.handle_game_over_events(event)
+
+    def draw(self, screen, dirty=None, interpolation=0.0):
+        game = self.game
+        self._draw_world(screen, dirty, interpolation)
+        if game.game_over:
+            with game.profiler.scope("hud"):
+                # Dim overlay + stats fading in, then the action buttons once it is fully in
+                game.ui_renderer.draw_game_over_screen(screen, game.get_game_stats(), game.game_over_reveal)
+                if game.game_over_reveal >= 1.0:
+                    for button in game.game_over_buttons:
+                        button.draw(screen)
+
+    def _draw_world(self, screen, dirty, interpolation):
+        game = self.game
+        profiler = game.profiler
+        # Persistent back buffer so we can apply screen shake only to gameplay layer
+        with profiler.scope("world"):
+            back_buffer = self._back_buffer(screen)
+            game_surface = back_buffer.surface
+            partial = dirty is not None and not dirty.full
+
+            # Background (partial mode: only where something was drawn last frame)
+            if partial:
+                back_buffer.restore_rects(game.images['background'], dirty.world_previous)
+            else:
+                game_surface.blit(game.images['background'], (0, 0))
+
+            # Sprites
+            world_rects = []
+            for sprite in game.all_sprites:
+                world_rects.append(game_surface.blit(sprite.image, sprite.rect))
+            if game.horde is not None:
+                world_rects.extend(game.horde.draw(game_surface))
+
+            # Enhanced splat layers for hit zombies
+            with profiler.scope("splats"):
+                world_rects.extend(game.draw_splat_effects(game_surface))
+
+            # Effects layers
+            for sprite in game.special_effects:
+                world_rects.append(game_surface.blit(sprite.image, sprite.rect))
+            world_rects.append(game.particles.draw(game_surface, interpolation))
+            for sprite in game.floating_texts:
+                world_rects.append(game_surface.blit(sprite.image, sprite.rect))
+
+            if partial:
+                # Copy changed world areas, and the areas under last frame's HUD/trail
+                dirty.add_world(world_rects)
+                back_buffer.present_rects(screen, dirty.world_previous + dirty.world_current + dirty.overlay_previous)
+            else:
+                if dirty is not None:
+                    dirty.add_world(world_rects)
+                # Apply screen shake at present time
+                back_buffer.present(screen, game.screen_shake.get_offset())
+
+        # UI (not affected by shake)
+        with profiler.scope("hud"):
+            overlay_rects = game.ui_renderer.draw_enhanced_ui(screen, game.get_game_stats())
+
+        # Mouse trail
+        with profiler.scope("trail"):
+            mouse_pos = pygame.mouse.get_pos()
+            game.mouse_trail.update(mouse_pos)
+            overlay_rects.extend(game.mouse_trail.draw(screen, combo=game.combo))
+        if dirty is not None:
+            dirty.add_overlay(overlay_rects)
+
+class SceneManager:
+    """Scene theo trạng thái game; chỉ scene đang hiện được vẽ và nhận event"""
+
+    def __init__(self, game):
+        self.game = game
+        self.scenes = {
+            const.GAME_STATE_MENU: MenuScene(game, "Zombie Head Smash", game.menu_buttons),
+            const.GAME_STATE_DIFFICULTY: MenuScene(game, "Choose Difficulty", game.difficulty_buttons),
+            const.GAME_STATE_PLAYING: PlayingScene(game)
+        }
+
+    @property
+    def active(self):
+        return self.scenes[self.game.state]
+
+    def needs_full_redraw(self, screen):
+        return self.active.needs_full_redraw(screen)
+
+    def handle_events(self, events, recorder=None, step=0):
+        self.active.handle_events(events, recorder, step)
+
+    def draw(self, screen, dirty=None, interpolation=0.0):
+        self.active.draw(screen, dirty, interpolation)
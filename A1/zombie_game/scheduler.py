@@ -0,0 +1,139 @@
+"""
+Bộ hẹn giờ cho Zombie Head Smash Game: hành động trễ và tween (fade, chuyển cảnh) chạy
+theo đồng hồ game, tiến trong Game.update nên vòng lặp chính không bao giờ phải chờ;
+ExpiryIndex giữ hạn chót của đối tượng trong thế giới game (zombie, cửa sổ combo).
+"""
+
+import heapq
+import itertools
+
+class _Timer:
+    __slots__ = ('deadline', 'action', 'tag', 'cancelled')
+
+    def __init__(self, deadline, action, tag):
+        self.deadline = deadline
+        self.action = action
+        self.tag = tag
+        self.cancelled = False
+
+class _Tween:
+    __slots__ = ('start', 'duration', 'on_update', 'on_done', 'tag', 'cancelled')
+
+    def __init__(self, start, duration, on_update, on_done, tag):
+        self.start = start
+        self.duration = duration
+        self.on_update = on_update
+        self.on_done = on_done
+        self.tag = tag
+        self.cancelled = False
+
+class Scheduler:
+    """Hành động hẹn giờ (after) và tween 0 → 1 (tween) theo clock.now(); gọi update() mỗi bước.
+
+    tag dùng để hủy (cancel) hoặc kiểm tra (pending) một nhóm hành động, ví dụ 'music'.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self._timers = []  # Heap of (deadline, sequence, timer); cancelled timers are skipped when popped
+        self._tweens = []
+        self._sequence = itertools.count()
+
+    def after(self, delay, action, tag=None):
+        """Gọi action() sau delay ms (delay 0: ở lần update kế tiếp)"""
+        timer = _Timer(self.clock.now() + delay, action, tag)
+        heapq.heappush(self._timers, (timer.deadline, next(self._sequence), timer))
+        return timer
+
+    def tween(self, duration, on_update, on_done=None, tag=None, delay=0):
+        """Gọi on_update(progress) mỗi update với progress 0 → 1 trong duration ms, rồi on_done()"""
+        tween = _Tween(self.clock.now() + delay, duration, on_update, on_done, tag)
+        self._tweens.append(tween)
+        return tween
+
+    def cancel(self, tag):
+        """Hủy mọi hành động và tween có tag (tween dừng ở giá trị hiện tại, không gọi on_done)"""
+        for _, _, timer in self._timers:
+            if timer.tag == tag:
+                timer.cancelled = True
+        for tween in self._tweens:
+            if tween.tag == tag:
+                tween.cancelled = True
+        self._tweens = [tween for tween in self._tweens if not tween.cancelled]
+
+    def pending(self, tag):
+        """Còn hành động hoặc tween nào có tag chưa xong không"""
+        return (any(timer.tag == tag and not timer.cancelled for _, _, timer in self._timers)
+                or any(tween.tag == tag for tween in self._tweens))
+
+    def clear(self):
+        self._timers.clear()
+        self._tweens.clear()
+
+    def update(self):
+        """Chạy các hành động đến hạn và tiến các tween"""
+        now = self.clock.now()
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            timer = heapq.heappop(timers)[2]
+            if not timer.cancelled:
+                timer.action()
+
+        if not self._tweens:
+            return
+        finished = []
+        for tween in list(self._tweens):
+            if tween.cancelled or now < tween.start:
+                continue
+            progress = min(1.0, (now - tween.start) / tween.duration) if tween.duration > 0 else 1.0
+            tween.on_update(progress)
+            if progress >= 1.0:
+                finished.append(tween)
+        if finished:
+            self._tweens = [tween for tween in self._tweens if tween not in finished]
+            for tween in finished:
+                if tween.on_done is not None and not tween.cancelled:
+                    tween.on_done()
+
+class ExpiryIndex:
+    """Min-heap hạn chót (deadline) → hành động; mỗi bước chỉ lấy ra những mục đã đến hạn.
+
+    add() trả về entry để discard() khi hạn thay đổi (ví dụ zombie bị đập); entry đã hủy
+    bị bỏ qua khi lên đỉnh heap, nên không cần tìm nó trong heap.
+    """
+
+    def __init__(self):
+        self._heap = []  # [deadline, sequence, action]; action None once discarded
+        self._sequence = itertools.count()
+
+    def add(self, deadline, action):
+        entry = [deadline, next(self._sequence), action]
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def discard(self, entry):
+        if entry is not None:
+            entry[2] = None
+
+    def pop_due(self, now):
+        """Lấy ra hành động của mọi mục có deadline <= now (theo thứ tự hạn); gọi chúng sau khi lấy
+        nên hành động có thể add() lại chính nó"""
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            action = heapq.heappop(heap)[2]
+            if action is not None:
+                due.append(action)
+        return due
+
+    def next_deadline(self):
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else float('inf')
+
+    def clear(self):
+        self._heap.clear()
+
+    def __len__(self):
+        return sum(entry[2] is not None for entry in self._heap)
@@ -0,0 +1,119 @@
+"""
+Chỉ mục không gian (uniform grid) cho Zombie Head Smash Game
+"""
+
+import itertools
+import pygame
+import constants as const
+
+class SpatialGrid:
+    """Lưới đều: mỗi ô giữ các đối tượng có vùng bao (footprint) chạm vào ô đó"""
+
+    def __init__(self, cell_size=const.SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._keys = {}  # object -> cells it is bucketed in
+        self._bounds = {}  # object -> footprint rect
+        self._order = {}  # object -> insertion sequence, so queries keep insertion order
+        self._sequence = itertools.count()
+
+    def _cell_keys(self, rect):
+        size = self.cell_size
+        return tuple((cx, cy)
+                     for cx in range(rect.left // size, (rect.right - 1) // size + 1)
+                     for cy in range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def insert(self, obj, rect):
+        """Thêm đối tượng với vùng bao rect"""
+        if obj in self._keys:
+            self.move(obj, rect)
+            return
+        rect = pygame.Rect(rect)
+        keys = self._cell_keys(rect)
+        for key in keys:
+            self.cells.setdefault(key, []).append(obj)
+        self._keys[obj] = keys
+        self._bounds[obj] = rect
+        self._order[obj] = next(self._sequence)
+
+    def remove(self, obj):
+        """Bỏ đối tượng khỏi lưới (bỏ qua nếu không có)"""
+        keys = self._keys.pop(obj, None)
+        if keys is None:
+            return
+        for key in keys:
+            bucket = self.cells[key]
+            bucket.remove(obj)
+            if not bucket:
+                del self.cells[key]
+        del self._bounds[obj]
+        del self._order[obj]
+
+    def move(self, obj, rect):
+        """Cập nhật vùng bao; chỉ đổi bucket khi tập ô thay đổi"""
+        rect = pygame.Rect(rect)
+        keys = self._cell_keys(rect)
+        old_keys = self._keys[obj]
+        if keys != old_keys:
+            for key in old_keys:
+                bucket = self.cells[key]
+                bucket.remove(obj)
+                if not bucket:
+                    del self.cells[key]
+            for key in keys:
+                self.cells.setdefault(key, []).append(obj)
+            self._keys[obj] = keys
+        self._bounds[obj] = rect
+
+    def query_point(self, point):
+        """Các đối tượng có vùng bao chứa điểm, theo thứ tự thêm vào"""
+        size = self.cell_size
+        bucket = self.cells.get((int(point[0]) // size, int(point[1]) // size))
+        if not bucket:
+            return []
+        bounds = self._bounds
+        hits = [obj for obj in bucket if bounds[obj].collidepoint(point)]
+        if len(hits) > 1:
+            hits.sort(key=self._order.__getitem__)
+        return hits
+
+    def clear(self):
+        self.cells.clear()
+        self._keys.clear()
+        self._bounds.clear()
+        self._order.clear()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, obj):
+        return obj in self._keys
+
+class IndexedGroup(pygame.sprite.Group):
+    """Sprite group tự cập nhật SpatialGrid khi thêm/xóa sprite (kể cả qua sprite.kill()).
+
+    Sprite cần có footprint(): vùng bao mọi vị trí rect có thể chiếm (pop-up, wiggle),
+    nên rect thay đổi trong animation không cần cập nhật lưới; chỉ gọi relocate() khi
+    vị trí gốc thay đổi.
+    """
+
+    def __init__(self, *sprites, cell_size=const.SPATIAL_CELL_SIZE):
+        self.grid = SpatialGrid(cell_size)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.grid.insert(sprite, sprite.footprint())
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grid.remove(sprite)
+
+    def relocate(self, sprite):
+        """Cập nhật lưới sau khi sprite đổi vị trí gốc"""
+        if sprite in self.grid:
+            self.grid.move(sprite, sprite.footprint())
+
+    def sprites_at(self, point):
+        """Sprite có rect hiện tại chứa điểm, theo thứ tự thêm vào group"""
+        return [sprite for sprite in self.grid.query_point(point) if sprite.rect.collidepoint(point)]
@@ -0,0 +1,10 @@
+"""
+Cấu hình pytest: chạy không cần màn hình / âm thanh, import module game như khi chạy main.py
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
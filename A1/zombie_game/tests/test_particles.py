@@ -0,0 +1,43 @@
+"""
+Kiểm thử ParticleSystem: bỏ hạt hết hạn bằng cách dồn mảng, mở rộng giữ nguyên hạt đang sống
+"""
+
+import numpy as np
+import pygame
+from effects import ParticleSystem
+
+STILL = (0, 0)  # Velocity range with no horizontal motion, so x identifies the batch
+
+def test_update_compacts_live_particles_in_order():
+    system = ParticleSystem()
+    system.emit(10, 100, 5, STILL, STILL, (50, 50))
+    system.emit(20, 100, 3, STILL, STILL, (200, 200))
+    system.emit(30, 100, 4, STILL, STILL, (50, 50))
+    system.emit(40, 100, 2, STILL, STILL, (300, 300))
+    assert len(system) == 14
+
+    for _ in range(4):
+        system.update(16)
+
+    assert len(system) == 5
+    assert system.position[:5, 0].tolist() == [20, 20, 20, 40, 40]
+    assert np.all(system.age[:5] == 64)
+    assert system.lifetime[:5].tolist() == [200, 200, 200, 300, 300]
+
+def test_all_particles_expire():
+    system = ParticleSystem()
+    system.emit(10, 10, 8, (-2, 2), (-5, 0), (30, 60))
+    for _ in range(5):
+        system.update(16)
+    assert len(system) == 0
+    assert system.draw(pygame.Surface((100, 100))) is None
+
+def test_growing_keeps_live_particles():
+    system = ParticleSystem(capacity=4)
+    system.emit(10, 100, 3, STILL, STILL, (500, 500))
+    system.update(16)
+    system.emit(20, 100, 6, STILL, STILL, (500, 500))
+    assert system.capacity >= 9
+    assert len(system) == 9
+    assert system.position[:9, 0].tolist() == [10] * 3 + [20] * 6
+    assert system.age[:9].tolist() == [16] * 3 + [0] * 6
@@ -0,0 +1,67 @@
+"""
+Kiểm thử ghi / phát lại input: file ghi từ một ván headless phát lại ra đúng điểm số
+"""
+
+import random
+import constants as const
+from headless import create_headless_game
+from replay import (InputRecorder, Recording, replay, dispatch_input,
+                    INPUT_CLICK, INPUT_MOTION, INPUT_END)
+
+# A HARD game lasts game_duration; anything far beyond that means the menus were not passed
+MAX_STEPS = 2 * const.DIFFICULTY_SETTINGS['HARD']['game_duration'] // const.SIM_STEP_MS
+
+def button(buttons, text):
+    return next(button for button in buttons if button.text == text)
+
+def record_session(path, seed, difficulty="Hard"):
+    """Chơi một ván HARD headless, ghi mọi input như main.py; trả về game lúc ghi xong"""
+    game = create_headless_game(seed)
+    recorder = InputRecorder(path, seed)
+    rng = random.Random(seed)
+    step = 0
+
+    def send(kind, pos, offset=0):
+        recorder.record(step, kind, pos, offset)
+        dispatch_input(game, kind, pos, offset)
+
+    def press(target):
+        # Menu buttons only take clicks while hovered
+        send(INPUT_MOTION, target.rect.center)
+        send(INPUT_CLICK, target.rect.center)
+
+    while not game.game_over:
+        assert step < MAX_STEPS
+        if game.state == const.GAME_STATE_MENU:
+            press(button(game.menu_buttons, "Play Game"))
+        elif game.state == const.GAME_STATE_DIFFICULTY:
+            press(button(game.difficulty_buttons, difficulty))
+        elif step % 5 == 0:
+            live = [zombie for zombie in game.zombies if not zombie.hit]
+            if live and rng.random() < 0.8:
+                pos = live[0].home
+            else:
+                pos = (rng.randint(0, const.WIDTH), rng.randint(0, const.HEIGHT))
+            send(INPUT_CLICK, pos, rng.randint(0, int(const.SIM_STEP_MS * 100)))
+        game.clock.advance(const.SIM_STEP_MS)
+        game.update(const.SIM_STEP_MS)
+        step += 1
+        recorder.observe(game)
+    recorder.close(step, game)
+    return game
+
+def test_recording_round_trip(tmp_path):
+    path = str(tmp_path / "session.zhsrec")
+    game = record_session(path, seed=11)
+    recording = Recording.load(path)
+
+    assert recording.seed == 11
+    assert recording.step_ms == const.SIM_STEP_MS
+    assert recording.records[-1][1] == INPUT_END
+    final = (game.hits, game.misses, game.combo, game.max_combo)
+    assert recording.results == [final, final]  # Game over snapshot, then the final stats
+    assert game.hits > 0 and game.misses > 0
+
+    replayed, results = replay(recording)
+    assert results == recording.results
+    assert replayed.clock.now() == game.clock.now()
@@ -0,0 +1,52 @@
+"""
+Kiểm thử ExpiryIndex: lấy ra theo thứ tự hạn, mục đã discard bị bỏ qua khi lên đỉnh heap
+"""
+
+import random
+from scheduler import ExpiryIndex
+
+def test_pop_due_in_deadline_order():
+    index = ExpiryIndex()
+    fired = []
+    for deadline, name in ((300, "c"), (100, "a"), (200, "b"), (100, "a2"), (400, "d")):
+        index.add(deadline, lambda name=name: fired.append(name))
+
+    for action in index.pop_due(250):
+        action()
+    assert fired == ["a", "a2", "b"]  # Equal deadlines keep insertion order
+    assert len(index) == 2
+    assert index.next_deadline() == 300
+
+def test_discarded_entries_are_skipped():
+    index = ExpiryIndex()
+    rng = random.Random(5)
+    entries = {name: index.add(rng.randint(0, 1000), name) for name in range(200)}
+    discarded = set(rng.sample(sorted(entries), 80))
+    for name in discarded:
+        index.discard(entries[name])
+    index.discard(None)  # No entry yet: ignored
+
+    assert len(index) == 120
+    live = sorted((entries[name][0], entries[name][1], name) for name in entries if name not in discarded)
+    assert index.next_deadline() == live[0][0]
+    due = index.pop_due(500)
+    assert due == [name for deadline, _, name in live if deadline <= 500]
+    assert index.pop_due(1000) == [name for deadline, _, name in live if deadline > 500]
+    assert len(index) == 0
+    assert index.next_deadline() == float('inf')
+
+def test_action_can_reschedule_itself():
+    index = ExpiryIndex()
+    fired = []
+
+    def tick():
+        fired.append(len(fired))
+        if len(fired) < 3:
+            index.add(100 * (len(fired) + 1), tick)
+
+    index.add(100, tick)
+    for now in (100, 200, 300, 400):
+        for action in index.pop_due(now):
+            action()
+    assert fired == [0, 1, 2]
+    assert len(index) == 0
@@ -0,0 +1,67 @@
+"""
+Kiểm thử SpatialGrid / IndexedGroup: kết quả trùng với quét tuyến tính, theo thứ tự thêm vào
+"""
+
+import random
+import pygame
+import constants as const
+from spatial import SpatialGrid, IndexedGroup
+from timing import ManualClock
+from zombie import Zombie
+
+def random_rect(rng):
+    return pygame.Rect(rng.randint(-50, const.WIDTH), rng.randint(-50, const.HEIGHT),
+                       rng.randint(1, 150), rng.randint(1, 150))
+
+def random_point(rng):
+    return rng.randint(-20, const.WIDTH + 20), rng.randint(-20, const.HEIGHT + 20)
+
+def test_grid_matches_linear_scan():
+    rng = random.Random(7)
+    grid = SpatialGrid()
+    bounds = {}  # Insertion-ordered, like the grid's query results
+    for name in range(300):
+        bounds[name] = random_rect(rng)
+        grid.insert(name, bounds[name])
+    for name in rng.sample(sorted(bounds), 100):
+        bounds[name] = random_rect(rng)
+        grid.move(name, bounds[name])
+    for name in rng.sample(sorted(bounds), 80):
+        del bounds[name]
+        grid.remove(name)
+
+    assert len(grid) == len(bounds)
+    for _ in range(2000):
+        point = random_point(rng)
+        assert grid.query_point(point) == [name for name, rect in bounds.items() if rect.collidepoint(point)]
+
+def make_zombie(clock, rng, position):
+    zombie = Zombie(pygame.Surface(const.ZOMBIE_IMAGE_SIZE, pygame.SRCALPHA), clock=clock, rng=rng)
+    zombie.set_position(*position)
+    return zombie
+
+def test_indexed_group_tracks_kill_and_empty():
+    clock = ManualClock()
+    rng = random.Random(3)
+    group = IndexedGroup()
+    zombies = [make_zombie(clock, rng, rng.choice(const.ZOMBIE_SPAWN_POINTS)) for _ in range(30)]
+    group.add(*zombies)
+    clock.advance(const.ZOMBIE_POP_ANIMATION_DURATION)
+    group.update()
+
+    for zombie in zombies[::3]:
+        zombie.kill()
+    zombies[1].set_position(*const.ZOMBIE_SPAWN_POINTS[0])
+    assert len(group.grid) == len(group)
+    found = 0
+    for position in const.ZOMBIE_SPAWN_POINTS:
+        for dx, dy in ((0, 0), (20, -15), (-35, 30)):
+            point = (position[0] + dx, position[1] + dy)
+            hits = group.sprites_at(point)
+            assert hits == [zombie for zombie in group.sprites() if zombie.rect.collidepoint(point)]
+            found += len(hits)
+    assert found
+
+    group.empty()
+    assert len(group.grid) == 0
+    assert group.sprites_at(const.ZOMBIE_SPAWN_POINTS[0]) == []
@@ -0,0 +1,35 @@
+"""
+Kiểm thử SpawnPlanner: cùng seed cho cùng lịch spawn, ván headless có seed chạy lại y hệt
+"""
+
+from itertools import islice
+import constants as const
+from headless import run_session
+from spawn import SpawnPlanner, SpawnEvent
+
+def test_same_seed_same_schedule():
+    first = list(islice(SpawnPlanner.for_difficulty("HARD", seed=42), 500))
+    second = list(islice(SpawnPlanner.for_difficulty("HARD", seed=42), 500))
+    other = list(islice(SpawnPlanner.for_difficulty("HARD", seed=43), 500))
+    assert first == second
+    assert first != other
+
+def test_intervals_and_positions_follow_difficulty():
+    settings = const.DIFFICULTY_SETTINGS["MEDIUM"]
+    previous = 0
+    for event in islice(SpawnPlanner.for_difficulty("MEDIUM", seed=1), 1000):
+        assert settings['spawn_interval_min'] <= event.time - previous <= settings['spawn_interval_max']
+        assert event.position in const.ZOMBIE_SPAWN_POINTS
+        previous = event.time
+
+def test_free_position_skips_occupied_points():
+    points = const.ZOMBIE_SPAWN_POINTS
+    planner = SpawnPlanner(100, 200, seed=0)
+    event = SpawnEvent(0, points[-1])
+    assert planner.free_position(event, lambda position: False) == points[-1]
+    assert planner.free_position(event, lambda position: position in (points[-1], points[0])) == points[1]
+    assert planner.free_position(event, lambda position: True) is None
+
+def test_seeded_sessions_replay_identically():
+    for difficulty in ("EASY", "HARD"):
+        assert run_session(difficulty, seed=3) == run_session(difficulty, seed=3)
@@ -0,0 +1,33 @@
+"""
+Đồng hồ có thể thay thế (inject) cho Zombie Head Smash Game
+"""
+
+import math
+import pygame
+
+class SystemClock:
+    """Đồng hồ thực, đọc pygame.time.get_ticks()"""
+
+    def now(self):
+        return pygame.time.get_ticks()
+
+class ManualClock:
+    """Đồng hồ mô phỏng, chỉ tiến khi được gọi advance() (dùng cho fixed-timestep và headless)"""
+
+    def __init__(self, start=0):
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, ms):
+        """Tiến đồng hồ thêm ms mili-giây"""
+        self.time += ms
+        return self.time
+
+def percentile(samples, fraction):
+    """Percentile theo nearest-rank (dùng chung cho benchmark và đo độ trễ input)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
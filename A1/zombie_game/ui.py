@@ -4,7 +4,24 @@ UI Components cho Zombie Head Smash Game
 
 import pygame
 import math
+import time
+from collections import deque
 import constants as const
+from timing import SystemClock
+from render import merge_rects
+
+# Button images scaled per size, shared by every button (key: id of the source image, size)
+_button_images = {}
+
+def _button_image(image, size):
+    """Ảnh button ở kích thước cho trước, scale một lần rồi dùng chung"""
+    if image is None or image.get_size() == tuple(size):
+        return image
+    key = (id(image), tuple(size))
+    entry = _button_images.get(key)
+    if entry is None or entry[0] is not image:
+        entry = _button_images[key] = (image, pygame.transform.scale(image, size))
+    return entry[1]
 
 class Button:
     def __init__(self, x, y, width, height, text, font, action=None, normal_image=None, hover_image=None):
@@ -12,23 +29,39 @@ class Button:
         self.text = text
         self.font = font
         self.action = action
-        self.normal_image = pygame.transform.scale(normal_image, (width, height)) if normal_image else None
-        self.hover_image = pygame.transform.scale(hover_image, (width, height)) if hover_image else None
+        self.normal_image = _button_image(normal_image, (width, height))
+        self.hover_image = _button_image(hover_image, (width, height))
         self.is_hovered = False
+        # Plate + label composited once per hover state: (bitmap, screen rect)
+        self._faces = {}
 
-    def draw(self, surface):
-        """Vẽ button lên surface"""
-        current_image = self.hover_image if self.is_hovered and self.hover_image else self.normal_image
+    def _compose_face(self, hovered):
+        """Ghép plate và chữ của button thành một bitmap (vùng bao cả chữ nếu chữ rộng hơn plate)"""
+        current_image = self.hover_image if hovered and self.hover_image else self.normal_image
+        text_surface = self.font.render(self.text, True, const.WHITE if current_image else const.BLACK)
+        text_rect = text_surface.get_rect(center=self.rect.center)
+        bounds = self.rect.union(text_rect)
+        face = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        plate = self.rect.move(-bounds.x, -bounds.y)
         if current_image:
-            surface.blit(current_image, self.rect)
+            face.blit(current_image, plate)
         else:  # Fallback to colored rect if no image
-            color = const.DARK_GRAY if self.is_hovered else const.LIGHT_GRAY
-            pygame.draw.rect(surface, color, self.rect)
-            pygame.draw.rect(surface, const.BLACK, self.rect, 2)  # Border
+            color = const.DARK_GRAY if hovered else const.LIGHT_GRAY
+            pygame.draw.rect(face, color, plate)
+            pygame.draw.rect(face, const.BLACK, plate, 2)  # Border
+        face.blit(text_surface, text_rect.move(-bounds.x, -bounds.y))
+        return face, bounds
 
-        text_surface = self.font.render(self.text, True, const.WHITE if current_image else const.BLACK)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+    def face(self, hovered):
+        """(bitmap, vùng trên màn hình) của button ở trạng thái hover cho trước"""
+        face = self._faces.get(hovered)
+        if face is None:
+            face = self._faces[hovered] = self._compose_face(hovered)
+        return face
+
+    def draw(self, surface, hovered=None):
+        """Vẽ button (mặc định theo trạng thái hover hiện tại) lên surface, trả về vùng đã vẽ"""
+        return surface.blit(*self.face(self.is_hovered if hovered is None else hovered))
 
     def handle_event(self, event, click_sound=None):
         """Xử lý sự kiện cho button"""
@@ -43,11 +76,91 @@ class Button:
         return None
 
 class UIRenderer:
-    def __init__(self, fonts):
+    def __init__(self, fonts, clock=None):
         self.fonts = fonts
-    
+        self.clock = clock or SystemClock()
+        # Retained HUD: element name -> (text, color, bitmap)
+        self._text_cache = {}
+        # Scaled variants of the current pulse/blink bitmaps, keyed by scale step
+        self._scale_cache = {}
+        self._combo_halos = {}
+        self._combo_halo_value = None
+        self._fade_surface = None
+        # Menu title + glow per (title, scale step); game-over overlay for the last stats shown
+        self._titles = {}
+        self._game_over_layer = (None, None)
+        # Per-frame counters so steady state can be checked for zero re-rasterization
+        self.renders = 0
+        self.transforms = 0
+        self.last_frame_renders = 0
+        self.last_frame_transforms = 0
+        self.total_renders = 0
+
+    def _render(self, font, text, color):
+        """Gọi font.render và đếm số lần rasterize chữ"""
+        self.renders += 1
+        self.total_renders += 1
+        return font.render(text, True, color)
+
+    def _cached_text(self, element, font, text, color):
+        """Bitmap của một phần tử HUD, chỉ render lại khi giá trị thay đổi"""
+        entry = self._text_cache.get(element)
+        if entry is None or entry[0] != text or entry[1] != color:
+            entry = (text, color, self._render(font, text, color))
+            self._text_cache[element] = entry
+            self._scale_cache.pop(element, None)
+        return entry[2]
+
+    def _cached_glow(self, element, bitmap, alphas):
+        """Các bản sao có alpha cố định của một bitmap, dựng lại khi bitmap đổi"""
+        entry = self._text_cache.get(element)
+        if entry is None or entry[0] is not bitmap:
+            copies = []
+            for alpha in alphas:
+                copy = bitmap.copy()
+                copy.set_alpha(alpha)
+                copies.append(copy)
+            entry = (bitmap, None, copies)
+            self._text_cache[element] = entry
+        return entry[2]
+
+    def _scaled(self, element, bitmap, scale):
+        """Bitmap đã scale theo bước lượng tử hóa, cache theo phần tử"""
+        step = round(scale / const.HUD_SCALE_STEP)
+        if step == round(1.0 / const.HUD_SCALE_STEP):
+            return bitmap
+        variants = self._scale_cache.setdefault(element, {})
+        scaled = variants.get(step)
+        if scaled is None or scaled[0] is not bitmap:
+            factor = step * const.HUD_SCALE_STEP
+            size = (int(bitmap.get_width() * factor), int(bitmap.get_height() * factor))
+            self.transforms += 1
+            scaled = variants[step] = (bitmap, pygame.transform.scale(bitmap, size))
+        return scaled[1]
+
+    def _combo_halo(self, combo, color_index, combo_text):
+        """Lớp glow nhiều tầng của combo, ghép sẵn một lần cho mỗi màu"""
+        if self._combo_halo_value != combo:
+            self._combo_halos = {}
+            self._combo_halo_value = combo
+        halo = self._combo_halos.get(color_index)
+        if halo is None:
+            width, height = combo_text.get_size()
+            grow = 1.0 + (const.HUD_COMBO_GLOW_LAYERS - 1) * 0.05
+            halo = pygame.Surface((int(width * grow) + 1, int(height * grow) + 1), pygame.SRCALPHA)
+            center = halo.get_rect().center
+            for i in range(const.HUD_COMBO_GLOW_LAYERS):
+                layer_scale = 1.0 + i * 0.05
+                layer = pygame.transform.scale(combo_text, (int(width * layer_scale), int(height * layer_scale)))
+                # Bake the layer alpha into its pixels, then keep the strongest glow per pixel
+                layer.fill((255, 255, 255, max(0, 100 - i * 20)), special_flags=pygame.BLEND_RGBA_MULT)
+                halo.blit(layer, layer.get_rect(center=center), special_flags=pygame.BLEND_RGBA_MAX)
+                self.transforms += 1
+            self._combo_halos[color_index] = halo
+        return halo
+
     def draw_enhanced_ui(self, screen, game_stats):
-        """Vẽ UI với hiệu ứng nâng cao"""
+        """Vẽ UI với hiệu ứng nâng cao, trả về danh sách vùng đã vẽ"""
         hits = game_stats.get('hits', 0)
         misses = game_stats.get('misses', 0)
         combo = game_stats.get('combo', 0)
@@ -55,121 +168,143 @@ class UIRenderer:
         difficulty_level = game_stats.get('difficulty_level', 'EASY')
         timer_start_time = game_stats.get('timer_start_time', 0)
         game_duration = game_stats.get('game_duration', 60000)
+        current_time = self.clock.now()
+        self.renders = 0
+        self.transforms = 0
+        rects = []
         
         # Display scores with dynamic colors and effects
         hit_color = const.GREEN if combo == 0 else const.SCORE_COLORS[min(combo - 1, len(const.SCORE_COLORS) - 1)]
+        hits_text = self._cached_text('hits', self.fonts['medium'], f"Hits: {hits}", hit_color)
         
         # Add glow effect to hit text when combo is active
         if combo > 1:
-            for i in range(3):
-                glow_hits = self.fonts['medium'].render(f"Hits: {hits}", True, hit_color)
-                glow_hits.set_alpha(50 - i * 15)
-                screen.blit(glow_hits, (10 - i, 10 - i))
+            for i, glow_hits in enumerate(self._cached_glow('hits_glow', hits_text, (50, 35, 20))):
+                rects.append(screen.blit(glow_hits, (10 - i, 10 - i)))
         
-        hits_text = self.fonts['medium'].render(f"Hits: {hits}", True, hit_color)
-        misses_text = self.fonts['medium'].render(f"Misses: {misses}", True, const.RED)
-        score_text = self.fonts['medium'].render(f"Score: {hits - misses}", True, const.WHITE)
-        mode_text = self.fonts['small'].render(f"Mode: {difficulty_level}", True, const.WHITE)
+        misses_text = self._cached_text('misses', self.fonts['medium'], f"Misses: {misses}", const.RED)
+        score_text = self._cached_text('score', self.fonts['medium'], f"Score: {hits - misses}", const.WHITE)
+        mode_text = self._cached_text('mode', self.fonts['small'], f"Mode: {difficulty_level}", const.WHITE)
 
-        screen.blit(hits_text, (10, 10))
-        screen.blit(misses_text, (10, 50))
-        screen.blit(score_text, (10, 90))
-        screen.blit(mode_text, (10, 130))
+        rects.append(screen.blit(hits_text, (10, 10)))
+        rects.append(screen.blit(misses_text, (10, 50)))
+        rects.append(screen.blit(score_text, (10, 90)))
+        rects.append(screen.blit(mode_text, (10, 130)))
 
         # Enhanced combo display with rainbow effect
         if combo > 1:
-            combo_color_index = (pygame.time.get_ticks() * 0.01) % len(const.RAINBOW_COLORS)
-            combo_color = const.RAINBOW_COLORS[int(combo_color_index)]
-            combo_text = self.fonts['medium'].render(f"COMBO x{combo}!", True, combo_color)
-            
-            # Add pulsing glow effect for combo
-            pulse_scale = 1.0 + 0.3 * math.sin(pygame.time.get_ticks() * 0.01)
-            scaled_combo = pygame.transform.scale(combo_text, 
-                                                (int(combo_text.get_width() * pulse_scale),
-                                                 int(combo_text.get_height() * pulse_scale)))
+            color_index = int((current_time * 0.01) % len(const.RAINBOW_COLORS))
+            combo_text = self._cached_text(('combo', color_index), self.fonts['medium'],
+                                           f"COMBO x{combo}!", const.RAINBOW_COLORS[color_index])
             
-            # Multi-layer glow
-            for i in range(5):
-                glow_alpha = max(0, 100 - i * 20)
-                glow_combo = pygame.transform.scale(combo_text,
-                                                  (int(combo_text.get_width() * (pulse_scale + i * 0.05)),
-                                                   int(combo_text.get_height() * (pulse_scale + i * 0.05))))
-                glow_combo.set_alpha(glow_alpha)
-                glow_rect = glow_combo.get_rect(center=(120, 180))
-                screen.blit(glow_combo, glow_rect)
+            # Pulsing glow: scale the pre-composited halo and text bitmaps
+            pulse_scale = 1.0 + 0.3 * math.sin(current_time * 0.01)
+            halo = self._scaled(('combo_halo', color_index),
+                                self._combo_halo(combo, color_index, combo_text), pulse_scale)
+            rects.append(screen.blit(halo, halo.get_rect(center=(120, 180))))
             
-            combo_rect = scaled_combo.get_rect(center=(120, 180))
-            screen.blit(scaled_combo, combo_rect)
+            scaled_combo = self._scaled(('combo', color_index), combo_text, pulse_scale)
+            rects.append(screen.blit(scaled_combo, scaled_combo.get_rect(center=(120, 180))))
 
         # Display max combo with gold effect
         if max_combo > 1:
-            max_combo_text = self.fonts['small'].render(f"Max Combo: {max_combo}", True, const.GOLD)
-            screen.blit(max_combo_text, (10, 210))
+            max_combo_text = self._cached_text('max_combo', self.fonts['small'], f"Max Combo: {max_combo}", const.GOLD)
+            rects.append(screen.blit(max_combo_text, (10, 210)))
 
         # Enhanced timer with warning effects
-        time_left_ms = game_duration - (pygame.time.get_ticks() - timer_start_time)
-        time_left_s = max(0, time_left_ms // 1000)
+        time_left_ms = game_duration - (current_time - timer_start_time)
+        time_left_s = max(0, int(time_left_ms // 1000))
         
         timer_color = const.WHITE
         timer_scale = 1.0
         
         if time_left_s <= 10:
             # Critical time: blinking red with scaling effect
-            blink_factor = (pygame.time.get_ticks() // 250) % 2
+            blink_factor = (current_time // 250) % 2
             timer_color = const.RED if blink_factor else const.ORANGE
-            timer_scale = 1.0 + 0.2 * math.sin(pygame.time.get_ticks() * 0.02)
+            timer_scale = 1.0 + 0.2 * math.sin(current_time * 0.02)
         elif time_left_s <= 30:
             timer_color = const.ORANGE
-            timer_scale = 1.0 + 0.1 * math.sin(pygame.time.get_ticks() * 0.01)
-        
-        timer_text = self.fonts['medium'].render(f"Time: {time_left_s}", True, timer_color)
+            timer_scale = 1.0 + 0.1 * math.sin(current_time * 0.01)
         
-        if abs(timer_scale - 1.0) > 0.01:  # Avoid floating point equality check
-            scaled_timer = pygame.transform.scale(timer_text,
-                                                (int(timer_text.get_width() * timer_scale),
-                                                 int(timer_text.get_height() * timer_scale)))
-            timer_rect = scaled_timer.get_rect(topright=(const.WIDTH - 10, 10))
-            screen.blit(scaled_timer, timer_rect)
-        else:
-            timer_rect = timer_text.get_rect(topright=(const.WIDTH - 10, 10))
-            screen.blit(timer_text, timer_rect)
+        # Blink swaps between two cached bitmaps of the same value
+        timer_text = self._cached_text(('timer', timer_color), self.fonts['medium'], f"Time: {time_left_s}", timer_color)
+        scaled_timer = self._scaled(('timer', timer_color), timer_text, timer_scale)
+        timer_rect = scaled_timer.get_rect(topright=(const.WIDTH - 10, 10))
+        rects.append(screen.blit(scaled_timer, timer_rect))
+
+        self.last_frame_renders = self.renders
+        self.last_frame_transforms = self.transforms
+        return rects
+
+    def stats(self):
+        """Số lần render chữ / scale trong frame HUD gần nhất"""
+        return {
+            'renders': self.last_frame_renders,
+            'transforms': self.last_frame_transforms,
+            'total_renders': self.total_renders
+        }
+
+    def _menu_title(self, title_text, step):
+        """Title và lớp glow ghép sẵn ở một bước scale, dựng một lần cho mỗi bước"""
+        key = (title_text, step)
+        title = self._titles.get(key)
+        if title is None:
+            title_surface = self._cached_text(('title', title_text), self.fonts['large'], title_text, const.WHITE)
+            pulse_scale = step * const.HUD_SCALE_STEP
+            scaled_width = int(title_surface.get_width() * pulse_scale)
+            scaled_height = int(title_surface.get_height() * pulse_scale)
+
+            # Glow layers, then the scaled title on top
+            title = pygame.Surface((scaled_width + 10, scaled_height + 10), pygame.SRCALPHA)
+            center = title.get_rect().center
+            for i in range(5):
+                glow_title = pygame.transform.scale(title_surface, (scaled_width + i * 2, scaled_height + i * 2))
+                title.blit(glow_title, glow_title.get_rect(center=center))
+            scaled_title = pygame.transform.scale(title_surface, (scaled_width, scaled_height))
+            title.blit(scaled_title, scaled_title.get_rect(center=center))
+            self.transforms += 6
+            self._titles[key] = title
+        return title
 
     def draw_menu_title(self, screen, title_text):
-        """Vẽ title với hiệu ứng pulsing"""
-        # Animated title with pulsing effect
-        pulse_scale = 1.0 + 0.1 * math.sin(pygame.time.get_ticks() * 0.003)
-        title_surface = self.fonts['large'].render(title_text, True, const.WHITE)
-        
-        # Create scaled title
-        scaled_width = int(title_surface.get_width() * pulse_scale)
-        scaled_height = int(title_surface.get_height() * pulse_scale)
-        scaled_title = pygame.transform.scale(title_surface, (scaled_width, scaled_height))
-        
-        title_rect = scaled_title.get_rect(center=(const.WIDTH // 2, const.HEIGHT // 2 - 180))
-        
-        # Add glow effect to title
-        glow_surface = pygame.Surface((scaled_width + 10, scaled_height + 10), pygame.SRCALPHA)
-        for i in range(5):
-            glow_color = (*const.ZOMBIE_GREEN, 30 - i * 5)
-            glow_title = pygame.transform.scale(title_surface, (scaled_width + i * 2, scaled_height + i * 2))
-            glow_rect = glow_title.get_rect(center=(glow_surface.get_width() // 2, glow_surface.get_height() // 2))
-            glow_surface.blit(glow_title, glow_rect)
-        
-        glow_rect = glow_surface.get_rect(center=(const.WIDTH // 2, const.HEIGHT // 2 - 180))
-        screen.blit(glow_surface, glow_rect)
-        screen.blit(scaled_title, title_rect)
+        """Vẽ title với hiệu ứng pulsing, trả về vùng đã vẽ"""
+        # Animated title with pulsing effect, quantized so every step is a cached bitmap
+        pulse_scale = 1.0 + 0.1 * math.sin(self.clock.now() * 0.003)
+        title = self._menu_title(title_text, round(pulse_scale / const.HUD_SCALE_STEP))
+        return screen.blit(title, title.get_rect(center=(const.WIDTH // 2, const.HEIGHT // 2 - 180)))
 
-    def draw_game_over_screen(self, screen, game_stats):
-        """Vẽ màn hình game over"""
-        hits = game_stats.get('hits', 0)
-        misses = game_stats.get('misses', 0)
-        difficulty_level = game_stats.get('difficulty_level', 'EASY')
-        max_combo = game_stats.get('max_combo', 0)
-        
+    def draw_loading_screen(self, screen, progress):
+        """Vẽ màn hình loading (chưa có ảnh nào): tiêu đề và thanh tiến độ"""
+        screen.fill(const.BLACK)
+        title = self._cached_text('loading_title', self.fonts['large'], "Zombie Head Smash", const.ZOMBIE_GREEN)
+        screen.blit(title, title.get_rect(center=(const.WIDTH // 2, const.HEIGHT // 2 - 60)))
+
+        bar = pygame.Rect((0, 0), const.LOADING_BAR_SIZE)
+        bar.center = (const.WIDTH // 2, const.HEIGHT // 2 + 10)
+        pygame.draw.rect(screen, const.DARK_GRAY, bar)
+        pygame.draw.rect(screen, const.ZOMBIE_GREEN, (bar.x, bar.y, int(bar.width * progress), bar.height))
+        pygame.draw.rect(screen, const.WHITE, bar, 2)
+
+        label = self._cached_text('loading_label', self.fonts['small'], f"Loading... {int(progress * 100)}%",
+                                  const.LIGHT_GRAY)
+        screen.blit(label, label.get_rect(center=(const.WIDTH // 2, bar.bottom + 25)))
+
+    def draw_game_over_screen(self, screen, game_stats, reveal=1.0):
+        """Vẽ màn hình game over; reveal (0..1) là độ hiện của lớp phủ và chữ khi đang fade in"""
+        key = (game_stats.get('hits', 0), game_stats.get('misses', 0),
+               game_stats.get('difficulty_level', 'EASY'), game_stats.get('max_combo', 0))
+        if self._game_over_layer[0] != key:
+            self._game_over_layer = (key, self._compose_game_over(*key))
+        layer = self._game_over_layer[1]
+        layer.set_alpha(int(255 * reveal))
+        return screen.blit(layer, (0, 0))
+
+    def _compose_game_over(self, hits, misses, difficulty_level, max_combo):
+        """Lớp phủ mờ và chữ thống kê ghép sẵn một lần cho mỗi kết quả ván"""
         # Tạo một lớp phủ mờ
         overlay = pygame.Surface((const.WIDTH, const.HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 150))  # Màu đen trong suốt
-        screen.blit(overlay, (0, 0))
 
         game_over_text = self.fonts['large'].render("GAME OVER!", True, const.RED)
         final_score_text = self.fonts['medium'].render(f"Final Score: {hits - misses}", True, const.WHITE)
@@ -190,68 +325,94 @@ class UIRenderer:
         info_rect = info_text.get_rect(center=(const.WIDTH // 2, const.HEIGHT // 2))
         combo_rect = max_combo_display.get_rect(center=(const.WIDTH // 2, const.HEIGHT // 2 + 30))
 
-        screen.blit(game_over_text, text_rect)
-        screen.blit(final_score_text, score_rect)
-        screen.blit(difficulty_text, difficulty_rect)
-        screen.blit(info_text, info_rect)
-        screen.blit(max_combo_display, combo_rect)
+        texts = [(game_over_text, text_rect), (final_score_text, score_rect), (difficulty_text, difficulty_rect),
+                 (info_text, info_rect), (max_combo_display, combo_rect)]
+        overlay.blits(texts, doreturn=False)
+        return overlay
+
+    def draw_fade(self, screen, amount):
+        """Phủ đen toàn màn hình với độ đậm amount (0..1) khi chuyển cảnh, trả về vùng đã vẽ"""
+        if self._fade_surface is None:
+            self._fade_surface = pygame.Surface((const.WIDTH, const.HEIGHT))
+            self._fade_surface.fill(const.BLACK)
+        self._fade_surface.set_alpha(int(255 * amount))
+        return screen.blit(self._fade_surface, (0, 0))
 
 class MouseTrail:
-    def __init__(self, max_length=const.MAX_TRAIL_LENGTH):
-        self.positions = []
+    def __init__(self, max_length=const.MAX_TRAIL_LENGTH, clock=None):
+        self.clock = clock or SystemClock()
+        # Ring buffer: the oldest point drops out automatically in O(1)
+        self.positions = deque(maxlen=max_length)
         self.max_length = max_length
+        # Persistent alpha layer the trail is drawn into, plus the areas touched last frame
+        self.layer = None
+        self.dirty_rects = []
+        self.last_draw_ms = 0.0
+        self._table_count = 0
+        self._alphas = []
+        self._thicknesses = []
 
     def update(self, mouse_pos):
         """Cập nhật trail chuột"""
         self.positions.append(mouse_pos)
-        if len(self.positions) > self.max_length:
-            self.positions.pop(0)
+
+    def _segment_table(self, count):
+        """Alpha và độ dày cơ bản của từng đoạn, tính lại chỉ khi độ dài trail đổi"""
+        if self._table_count != count:
+            self._alphas = [int(255 * (i + 1) / count) for i in range(count - 1)]
+            self._thicknesses = [max(1, i // 2) for i in range(count - 1)]
+            self._table_count = count
+        return self._alphas, self._thicknesses
+
+    def _get_layer(self, screen):
+        if self.layer is None or self.layer.get_size() != screen.get_size():
+            self.layer = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.dirty_rects = []
+        return self.layer
 
     def draw(self, screen, combo=1):
-        """Vẽ trail chuột với hiệu ứng nâng cao"""
-        if len(self.positions) > 1:
-            for i in range(len(self.positions) - 1):
-                start_pos = self.positions[i]
-                end_pos = self.positions[i + 1]
-                alpha = int(255 * (i + 1) / len(self.positions))
-                
-                # Rainbow trail effect
-                color_index = (i + pygame.time.get_ticks() * 0.01) % len(const.RAINBOW_COLORS)
-                trail_color = const.RAINBOW_COLORS[int(color_index)]
-                
-                # Variable thickness based on combo
-                base_thickness = max(1, i // 2)
-                combo_bonus = min(combo, 10)  # Cap combo bonus
-                thickness = base_thickness + combo_bonus
-                
-                # Draw multiple trail layers for glow effect
-                for layer in range(3):
-                    layer_alpha = max(0, alpha - layer * 60)
-                    layer_thickness = thickness + layer * 2
-                    layer_color = (*trail_color, layer_alpha)
-                    
-                    # Create surface for the trail segment
-                    dx = end_pos[0] - start_pos[0]
-                    dy = end_pos[1] - start_pos[1]
-                    length = (dx*dx + dy*dy) ** 0.5
-                    
-                    if length > 0:
-                        trail_surface = pygame.Surface((int(length) + layer_thickness * 2, 
-                                                      layer_thickness * 2), pygame.SRCALPHA)
-                        
-                        # Draw the trail line
-                        pygame.draw.line(trail_surface, layer_color,
-                                       (layer_thickness, layer_thickness),
-                                       (int(length) + layer_thickness, layer_thickness),
-                                       layer_thickness)
-                        
-                        # Calculate rotation angle
-                        angle = math.degrees(math.atan2(dy, dx))
-                        rotated_surface = pygame.transform.rotate(trail_surface, angle)
-                        
-                        # Position the rotated surface
-                        surface_rect = rotated_surface.get_rect()
-                        surface_rect.center = ((start_pos[0] + end_pos[0]) // 2,
-                                             (start_pos[1] + end_pos[1]) // 2)
-                        
-                        screen.blit(rotated_surface, surface_rect)
+        """Vẽ trail chuột với hiệu ứng nâng cao, trả về danh sách vùng đã vẽ"""
+        start_time = time.perf_counter()
+        layer = self._get_layer(screen)
+        if self.dirty_rects:
+            # One large fill is much cheaper than many small ones
+            layer.fill((0, 0, 0, 0), self.dirty_rects[0].unionall(self.dirty_rects[1:]))
+
+        positions = list(self.positions)
+        count = len(positions)
+        segment_rects = [None] * max(0, count - 1)
+        if count > 1:
+            combo_bonus = min(combo, 10)  # Cap combo bonus
+            color_offset = self.clock.now() * 0.01
+            color_count = len(const.RAINBOW_COLORS)
+            alphas, thicknesses = self._segment_table(count)
+
+            # Rainbow trail effect
+            colors = [const.RAINBOW_COLORS[int((i + color_offset) % color_count)] for i in range(count - 1)]
+
+            # Glow layers widest first; drawing into the alpha layer overwrites, so cores stay on top
+            draw_line = pygame.draw.line
+            for glow in (2, 1, 0):
+                fade = glow * 60
+                width_bonus = combo_bonus + glow * 2  # Variable thickness based on combo
+                for i in range(count - 1):
+                    layer_alpha = alphas[i] - fade
+                    if layer_alpha <= 0:
+                        continue
+                    start_pos = positions[i]
+                    end_pos = positions[i + 1]
+                    if start_pos == end_pos:
+                        continue
+                    rect = draw_line(layer, (*colors[i], layer_alpha), start_pos, end_pos,
+                                     thicknesses[i] + width_bonus)
+                    if segment_rects[i] is None:
+                        segment_rects[i] = rect  # Widest layer covers the narrower ones
+
+        # Only the touched areas are blitted now and cleared next frame. Segment rects overlap at
+        # the joints, so merge them first: each layer pixel must reach the screen exactly once
+        self.dirty_rects = merge_rects([rect for rect in segment_rects if rect])
+        if self.dirty_rects:
+            screen.blits([(layer, rect, rect) for rect in self.dirty_rects], doreturn=False)
+
+        self.last_draw_ms = (time.perf_counter() - start_time) * 1000
+        return self.dirty_rects
@@ -4,7 +4,10 @@ Các hàm tiện ích cho Zombie Head Smash Game
 
 import pygame
 import os
+import gc
 import constants as const
+from asset_cache import asset_cache
+from assetpack import get_pack
 
 def init_pygame():
     """Khởi tạo Pygame và mixer"""
@@ -36,48 +39,100 @@ def load_fonts():
         'small': game_font_small
     }
 
+def read_image(path, scale_to=None):
+    """Decode file ảnh và scale; không cần màn hình nên chạy được trên worker thread (raise pygame.error nếu lỗi)"""
+    image = pygame.image.load(path)
+    if scale_to:
+        image = pygame.transform.scale(image, scale_to)
+    return image
+
+def decode_image(path, scale_to=None, convert_alpha=True):
+    """Decode file ảnh, scale rồi convert sang định dạng màn hình (raise pygame.error nếu lỗi)"""
+    image = read_image(path, scale_to)
+    return image.convert_alpha() if convert_alpha else image.convert()
+
+def load_prepared_image(filename, scale_to, convert_alpha=True):
+    """Ảnh đã scale sẵn từ assets.pack hoặc asset cache, None nếu không có"""
+    # Packed pixels served straight from the mapped archive
+    pack = get_pack()
+    packed = pack.image(filename, scale_to, convert_alpha) if pack is not None else None
+    if packed is not None:
+        return packed
+    if const.ASSET_CACHE_ENABLED:
+        # Pre-scaled pixels from an earlier launch, no PNG decode or rescale
+        return asset_cache.load(os.path.join(const.IMAGES_DIR, filename), scale_to, convert_alpha)
+    return None
+
+def finish_image(filename, image, scale_to=None, convert_alpha=True):
+    """Convert ảnh vừa decode sang định dạng màn hình (main thread) và ghi asset cache"""
+    image = image.convert_alpha() if convert_alpha else image.convert()
+    if const.ASSET_CACHE_ENABLED and scale_to is not None:
+        try:
+            asset_cache.store(os.path.join(const.IMAGES_DIR, filename), image, convert_alpha)
+        except OSError as e:
+            print(f"Error writing asset cache for {filename}: {e}")
+    return image
+
+def fallback_image(scale_to=None, convert_alpha=True):
+    """Ảnh xám viền đỏ thay cho ảnh không tải được"""
+    fallback = pygame.Surface(scale_to if scale_to else (50, 50), 
+                            pygame.SRCALPHA if convert_alpha else 0)
+    fallback.fill((128, 128, 128, 128) if convert_alpha else (128, 128, 128))
+    pygame.draw.rect(fallback, const.RED, fallback.get_rect(), 2)
+    return fallback
+
 def load_image(filename, scale_to=None, convert_alpha=True):
     """Tải hình ảnh với xử lý lỗi"""
-    path = os.path.join(const.IMAGES_DIR, filename)
+    if scale_to is not None:
+        prepared = load_prepared_image(filename, scale_to, convert_alpha)
+        if prepared is not None:
+            return prepared
     try:
-        if convert_alpha:
-            image = pygame.image.load(path).convert_alpha()
-        else:
-            image = pygame.image.load(path).convert()
-        if scale_to:
-            image = pygame.transform.scale(image, scale_to)
-        return image
+        image = read_image(os.path.join(const.IMAGES_DIR, filename), scale_to)
+        return finish_image(filename, image, scale_to, convert_alpha)
     except pygame.error as e:
         print(f"Error loading image {filename}: {e}")
-        # Fallback image
-        fallback = pygame.Surface(scale_to if scale_to else (50, 50), 
-                                pygame.SRCALPHA if convert_alpha else 0)
-        fallback.fill((128, 128, 128, 128) if convert_alpha else (128, 128, 128))
-        pygame.draw.rect(fallback, const.RED, fallback.get_rect(), 2)
-        return fallback
+        return fallback_image(scale_to, convert_alpha)
+
+# Tên ảnh -> (file, kích thước sau khi scale, có kênh alpha không)
+IMAGE_SPECS = {
+    'background': ("background.png", (const.WIDTH, const.HEIGHT), False),
+    'menu_background': ("menu_background.png", (const.WIDTH, const.HEIGHT), False),
+    'zombie_head': ("zombie_head.png", const.ZOMBIE_IMAGE_SIZE, True),
+    'splat': ("splat.png", const.SPLAT_IMAGE_SIZE, True),
+    'button_normal': ("button_normal.png", const.BUTTON_SIZE, True),
+    'button_hover': ("button_hover.png", const.BUTTON_SIZE, True)
+}
 
 def load_images():
     """Tải tất cả hình ảnh cần thiết"""
-    return {
-        'background': load_image("background.png", (const.WIDTH, const.HEIGHT), False),
-        'menu_background': load_image("menu_background.png", (const.WIDTH, const.HEIGHT), False),
-        'zombie_head': load_image("zombie_head.png", const.ZOMBIE_IMAGE_SIZE),
-        'splat': load_image("splat.png", const.SPLAT_IMAGE_SIZE),
-        'button_normal': load_image("button_normal.png", const.BUTTON_SIZE),
-        'button_hover': load_image("button_hover.png", const.BUTTON_SIZE)
-    }
+    return {name: load_image(filename, size, alpha) for name, (filename, size, alpha) in IMAGE_SPECS.items()}
+
+def create_placeholder_images():
+    """Tạo ảnh thay thế đúng kích thước mà không cần màn hình (chế độ headless)"""
+    return {name: pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+            for name, (_, size, alpha) in IMAGE_SPECS.items()}
 
 def load_sound(filename, volume=1.0):
     """Tải âm thanh với xử lý lỗi"""
     path = os.path.join(const.SOUNDS_DIR, filename)
     try:
-        sound = pygame.mixer.Sound(path)
+        pack = get_pack()
+        sound = pack.sound(filename) if pack is not None else None
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
         sound.set_volume(volume)
         return sound
     except pygame.error as e:
         print(f"Error loading sound {filename}: {e}")
         return None
 
+# Tên âm thanh -> (file, âm lượng)
+SOUND_SPECS = {
+    'splat': ("splat_sound.wav", const.SPLAT_SOUND_VOLUME),
+    'click': ("click_sound.wav", const.CLICK_SOUND_VOLUME)
+}
+
 def load_sounds():
     """Tải tất cả âm thanh cần thiết"""
     # Load background music
@@ -88,10 +143,7 @@ def load_sounds():
         print(f"Error loading background music: {e}")
     
     # Load sound effects
-    return {
-        'splat': load_sound("splat_sound.wav", const.SPLAT_SOUND_VOLUME),
-        'click': load_sound("click_sound.wav", const.CLICK_SOUND_VOLUME)
-    }
+    return {name: load_sound(filename, volume) for name, (filename, volume) in SOUND_SPECS.items()}
 
 def play_background_music():
     """Phát nhạc nền"""
@@ -109,6 +161,33 @@ def fade_out_music(fade_time=500):
     except Exception as e:
         print(f"Error fading out music: {e}")
 
+def set_music_volume(volume):
+    """Đặt âm lượng nhạc nền"""
+    try:
+        pygame.mixer.music.set_volume(volume)
+    except Exception as e:
+        print(f"Error setting music volume: {e}")
+
+def stop_music():
+    """Dừng nhạc nền"""
+    try:
+        pygame.mixer.music.stop()
+    except Exception as e:
+        print(f"Error stopping music: {e}")
+
+def music_playing():
+    """Nhạc nền có đang phát không"""
+    try:
+        return pygame.mixer.music.get_busy()
+    except Exception:
+        return False
+
+def freeze_loaded_objects():
+    """Đưa mọi object đã load (asset, cache, pool) vào thế hệ GC vĩnh viễn,
+    để các lần GC thế hệ cũ lúc đang chơi không phải duyệt lại chúng"""
+    gc.collect()
+    gc.freeze()
+
 def clamp(value, min_value, max_value):
     """Giới hạn giá trị trong khoảng min_value đến max_value"""
     return max(min_value, min(value, max_value))
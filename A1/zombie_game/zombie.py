@@ -6,31 +6,104 @@ import pygame
 import random
 import math
 import constants as const
+from timing import SystemClock
+
+class ZombieFrames:
+    """Bảng frame animation (pop-up và glow cảnh báo) dựng một lần cho mỗi ảnh gốc"""
+
+    def __init__(self, image, pop_frame_count=const.ZOMBIE_POP_FRAMES, glow_levels=const.ZOMBIE_GLOW_LEVELS):
+        self.image = image
+        self.pop_frames = [self._build_pop_frame(index / pop_frame_count) for index in range(pop_frame_count)]
+        self.glow_frames = [self._build_glow_frame(100 * level / (glow_levels - 1)) for level in range(glow_levels)]
+
+        # Half-extent of every rect a zombie can occupy around its home (pop bounce, glow, wiggle),
+        # plus a pixel for float truncation, used as its spatial-index footprint
+        frames = [image] + [frame for frame, _ in self.pop_frames if frame is not None] + self.glow_frames
+        bounce = max(abs(offset) for _, offset in self.pop_frames)
+        self.extent = (max(frame.get_width() for frame in frames) // 2 + const.ZOMBIE_WIGGLE_MAX + 2,
+                       max(frame.get_height() for frame in frames) // 2 + int(bounce) + 2)
+
+    def _build_pop_frame(self, progress):
+        """Frame pop-up với đường cong elastic ease-out và độ nảy tương ứng"""
+        if progress < 0.5:
+            scale_factor = 2 * progress * progress
+        else:
+            scale_factor = 1 - 2 * (progress - 1) * (progress - 1) * 0.3
+
+        # Bounce effect
+        bounce_offset = math.sin(progress * math.pi * 3) * 5 * (1 - progress)
+
+        current_width = int(self.image.get_width() * scale_factor)
+        current_height = int(self.image.get_height() * scale_factor)
+        if current_width > 0 and current_height > 0:
+            return pygame.transform.scale(self.image, (current_width, current_height)), bounce_offset
+        return None, bounce_offset
+
+    def _build_glow_frame(self, glow_intensity):
+        """Ảnh zombie với viền glow đỏ ở cường độ cho trước"""
+        width, height = self.image.get_size()
+        glow_surface = pygame.Surface((width + 6, height + 6), pygame.SRCALPHA)
+        for i in range(3):
+            # Intensity 0-100 maps to the full alpha range, outer layers fainter
+            glow_alpha = max(0, min(255, int(glow_intensity * 2.55) - i * 50))
+            enlarged = pygame.transform.scale(self.image, (width + i * 2, height + i * 2))
+            # Blood-red silhouette of the head, faded by the glow alpha
+            enlarged.fill((0, 0, 0, glow_alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            enlarged.fill((*const.BLOOD_RED, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            glow_surface.blit(enlarged, (3 - i, 3 - i))
+
+        glow_surface.blit(self.image, (3, 3))
+        return glow_surface
+
+    def pop_frame(self, progress):
+        """(ảnh, độ nảy) của animation pop-up tại tiến độ 0.0 - 1.0"""
+        index = min(len(self.pop_frames) - 1, int(progress * len(self.pop_frames)))
+        return self.pop_frames[index]
+
+    def glow_frame(self, warning_progress):
+        """Ảnh glow cảnh báo theo tiến độ cảnh báo 0.0 - 1.0"""
+        index = int(min(1.0, max(0.0, warning_progress)) * (len(self.glow_frames) - 1) + 0.5)
+        return self.glow_frames[index]
+
+# Bảng frame dùng chung, khóa theo ảnh gốc
+_frame_tables = {}
+
+def get_zombie_frames(image):
+    """Lấy (hoặc dựng lần đầu) bảng frame cho một ảnh zombie"""
+    frames = _frame_tables.get(id(image))
+    if frames is None or frames.image is not image:
+        frames = _frame_tables[id(image)] = ZombieFrames(image)
+    return frames
 
 class Zombie(pygame.sprite.Sprite):
-    def __init__(self, image, speed_multiplier=1.0):
+    def __init__(self, image, speed_multiplier=1.0, clock=None, rng=None):
         super().__init__()
+        self.clock = clock or SystemClock()
+        rng = rng or random
         self.original_image = image
+        self.frames = get_zombie_frames(image)
         self.image = image
         self.rect = self.image.get_rect()
-        self.spawn_time = pygame.time.get_ticks()
+        self.home = self.rect.center
+        self.spawn_time = self.clock.now()
         
         # Nếu speed_multiplier = 0, zombie sẽ không tự biến mất (mode Classic)
         if speed_multiplier == 0:
             self.lifetime = float('inf')  # Vô hạn - không tự biến mất
         else:
-            self.lifetime = random.randint(
+            self.lifetime = rng.randint(
                 int(1500 / speed_multiplier), 
                 int(3000 / speed_multiplier)
             )  # Thời gian tồn tại (ms), phụ thuộc vào độ khó
         
         self.speed_multiplier = speed_multiplier
         self.popping_up = True
-        self.pop_animation_start = pygame.time.get_ticks()
+        self.pop_animation_start = self.spawn_time
         self.pop_animation_duration = const.ZOMBIE_POP_ANIMATION_DURATION
         self.hit = False
         self.splat_time = 0
         self.splat_duration = const.ZOMBIE_SPLAT_DURATION
+        self.expiry = None  # Entry in the owner's ExpiryIndex, replaced when the deadline changes
         
         # Enhanced animation properties
         self.wiggle_amount = 0
@@ -43,37 +116,36 @@ class Zombie(pygame.sprite.Sprite):
 
     def set_position(self, x, y):
         """Đặt vị trí zombie"""
+        self.home = (x, y)
         self.rect.center = (x, y)
+        # Keep spatially indexed groups in sync with the new home position
+        for group in self.groups():
+            relocate = getattr(group, 'relocate', None)
+            if relocate:
+                relocate(self)
+
+    def footprint(self):
+        """Vùng bao mọi vị trí rect của zombie quanh vị trí gốc"""
+        half_width, half_height = self.frames.extent
+        return pygame.Rect(self.home[0] - half_width, self.home[1] - half_height, half_width * 2, half_height * 2)
 
     def update(self):
         """Cập nhật trạng thái zombie"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.now()
 
         # Hiệu ứng xuất hiện (pop-up animation) với bouncing
         if self.popping_up:
             elapsed = current_time - self.pop_animation_start
             if elapsed < self.pop_animation_duration:
-                # Elastic ease-out animation
-                progress = elapsed / self.pop_animation_duration
-                if progress < 0.5:
-                    scale_factor = 2 * progress * progress
-                else:
-                    scale_factor = 1 - 2 * (progress - 1) * (progress - 1) * 0.3
-                
-                # Bounce effect
-                self.bounce_offset = math.sin(progress * math.pi * 3) * 5 * (1 - progress)
-                
-                current_width = int(self.original_image.get_width() * scale_factor)
-                current_height = int(self.original_image.get_height() * scale_factor)
-                if current_width > 0 and current_height > 0:
-                    scaled_image = pygame.transform.scale(self.original_image, (current_width, current_height))
-                    self.image = scaled_image
-                    original_center = self.rect.center
-                    self.rect = self.image.get_rect(center=(original_center[0], original_center[1] + self.bounce_offset))
+                # Elastic ease-out animation, looked up from the precomputed frame table
+                frame, self.bounce_offset = self.frames.pop_frame(elapsed / self.pop_animation_duration)
+                if frame is not None:
+                    self.image = frame
+                    self.rect = self.image.get_rect(center=(self.home[0], self.home[1] + self.bounce_offset))
             else:
                 self.popping_up = False
                 self.image = self.original_image
-                self.rect = self.image.get_rect(center=(self.rect.center[0], self.rect.center[1] - self.bounce_offset))
+                self.rect = self.image.get_rect(center=self.home)
                 self.bounce_offset = 0
 
         # Hiệu ứng wiggle khi zombie sắp biến mất
@@ -82,53 +154,41 @@ class Zombie(pygame.sprite.Sprite):
             if time_remaining <= self.warning_time and time_remaining > 0:
                 # Tăng dần cường độ wiggle
                 warning_progress = 1 - (time_remaining / self.warning_time)
-                self.wiggle_amount = math.sin(current_time * 0.02) * 3 * warning_progress
+                self.wiggle_amount = math.sin(current_time * 0.02) * const.ZOMBIE_WIGGLE_MAX * warning_progress
                 self.glow_intensity = int(100 * warning_progress)
                 
-                # Tạo hiệu ứng glow bằng cách vẽ outline
+                # Hiệu ứng glow: chọn frame theo cường độ cảnh báo
                 if not self.popping_up:
-                    glow_surface = pygame.Surface((self.original_image.get_width() + 6, 
-                                                 self.original_image.get_height() + 6), pygame.SRCALPHA)
-                    for i in range(3):
-                        glow_color = (*const.BLOOD_RED, self.glow_intensity - i * 20)
-                        enlarged = pygame.transform.scale(self.original_image, 
-                                                        (self.original_image.get_width() + i * 2,
-                                                         self.original_image.get_height() + i * 2))
-                        glow_surface.blit(enlarged, (3 - i, 3 - i))
-                    
-                    glow_surface.blit(self.original_image, (3, 3))
-                    self.image = glow_surface
+                    self.image = self.frames.glow_frame(warning_progress)
                     
                     # Apply wiggle offset
-                    original_center = self.rect.center
-                    self.rect = self.image.get_rect(center=(original_center[0] + self.wiggle_amount, original_center[1]))
-
-        # Nếu đã bị đập, hiển thị splat và biến mất sau một thời gian
-        if self.hit:
-            if current_time - self.splat_time > self.splat_duration:
-                self.kill()
+                    self.rect = self.image.get_rect(center=(self.home[0] + self.wiggle_amount, self.home[1]))
 
-        # Zombie tự động biến mất nếu không bị đập (trừ mode Classic)
-        elif not self.hit and self.speed_multiplier > 0 and current_time - self.spawn_time > self.lifetime:
-            self.kill()
+        # Removal (lifetime over, or splat finished) is driven by Game's expiry index via deadline()
     
     def is_alive(self):
         """Kiểm tra zombie còn sống không"""
         return not self.hit and (self.speed_multiplier == 0 or 
-                                pygame.time.get_ticks() - self.spawn_time < self.lifetime)
+                                self.clock.now() - self.spawn_time < self.lifetime)
     
     def hit_zombie(self):
         """Đánh trúng zombie"""
         if not self.hit:
             self.hit = True
-            self.splat_time = pygame.time.get_ticks()
+            self.splat_time = self.clock.now()
             return True
         return False
     
+    def deadline(self):
+        """Thời điểm zombie biến mất: hết splat nếu đã bị đập, hết lifetime nếu chưa (inf ở mode Classic)"""
+        if self.hit:
+            return self.splat_time + self.splat_duration
+        return self.spawn_time + self.lifetime
+
     def should_disappear(self):
         """Kiểm tra zombie có nên biến mất không"""
         if self.hit:
-            return pygame.time.get_ticks() - self.splat_time > self.splat_duration
+            return self.clock.now() - self.splat_time > self.splat_duration
         elif self.speed_multiplier > 0:
-            return pygame.time.get_ticks() - self.spawn_time > self.lifetime
+            return self.clock.now() - self.spawn_time > self.lifetime
         return False